@@ -0,0 +1,102 @@
+"""Synthetic playblast style frames: white pixels on a black background."""
+import io
+import os
+import sys
+import struct
+
+sys.path.insert(
+    0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+from intersections_tool.vendor import png  # noqa: E402
+
+
+def get_height(width):
+    """Height of a 16:9 frame."""
+    return int(round(width * 9 / 16.0))
+
+
+def create_pixels(width, height, density, planes=4):
+    """Create RGBA pixel data with a share of white pixels.
+
+    White pixels are spread with a fixed hash, so frames are deterministic.
+
+    Args:
+        width (int): Width of the frame.
+        height (int): Height of the frame.
+        density (float): 0-1 share of white pixels.
+        planes (int, optional): Channels per pixel, alpha is always 255.
+
+    Returns:
+        bytearray: Pixel data with rows running top to bottom.
+    """
+    pixels = bytearray(width * height * planes)
+    if planes == 4:
+        pixels[3::4] = bytearray([255]) * (width * height)
+
+    threshold = int(density * 1000)
+    for index in range(width * height):
+        if (index * 7919) % 1000 < threshold:
+            offset = index * planes
+            pixels[offset:offset + 3] = b"\xff\xff\xff"
+
+    return pixels
+
+
+def create_png(width, height, density):
+    """Create png file data of a synthetic RGBA frame."""
+    pixels = create_pixels(width, height, density)
+    row_size = width * 4
+    rows = [
+        pixels[offset:offset + row_size]
+        for offset in range(0, len(pixels), row_size)
+    ]
+
+    output = io.BytesIO()
+    png.Writer(width, height, alpha=True).write(output, rows)
+    return output.getvalue()
+
+
+def create_bmp(width, height, density):
+    """Create uncompressed 24 bit bmp file data of a synthetic frame, with
+    rows running bottom to top like Maya writes them."""
+    pixels = create_pixels(width, height, density, planes=3)
+    row_size = width * 3
+    stride = (row_size + 3) // 4 * 4
+    padding = b"\x00" * (stride - row_size)
+
+    rows = []
+    for offset in reversed(range(0, len(pixels), row_size)):
+        row = pixels[offset:offset + row_size]
+        row[0::3], row[2::3] = row[2::3], row[0::3]
+        rows.append(bytes(row) + padding)
+
+    offset = 14 + 40
+    size = offset + stride * height
+    header = struct.pack("<2sIHHI", b"BM", size, 0, 0, offset)
+    info = struct.pack(
+        "<IiiHHIIiiII", 40, width, height, 1, 24, 0, stride * height,
+        2835, 2835, 0, 0
+    )
+    return header + info + b"".join(rows)
+
+
+def write_frames(directory, width, density, frame_count, image_format="png"):
+    """Write a sequence of synthetic png or bmp frames.
+
+    Returns:
+        list: Paths of the written frames.
+    """
+    if image_format == "bmp":
+        data = create_bmp(width, get_height(width), density)
+    else:
+        data = create_png(width, get_height(width), density)
+    paths = []
+    for frame in range(frame_count):
+        path = os.path.join(
+            directory, "temp.{0:04d}.{1}".format(frame, image_format)
+        )
+        with open(path, "wb") as f:
+            f.write(data)
+        paths.append(path)
+    return paths
@@ -0,0 +1,196 @@
+"""Maya stand-in for running `intersections_tool.lib` outside of Maya.
+
+Every Maya call is accepted and returns a stub, except for the few calls
+the analysis depends on, like listing meshes and capturing frames. Frames
+are "captured" by writing a synthetic png to disk per frame, so the file
+based analysis does the same work as in Maya apart from drawing.
+"""
+import sys
+import types
+import timeit
+import contextlib
+
+import corpus
+
+
+class Stub(object):
+    """Accepts any attribute access and call, returning another stub."""
+
+    def __init__(self, name="stub"):
+        self._name = name
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        stub = Stub(self._name + "." + name)
+        setattr(self, name, stub)
+        return stub
+
+    def __call__(self, *args, **kwargs):
+        return Stub(self._name + "()")
+
+    def __add__(self, other):
+        return str(self) + other
+
+    def __iter__(self):
+        return iter([])
+
+    def __str__(self):
+        return self._name
+
+
+class RenderLayer(object):
+    pass
+
+
+class Scene(object):
+    """State of the fake scene.
+
+    Args:
+        mesh_count (int): Amount of meshes listed in the scene.
+        width (int): Width of the captured frames.
+        density (float): Share of white pixels in the captured frames.
+        draw_time (float): Seconds each captured frame keeps the
+            interpreter busy, like drawing the viewport does in Maya.
+    """
+
+    def __init__(self, mesh_count=10, width=40, density=0.01, draw_time=0.0):
+        self.meshes = ["mesh{0}Shape".format(i) for i in range(mesh_count)]
+        self.width = width
+        self.density = density
+        self.draw_time = draw_time
+        self.current_time = 1.0
+
+    def ls(self, *args, **kwargs):
+        if kwargs.get("type") == "mesh":
+            return list(self.meshes)
+        return []
+
+    def current_time_command(self, *args, **kwargs):
+        if args:
+            self.current_time = args[0]
+        return self.current_time
+
+    def capture(self, **options):
+        """Write a synthetic png or bmp per frame like a playblast would."""
+        width = options.get("width") or self.width
+        image_format = options.get("compression", "png")
+        create = corpus.create_bmp if image_format == "bmp" else (
+            corpus.create_png
+        )
+        data = create(width, corpus.get_height(width), self.density)
+        start_frame = int(options["start_frame"])
+        frames = options.get("frame") or range(
+            start_frame, int(options["end_frame"]) + 1
+        )
+
+        # Without raw frame numbers, files are numbered from zero.
+        offset = 0 if options.get("raw_frame_numbers") else start_frame
+        for frame in frames:
+            end = timeit.default_timer() + self.draw_time
+            while timeit.default_timer() < end:
+                pass
+            path = "{0}.{1:04d}.{2}".format(
+                options["filename"], int(frame) - offset, image_format
+            )
+            with open(path, "wb") as f:
+                f.write(data)
+        return "{0}.####.{1}".format(options["filename"], image_format)
+
+    @contextlib.contextmanager
+    def capture_panel(self, camera=None, width=40, maintain_time=True):
+        yield "fakePanel"
+
+    def read_color_buffer(self, panel):
+        width = self.width
+        height = corpus.get_height(width)
+        pixels = corpus.create_pixels(width, height, self.density)
+        return [width, height, pixels]
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install(scene=None):
+    """Install fake Maya, pymel and Qt modules.
+
+    Install after importing `intersections_tool`, so the package does not
+    import the GUI.
+
+    Args:
+        scene (Scene, optional): Fake scene state. Defaults to a new scene.
+
+    Returns:
+        Scene: The fake scene state.
+    """
+    scene = scene or Scene()
+
+    cmds = Stub("cmds")
+    cmds.currentTime = scene.current_time_command
+    cmds.getAttr = lambda *args, **kwargs: 1.0
+
+    core = Stub("pymel.core")
+    core.ls = scene.ls
+    core.currentTime = scene.current_time_command
+    core.playbackOptions = lambda *args, **kwargs: 1.0
+    pymel = Stub("pymel")
+    pymel.core = core
+    sys.modules["pymel"] = pymel
+    sys.modules["pymel.core"] = core
+
+    mel = Stub("mel")
+    mel.eval = lambda *args, **kwargs: 2018.0
+    open_maya = Stub("OpenMaya")
+    open_maya_ui = Stub("OpenMayaUI")
+    render_setup = Stub("renderSetup")
+    type_ids = Stub("typeIDs")
+    render_layer = Stub("renderLayer")
+    render_layer.RenderLayer = RenderLayer
+
+    _module("maya.cmds")
+    sys.modules["maya.cmds"] = cmds
+    sys.modules["maya.mel"] = mel
+    _module("maya.api", OpenMaya=open_maya, OpenMayaUI=open_maya_ui)
+    sys.modules["maya.api.OpenMaya"] = open_maya
+    sys.modules["maya.api.OpenMayaUI"] = open_maya_ui
+    _module(
+        "maya.app.renderSetup.model",
+        renderSetup=render_setup,
+        typeIDs=type_ids,
+        renderLayer=render_layer
+    )
+    _module("maya.app.renderSetup")
+    _module("maya.app.general.mayaMixin", MayaQWidgetDockableMixin=object)
+    _module("maya.app.general")
+    _module("maya.app")
+    sys.modules["maya.OpenMaya"] = Stub("maya.OpenMaya")
+    _module(
+        "maya",
+        cmds=cmds,
+        mel=mel,
+        api=sys.modules["maya.api"],
+        app=sys.modules["maya.app"],
+        OpenMaya=sys.modules["maya.OpenMaya"]
+    )
+
+    # The vendored capture module needs a Qt binding on import.
+    if "PySide2" not in sys.modules:
+        try:
+            import PySide2  # noqa: F401
+        except ImportError:
+            _module(
+                "PySide2", QtGui=Stub("QtGui"), QtWidgets=Stub("QtWidgets")
+            )
+
+    return scene
+
+
+def patch_lib(lib, scene):
+    """Replace the capture calls of `lib` with the fake scene."""
+    lib.capture = scene.capture
+    lib.capture_panel = scene.capture_panel
+    lib.read_color_buffer = scene.read_color_buffer
@@ -0,0 +1,82 @@
+"""Benchmark the analysis of test_scene.ma inside Maya.
+
+Run from the Maya script editor, or from mayapy with a display:
+    mayapy benchmarks/maya_benchmark.py --output maya_results.json
+
+Results use the same format as `run.py`, so they can be compared with
+`run.py --compare`.
+"""
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scene", default=os.path.join(root, "test_scene.ma")
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="maya_results.json")
+    args = parser.parse_args(argv)
+
+    from maya import cmds
+    if not hasattr(cmds, "file"):
+        import maya.standalone
+        maya.standalone.initialize(name="python")
+
+    import intersections_tool
+    from intersections_tool import lib
+
+    cmds.file(args.scene, open=True, force=True)
+    start_frame = cmds.playbackOptions(query=True, minTime=True)
+    end_frame = cmds.playbackOptions(query=True, maxTime=True)
+    frame_count = int(end_frame - start_frame) + 1
+
+    modes = (
+        ("png", {}),
+        ("pipelined", {"pipelined": True}),
+        ("in_memory", {"in_memory": True}),
+        ("geometry", {"engine": "geometry"})
+    )
+    results = []
+    for mode, options in modes:
+        times = []
+        for _ in range(args.repeat):
+            start = timeit.default_timer()
+            lib.get_coverage(
+                start_frame=start_frame, end_frame=end_frame, **options
+            )
+            times.append(timeit.default_timer() - start)
+
+        results.append({
+            "name": "maya_get_coverage",
+            "params": {"mode": mode, "frames": frame_count},
+            "frames": frame_count,
+            "seconds": min(times),
+            "seconds_per_frame": min(times) / frame_count
+        })
+
+    environment = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "maya": cmds.about(version=True),
+        "version": intersections_tool.version
+    }
+    with open(args.output, "w") as f:
+        json.dump(
+            {"environment": environment, "results": results},
+            f,
+            indent=4,
+            sort_keys=True
+        )
+
+
+if __name__ == "__main__":
+    main()
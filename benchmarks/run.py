@@ -0,0 +1,347 @@
+"""Benchmark the analysis without Maya.
+
+Maya is replaced by `fake_maya`, which writes synthetic png frames instead
+of playblasting. Results are written as json, which can be compared with
+the results of another version:
+    python benchmarks/run.py --output new.json --compare old.json
+"""
+import os
+import sys
+import json
+import shutil
+import timeit
+import argparse
+import multiprocessing
+import platform
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus  # noqa: E402
+import fake_maya  # noqa: E402
+
+import intersections_tool  # noqa: E402
+from intersections_tool import analysis  # noqa: E402
+from intersections_tool.vendor import png  # noqa: E402
+
+
+def measure(function, repeat):
+    """Get the fastest wall time of calling a function."""
+    times = []
+    for _ in range(repeat):
+        start = timeit.default_timer()
+        function()
+        times.append(timeit.default_timer() - start)
+    return min(times)
+
+
+def reader_coverage(file_path):
+    """Coverage through png.Reader rows, like the original analysis."""
+    width, height, rows, meta = png.Reader(filename=file_path).read()
+    values_count = 0.0
+    for row in rows:
+        values_count += sum(row)
+    return values_count / (width * height * meta["planes"] * 255)
+
+
+def benchmark_decoding(args, temp_directory):
+    results = []
+    for width in args.widths:
+        for density in args.densities:
+            paths = corpus.write_frames(temp_directory, width, density, 1)
+            bmp_paths = corpus.write_frames(
+                temp_directory, width, density, 1, "bmp"
+            )
+            height = corpus.get_height(width)
+            pixels = bytes(corpus.create_pixels(width, height, density))
+            params = {"width": width, "density": density}
+
+            for name, function in (
+                ("png_reader_rows", lambda: reader_coverage(paths[0])),
+                ("read_png", lambda: analysis.read_png(paths[0])),
+                ("get_white_coverage",
+                 lambda: analysis.get_white_coverage(paths[0])),
+                ("get_pixels_coverage",
+                 lambda: analysis.get_pixels_coverage(pixels)),
+                ("get_file_hit", lambda: analysis.get_file_hit(paths[0])),
+                ("get_bmp_coverage",
+                 lambda: analysis.get_bmp_coverage(bmp_paths[0])),
+                ("get_bmp_hit", lambda: analysis.get_bmp_hit(bmp_paths[0])),
+                ("get_pixels_hit", lambda: analysis.get_pixels_hit(pixels))
+            ):
+                results.append({
+                    "name": name,
+                    "params": params,
+                    "frames": 1,
+                    "seconds": measure(function, args.repeat)
+                })
+
+            for frame_count in args.frames:
+                stack = [pixels] * frame_count
+                results.append({
+                    "name": "get_batch_coverage",
+                    "params": dict(params, frames=frame_count),
+                    "frames": frame_count,
+                    "seconds": measure(
+                        lambda: analysis.get_batch_coverage(stack),
+                        args.repeat
+                    )
+                })
+    return results
+
+
+def benchmark_orchestration(args, scene, lib):
+    results = []
+    modes = (
+        ("png", {}),
+        ("pipelined", {"pipelined": True}),
+        ("in_memory", {"in_memory": True})
+    )
+    for width in args.widths:
+        scene.width = width
+        for density in args.densities:
+            scene.density = density
+            for frame_count in args.frames:
+                for mode, options in modes:
+                    results.append({
+                        "name": "get_coverage",
+                        "params": {
+                            "mode": mode,
+                            "width": width,
+                            "density": density,
+                            "frames": frame_count
+                        },
+                        "frames": frame_count,
+                        "seconds": measure(
+                            lambda: lib.get_coverage(
+                                start_frame=1,
+                                end_frame=frame_count,
+                                width=width,
+                                **options
+                            ),
+                            args.repeat
+                        )
+                    })
+    return results
+
+
+def benchmark_pipelining(args, scene, lib):
+    """Time how much scoring overlaps with a capture that holds the
+    interpreter lock while drawing, like a playblast does."""
+    results = []
+    modes = [("sequential", {}), ("threads", {})]
+
+    # Scoring processes are spawned, which requires Python 3.
+    if hasattr(multiprocessing, "get_context"):
+        modes.append(("processes", {"processes": True}))
+    scene.draw_time = 0.005
+    try:
+        for width in args.widths:
+            scene.width = width
+            for frame_count in args.frames:
+                for mode, options in modes:
+                    if mode == "sequential":
+                        def function():
+                            directory = lib.capture_frames(
+                                start_frame=1,
+                                end_frame=frame_count,
+                                width=width
+                            )
+                            for path in sorted(os.listdir(directory)):
+                                lib.score_file(os.path.join(directory, path))
+                            shutil.rmtree(directory)
+                    else:
+                        def function():
+                            lib.capture_frames_pipelined(
+                                start_frame=1,
+                                end_frame=frame_count,
+                                width=width,
+                                **options
+                            )
+                    results.append({
+                        "name": "pipelining",
+                        "params": {
+                            "mode": mode,
+                            "width": width,
+                            "frames": frame_count,
+                            "draw_time": scene.draw_time
+                        },
+                        "frames": frame_count,
+                        "seconds": measure(function, args.repeat)
+                    })
+    finally:
+        scene.draw_time = 0.0
+    return results
+
+
+def benchmark_geometry(args):
+    from intersections_tool import geometry
+    if geometry.numpy is None:
+        return []
+
+    numpy = geometry.numpy
+    random = numpy.random.RandomState(0)
+    results = []
+    for count in (1000, 10000, 50000):
+        centers = random.uniform(0, 100, (count, 1, 3))
+        triangles = centers + random.uniform(-1, 1, (count, 3, 3))
+        results.append({
+            "name": "get_intersection_coverage",
+            "params": {"triangles": count},
+            "frames": 1,
+            "seconds": measure(
+                lambda: geometry.get_intersection_coverage(triangles),
+                args.repeat
+            )
+        })
+    return results
+
+
+def benchmark_results(args, temp_directory):
+    """Time building, saving and loading coverage data."""
+    from intersections_tool.results import CoverageData
+
+    path = os.path.join(temp_directory, "coverage.itcd")
+    results = []
+    for frame_count in (1000, 10000, 100000):
+        rows = [[float(frame), frame % 7 / 100.0] for frame in
+                range(frame_count)]
+        data = CoverageData(rows)
+        data.save(path)
+
+        for name, function in (
+                ("build_coverage_data", lambda: CoverageData(rows)),
+                ("save_coverage_data", lambda: data.save(path)),
+                ("load_coverage_data", lambda: CoverageData.load(path)),
+                ("read_coverage_data",
+                 lambda: CoverageData.load(path, memory_map=False))):
+            results.append({
+                "name": name,
+                "params": {"frames": frame_count},
+                "frames": frame_count,
+                "seconds": measure(function, args.repeat)
+            })
+    return results
+
+
+def benchmark_table(args):
+    """Time filling and sorting the results table, when a Qt binding is
+    available."""
+    try:
+        from intersections_tool.vendor.Qt import QtCore, QtWidgets
+        from intersections_tool import app
+    except Exception:
+        return []
+
+    application = (
+        QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    )
+
+    results = []
+    for frame_count in args.frames + [100000]:
+        rows = [[float(frame), frame % 7 / 100.0, ""] for frame in
+                range(frame_count)]
+
+        def populate():
+            model = app.CoverageModel()
+            model.add_rows(rows)
+            model.sort(1, QtCore.Qt.AscendingOrder)
+
+        results.append({
+            "name": "populate_table",
+            "params": {"frames": frame_count},
+            "frames": frame_count,
+            "seconds": measure(populate, args.repeat)
+        })
+
+    application.processEvents()
+    return results
+
+
+def get_environment():
+    numpy = analysis.numpy
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": multiprocessing.cpu_count(),
+        "numpy": numpy.__version__ if numpy is not None else None,
+        "version": intersections_tool.version
+    }
+
+
+def get_key(result):
+    return result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results, path):
+    """Print the speed ratio to matching results of an earlier run."""
+    with open(path, "r") as f:
+        previous = dict(
+            (get_key(result), result) for result in json.load(f)["results"]
+        )
+
+    for result in results:
+        old = previous.get(get_key(result))
+        if not old or not result["seconds"]:
+            continue
+        print("{0:<28}{1:<70}{2:>8.2f}x".format(
+            result["name"],
+            get_key(result)[1],
+            old["seconds"] / result["seconds"]
+        ))
+
+
+def get_parser():
+    def integers(text):
+        return [int(value) for value in text.split(",")]
+
+    def floats(text):
+        return [float(value) for value in text.split(",")]
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--widths", type=integers, default=[40, 160, 640])
+    parser.add_argument("--frames", type=integers, default=[10, 100])
+    parser.add_argument("--densities", type=floats, default=[0.0, 0.01, 0.1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="Results of an earlier run.")
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+
+    scene = fake_maya.install()
+    from intersections_tool import lib
+    fake_maya.patch_lib(lib, scene)
+
+    temp_directory = tempfile.mkdtemp()
+    try:
+        results = benchmark_decoding(args, temp_directory)
+        results.extend(benchmark_results(args, temp_directory))
+    finally:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+    results.extend(benchmark_orchestration(args, scene, lib))
+    results.extend(benchmark_pipelining(args, scene, lib))
+    results.extend(benchmark_geometry(args))
+    results.extend(benchmark_table(args))
+
+    for result in results:
+        result["seconds_per_frame"] = result["seconds"] / result["frames"]
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {"environment": get_environment(), "results": results},
+            f,
+            indent=4,
+            sort_keys=True
+        )
+
+    if args.compare:
+        compare(results, args.compare)
+
+    print("Wrote {0} results to {1}".format(len(results), args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,13 @@
-import app
+def show(parent=None):
+    """Show the GUI inside a Maya session.
+
+    The GUI is imported on first use, so headless workers and the command
+    line do not load Qt and pymel through the package.
+    """
+    from . import app
+    return app.show(parent)
 
 
-show = app.show
 VERSION_MAJOR = 1
 VERSION_MINOR = 0
 VERSION_PATCH = 0
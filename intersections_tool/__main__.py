@@ -0,0 +1,6 @@
+import sys
+
+from intersections_tool import cli
+
+
+sys.exit(cli.main())
@@ -0,0 +1,868 @@
+"""Pixel analysis of captured frames.
+
+This module does not depend on Maya, so it can be used and benchmarked on
+frames outside of a Maya session. NumPy is used when available, otherwise
+the analysis falls back to pure Python.
+"""
+import os
+import math
+import mmap
+import zlib
+import struct
+
+from .vendor import png
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _iter_idat(reader):
+    """Yield the compressed data of the IDAT chunks of a png reader."""
+    while True:
+        chunk_type, data = reader.chunk()
+        if chunk_type == b"IEND":
+            break
+        if chunk_type == b"IDAT":
+            yield data
+
+
+def _iter_decompressed(data_blocks, size=16384):
+    """Decompress data in small blocks, so rows can be decoded before the
+    whole image is decompressed."""
+    decompressor = zlib.decompressobj()
+    for data in data_blocks:
+        while data:
+            yield decompressor.decompress(data, size)
+            data = decompressor.unconsumed_tail
+    yield decompressor.flush()
+
+
+def read_png(file_path):
+    """Decode a png image into one contiguous buffer of 8 bit values.
+
+    Args:
+        file_path (str): Path to png image file to decode.
+
+    Returns:
+        list: [
+            int: width,
+            int: height,
+            int: planes,
+            bytearray: pixel data with rows running top to bottom
+        ]
+    """
+    reader = png.Reader(filename=file_path)
+    reader.preamble()
+
+    # Only straight 8 bit images can skip the row by row value conversion.
+    if reader.bitdepth != 8 or reader.interlace or reader.colormap:
+        width, height, pixels, meta = reader.asRGBA8()
+        values = bytearray()
+        for row in pixels:
+            values.extend(row)
+        return [width, height, 4, values]
+
+    raw = png.decompress(_iter_idat(reader))
+
+    values = bytearray()
+    for row in reader.iter_straight_byte_rows(raw):
+        values.extend(row)
+
+    return [reader.width, reader.height, reader.planes, values]
+
+
+# Bmp file header and the start of the info header: signature, pixel data
+# offset, info header size, width, height, color planes, bits per pixel
+# and compression.
+_BMP_HEADER = struct.Struct("<2s8xIIiiHHI")
+
+
+def is_bmp(file_path):
+    """Whether an image file is an uncompressed bmp capture."""
+    return file_path.lower().endswith(".bmp")
+
+
+def _get_bmp_layout(buffer):
+    """Get the layout of the pixel data of uncompressed 24 or 32 bit bmp
+    data.
+
+    Returns:
+        list: [
+            int: width,
+            int: height,
+            int: bytes per pixel,
+            int: offset of the first row in the data,
+            int: bytes per row including padding,
+            bool: whether rows run top to bottom
+        ]
+    """
+    if len(buffer) < _BMP_HEADER.size:
+        raise ValueError("Invalid bmp data.")
+
+    (signature, offset, info_size, width, height, color_planes, bits,
+     compression) = _BMP_HEADER.unpack_from(buffer)
+
+    # Bitfields of 32 bit images are assumed to be the default BGRA order.
+    if (signature != b"BM" or bits not in (24, 32) or
+            compression not in (0, 3)):
+        raise ValueError("Only uncompressed 24 or 32 bit bmp is supported.")
+
+    stride = (bits * width + 31) // 32 * 4
+    if offset + stride * abs(height) > len(buffer):
+        raise ValueError("Truncated bmp data.")
+
+    return [width, abs(height), bits // 8, offset, stride, height < 0]
+
+
+def _map_file(file_path):
+    """Memory map a file for reading."""
+    with open(file_path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _iter_bmp_rows(mapped, width, height, planes, offset, stride):
+    """Yield the pixel bytes of each row of bmp data, without padding.
+
+    Rows are memoryviews of the map that are released when the next row is
+    yielded, so close the generator before closing the map. Maps of Python
+    2 do not support memoryviews, so rows are copied there.
+    """
+    try:
+        view = memoryview(mapped)
+    except TypeError:
+        for row in range(height):
+            start = offset + row * stride
+            yield bytearray(mapped[start:start + width * planes])
+        return
+
+    row_view = None
+    try:
+        for row in range(height):
+            start = offset + row * stride
+            row_view = view[start:start + width * planes]
+            yield row_view
+            row_view.release()
+    finally:
+        if row_view is not None:
+            row_view.release()
+        view.release()
+
+
+def read_bmp(file_path):
+    """Decode an uncompressed bmp image into one contiguous buffer like
+    `read_png`.
+
+    Args:
+        file_path (str): Path to bmp image file to decode.
+
+    Returns:
+        list: [
+            int: width,
+            int: height,
+            int: planes, always 3,
+            bytearray: RGB pixel data with rows running top to bottom
+        ]
+    """
+    mapped = _map_file(file_path)
+    try:
+        width, height, planes, offset, stride, top_down = _get_bmp_layout(
+            mapped
+        )
+        rows = [
+            bytearray(row) for row in
+            _iter_bmp_rows(mapped, width, height, planes, offset, stride)
+        ]
+    finally:
+        mapped.close()
+
+    if not top_down:
+        rows.reverse()
+
+    # Bmp stores blue, green and red.
+    values = bytearray(width * height * 3)
+    for index, row in enumerate(rows):
+        start = index * width * 3
+        for channel in range(3):
+            values[start + channel:start + width * 3:3] = (
+                row[2 - channel::planes]
+            )
+
+    return [width, height, 3, values]
+
+
+def _get_bmp_values(mapped):
+    """View the color values of bmp data in place, shaped (height, width,
+    3) in blue, green, red order and unordered rows."""
+    width, height, planes, offset, stride, top_down = _get_bmp_layout(mapped)
+    return numpy.ndarray(
+        (height, width, 3),
+        dtype=numpy.uint8,
+        buffer=mapped,
+        offset=offset,
+        strides=(stride, planes, 1)
+    )
+
+
+def get_bmp_coverage(file_path):
+    """Analyze the luminance coverage of an uncompressed bmp image.
+
+    The file is memory mapped, and with NumPy its pixels are summed in
+    place without copying or decoding.
+
+    Args:
+        file_path (str): Path to bmp image file to analyze.
+
+    Returns:
+        float: 0-1 value for the percentage of non-black pixels.
+    """
+    mapped = _map_file(file_path)
+    try:
+        if numpy is not None:
+            values = _get_bmp_values(mapped)
+            values_max = values.size * 255.0
+            total = values.sum(dtype=numpy.uint64)
+
+            # The map can only be closed once nothing views it.
+            del values
+        else:
+            width, height, planes, offset, stride, top_down = (
+                _get_bmp_layout(mapped)
+            )
+            values_max = width * height * 3 * 255.0
+            total = 0
+            rows = _iter_bmp_rows(
+                mapped, width, height, planes, offset, stride
+            )
+            try:
+                for row in rows:
+                    total += sum(row)
+                    if planes == 4:
+                        total -= sum(row[3::4])
+            finally:
+                rows.close()
+    finally:
+        mapped.close()
+
+    if not values_max:
+        return 0.0
+    return float(total) / values_max
+
+
+def get_bmp_hit(file_path, threshold=0, block_rows=64):
+    """Detect whether an uncompressed bmp image has any pixel above a
+    threshold.
+
+    The file is memory mapped and checked a block of rows at a time, until
+    the first block with such a pixel.
+
+    Args:
+        file_path (str): Path to bmp image file to analyze.
+        threshold (int, optional): 0-255 value pixels have to exceed.
+            Defaults to any non-black pixel.
+        block_rows (int, optional): Rows checked at once.
+
+    Returns:
+        bool: Whether a pixel exceeds the threshold.
+    """
+    mapped = _map_file(file_path)
+    try:
+        if numpy is not None:
+            values = _get_bmp_values(mapped)
+            hit = False
+            for start in range(0, len(values), block_rows):
+                if values[start:start + block_rows].max() > threshold:
+                    hit = True
+                    break
+            del values
+            return hit
+
+        width, height, planes, offset, stride, top_down = _get_bmp_layout(
+            mapped
+        )
+        rows = _iter_bmp_rows(mapped, width, height, planes, offset, stride)
+        try:
+            for row in rows:
+                if get_pixels_hit(row, planes, threshold):
+                    return True
+            return False
+        finally:
+            rows.close()
+    finally:
+        mapped.close()
+
+
+def read_image(file_path):
+    """Decode a captured png or bmp image, see `read_png`."""
+    if is_bmp(file_path):
+        return read_bmp(file_path)
+    return read_png(file_path)
+
+
+def get_pixels_coverage(pixels, planes=4):
+    """Analyze the luminance coverage as 0-1 float in raw pixel data.
+
+    Alpha channels are ignored.
+
+    Args:
+        pixels (str): Pixel data with 8 bits per channel.
+        planes (int, optional): Channels per pixel. Defaults to RGBA.
+
+    Returns:
+        float: 0-1 value for the percentage of non-black pixels.
+    """
+    color_planes = 3 if planes >= 3 else 1
+    pixel_count = len(pixels) // planes
+    values_max = pixel_count * color_planes * 255
+    if not values_max:
+        return 0.0
+
+    if numpy is not None:
+        values = numpy.frombuffer(pixels, dtype=numpy.uint8)
+        values = values.reshape(pixel_count, planes)[:, :color_planes]
+        return float(values.sum(dtype=numpy.uint64)) / values_max
+
+    values = bytearray(pixels)
+    values_count = float(sum(values))
+    if planes != color_planes:
+        for alpha_index in range(color_planes, planes):
+            values_count -= sum(values[alpha_index::planes])
+
+    return values_count / values_max
+
+
+def get_white_coverage(file_path):
+    """Analyze the luminance coverage as 0-1 float in an image.
+
+    Args:
+        file_path (str): Path to png or bmp image file to analyze.
+
+    Returns:
+        float: 0-1 value for the percentage of non-black pixels.
+    """
+    if is_bmp(file_path):
+        return get_bmp_coverage(file_path)
+
+    width, height, planes, pixels = read_png(file_path)
+    return get_pixels_coverage(pixels, planes)
+
+
+def merge_pixels(pixels, other):
+    """Merge two pixel buffers of the same layout, keeping the brighter
+    value of each channel.
+
+    Args:
+        pixels (str): Pixel data with 8 bits per channel.
+        other (str): Pixel data of the same size.
+
+    Returns:
+        bytearray: Merged pixel data.
+    """
+    if len(pixels) != len(other):
+        raise ValueError("Pixel buffers differ in size.")
+
+    if numpy is not None:
+        return bytearray(numpy.maximum(
+            numpy.frombuffer(pixels, dtype=numpy.uint8),
+            numpy.frombuffer(other, dtype=numpy.uint8)
+        ).tobytes())
+
+    return bytearray(map(max, bytearray(pixels), bytearray(other)))
+
+
+def get_pixels_hit(pixels, planes=4, threshold=0):
+    """Detect whether any pixel has a color value above a threshold.
+
+    Alpha channels are ignored.
+
+    Args:
+        pixels (str): Pixel data with 8 bits per channel.
+        planes (int, optional): Channels per pixel. Defaults to RGBA.
+        threshold (int, optional): 0-255 value pixels have to exceed.
+            Defaults to any non-black pixel.
+
+    Returns:
+        bool: Whether a pixel exceeds the threshold.
+    """
+    color_planes = 3 if planes >= 3 else 1
+    pixel_count = len(pixels) // planes
+    if not pixel_count:
+        return False
+
+    if numpy is not None:
+        values = numpy.frombuffer(pixels, dtype=numpy.uint8)
+        values = values[:pixel_count * planes].reshape(pixel_count, planes)
+        return bool(values[:, :color_planes].max() > threshold)
+
+    values = bytearray(pixels)
+    if planes == color_planes:
+        return max(values) > threshold
+    return any(
+        max(values[index::planes]) > threshold
+        for index in range(color_planes)
+    )
+
+
+def get_file_hit(file_path, threshold=0, block_size=4096):
+    """Detect whether an image has any pixel above a threshold.
+
+    Rows are decompressed and decoded a few at a time, and decoding stops
+    at the first block of rows with a pixel above the threshold.
+
+    Args:
+        file_path (str): Path to png or bmp image file to analyze.
+        threshold (int, optional): 0-255 value pixels have to exceed.
+            Defaults to any non-black pixel.
+        block_size (int, optional): Bytes of decoded rows checked at once.
+
+    Returns:
+        bool: Whether a pixel exceeds the threshold.
+    """
+    if is_bmp(file_path):
+        return get_bmp_hit(file_path, threshold)
+
+    reader = png.Reader(filename=file_path)
+    reader.preamble()
+
+    if reader.bitdepth != 8 or reader.interlace or reader.colormap:
+        width, height, rows, meta = reader.asRGBA8()
+        planes = 4
+    else:
+        rows = reader.iter_straight_byte_rows(
+            _iter_decompressed(_iter_idat(reader))
+        )
+        planes = reader.planes
+
+    # Rows are checked in blocks, as each check has a fixed cost.
+    block = bytearray()
+    for row in rows:
+        block.extend(row)
+        if len(block) >= block_size:
+            if get_pixels_hit(block, planes, threshold):
+                return True
+            del block[:]
+    return get_pixels_hit(block, planes, threshold)
+
+
+def score_file(file_path, threshold=None):
+    """Get the white coverage of a captured frame and delete the file.
+
+    With a 0-255 threshold, whether any pixel exceeds it is detected
+    instead of the coverage. This does not depend on Maya, so frames can be
+    scored in other processes.
+    """
+    if threshold is None:
+        coverage = get_white_coverage(file_path)
+    else:
+        coverage = get_file_hit(file_path, threshold)
+    os.remove(file_path)
+    return coverage
+
+
+def get_batch_coverage(frames, planes=4):
+    """Analyze the luminance coverage of a stack of frames in one call.
+
+    Args:
+        frames (list): Pixel data buffers of equal size, or a NumPy array
+            shaped (frames, height, width, planes).
+        planes (int, optional): Channels per pixel of the pixel data
+            buffers. Defaults to RGBA.
+
+    Returns:
+        list: 0-1 coverage float per frame.
+    """
+    if not len(frames):
+        return []
+
+    if numpy is None:
+        return [get_pixels_coverage(pixels, planes) for pixels in frames]
+
+    if isinstance(frames, numpy.ndarray):
+        planes = frames.shape[-1]
+        stack = frames.reshape(len(frames), -1)
+    else:
+        stack = numpy.empty((len(frames), len(frames[0])), dtype=numpy.uint8)
+        for index, pixels in enumerate(frames):
+            stack[index] = numpy.frombuffer(pixels, dtype=numpy.uint8)
+
+    color_planes = 3 if planes >= 3 else 1
+    stack = stack.reshape(len(frames), -1, planes)[:, :, :color_planes]
+    values_max = stack.shape[1] * color_planes * 255.0
+    if not values_max:
+        return [0.0] * len(frames)
+
+    sums = stack.sum(axis=(1, 2), dtype=numpy.uint64)
+    return [float(value) / values_max for value in sums]
+
+
+def get_files_coverage(file_paths, chunk_size=64):
+    """Analyze the luminance coverage of png images in batches.
+
+    Bmp images are analyzed one at a time in place instead.
+
+    Args:
+        file_paths (list): Paths to png or bmp image files to analyze.
+        chunk_size (int, optional): Amount of frames reduced at once, to
+            limit memory use on long ranges.
+
+    Returns:
+        list: 0-1 coverage float per image.
+    """
+    if all(is_bmp(file_path) for file_path in file_paths):
+        return [get_bmp_coverage(file_path) for file_path in file_paths]
+
+    coverages = []
+    for index in range(0, len(file_paths), chunk_size):
+        images = [
+            read_image(file_path)
+            for file_path in file_paths[index:index + chunk_size]
+        ]
+
+        # Only images of equal layout can be stacked.
+        layouts = set(
+            (width, height, planes) for width, height, planes, _ in images
+        )
+        if len(layouts) == 1:
+            planes = layouts.pop()[2]
+            coverages.extend(
+                get_batch_coverage([image[3] for image in images], planes)
+            )
+        else:
+            coverages.extend(
+                get_pixels_coverage(pixels, planes)
+                for width, height, planes, pixels in images
+            )
+
+    return coverages
+
+
+# Levels per color channel of the colors identifying meshes. Colors are
+# spaced far enough apart to survive rounding in the viewport.
+ID_LEVELS = 8
+
+# Amount of identifying colors, leaving out black background and white
+# intersection lines.
+ID_COUNT = ID_LEVELS ** 3 - 2
+
+
+def get_id_color(index):
+    """Get the color identifying a mesh group.
+
+    Args:
+        index (int): Index of the mesh group, below `ID_COUNT`.
+
+    Returns:
+        tuple: 0-1 RGB color.
+    """
+    if not 0 <= index < ID_COUNT:
+        raise ValueError(
+            "Only {0} mesh groups can be identified.".format(ID_COUNT)
+        )
+
+    value = index + 1
+    levels = (
+        value // ID_LEVELS ** 2, value // ID_LEVELS % ID_LEVELS,
+        value % ID_LEVELS
+    )
+    return tuple(level / float(ID_LEVELS - 1) for level in levels)
+
+
+def _get_label(red, green, blue):
+    levels = [
+        (value * (ID_LEVELS - 1) + 127) // 255 for value in (red, green, blue)
+    ]
+    return levels[0] * ID_LEVELS ** 2 + levels[1] * ID_LEVELS + levels[2] - 1
+
+
+def get_id_coverage(pixels, width, height, planes=4, radius=2):
+    """Analyze coverage of intersection lines per pair of mesh groups.
+
+    Meshes are drawn in the colors of `get_id_color` with white
+    intersection lines over them. Each line pixel is attributed to the two
+    mesh groups found most often within `radius` pixels of it, so groups
+    that merely touch the area of an intersection of two other groups are
+    not paired. A line pixel surrounded by a single group, without any
+    background nearby, is a self intersection of that group. Line pixels
+    next to a single group and the background can not be attributed, and
+    like line pixels with no group nearby only count towards the coverage.
+
+    Coverage is the share of line pixels, where the coverage of other
+    frames is the share of white in the frame. Both are the same for fully
+    white lines, but antialiased line pixels count fully here.
+
+    Args:
+        pixels (str): Pixel data with 8 bits per channel, rows running top
+            to bottom.
+        width (int): Width of the frame in pixels.
+        height (int): Height of the frame in pixels.
+        planes (int, optional): Channels per pixel. Defaults to RGBA.
+        radius (int, optional): Distance in pixels searched around line
+            pixels for mesh groups.
+
+    Returns:
+        list: [
+            float: 0-1 value for the percentage of line pixels,
+            dict: 0-1 value for the percentage of line pixels per pair of
+                mesh group indices, with the lower index first
+        ]
+    """
+    pixel_count = width * height
+    if not pixel_count:
+        return [0.0, {}]
+
+    offsets = [
+        (row, column)
+        for row in range(-radius, radius + 1)
+        for column in range(-radius, radius + 1)
+    ]
+
+    if numpy is not None:
+        values = numpy.frombuffer(pixels, dtype=numpy.uint8)
+        values = values.reshape(height, width, planes)[:, :, :3]
+        levels = (values.astype(numpy.int32) * (ID_LEVELS - 1) + 127) // 255
+        labels = (
+            levels[:, :, 0] * ID_LEVELS ** 2 + levels[:, :, 1] * ID_LEVELS +
+            levels[:, :, 2] - 1
+        )
+
+        rows, columns = numpy.nonzero(labels == ID_COUNT)
+        if not len(rows):
+            return [0.0, {}]
+
+        # Outside of the frame counts as neither group nor background.
+        padded = numpy.pad(
+            labels, radius, "constant", constant_values=ID_COUNT
+        )
+        neighbours = numpy.stack([
+            padded[rows + radius + row, columns + radius + column]
+            for row, column in offsets
+        ], axis=1)
+        groups = (neighbours >= 0) & (neighbours < ID_COUNT)
+        background = (neighbours < 0).any(axis=1)
+
+        # Rank the groups around each line pixel by how often they occur,
+        # then by the lower index.
+        votes = (neighbours[:, :, None] == neighbours[:, None, :]).sum(axis=2)
+        scores = numpy.where(
+            groups, votes * (ID_COUNT + 1) + ID_COUNT - neighbours, -1
+        )
+        pixel_indices = numpy.arange(len(rows))
+        first = neighbours[pixel_indices, scores.argmax(axis=1)]
+        found = scores.max(axis=1) >= 0
+
+        scores[neighbours == first[:, None]] = -1
+        second = neighbours[pixel_indices, scores.argmax(axis=1)]
+        paired = scores.max(axis=1) >= 0
+
+        attributed = paired | (found & ~background)
+        low = numpy.where(paired, numpy.minimum(first, second), first)
+        high = numpy.where(paired, numpy.maximum(first, second), first)
+
+        pairs = {}
+        if attributed.any():
+            keys, counts = numpy.unique(
+                numpy.stack([low[attributed], high[attributed]], axis=1),
+                axis=0,
+                return_counts=True
+            )
+            for (a, b), count in zip(keys.tolist(), counts.tolist()):
+                pairs[(a, b)] = float(count) / pixel_count
+
+        return [float(len(rows)) / pixel_count, pairs]
+
+    values = bytearray(pixels)
+    labels = [
+        _get_label(*values[index:index + 3])
+        for index in range(0, pixel_count * planes, planes)
+    ]
+
+    line_count = 0
+    counts = {}
+    for index, label in enumerate(labels):
+        if label != ID_COUNT:
+            continue
+        line_count += 1
+
+        row, column = divmod(index, width)
+        found = [
+            labels[(row + y) * width + column + x]
+            for y, x in offsets
+            if 0 <= row + y < height and 0 <= column + x < width
+        ]
+        votes = {}
+        for value in found:
+            if 0 <= value < ID_COUNT:
+                votes[value] = votes.get(value, 0) + 1
+        ranked = sorted(votes, key=lambda value: (-votes[value], value))
+
+        if len(ranked) > 1:
+            pair = tuple(sorted(ranked[:2]))
+        elif ranked and min(found) >= 0:
+            pair = (ranked[0], ranked[0])
+        else:
+            continue
+        counts[pair] = counts.get(pair, 0) + 1
+
+    pairs = dict(
+        (pair, float(count) / pixel_count) for pair, count in counts.items()
+    )
+    return [float(line_count) / pixel_count, pairs]
+
+
+# Lowest channel value of white intersection lines drawn over identifying
+# colors, halfway between the two highest color levels.
+WHITE_MINIMUM = 255 - 255 // (2 * (ID_LEVELS - 1))
+
+
+def _get_runs(pixels, width, height, planes, white_only):
+    """Get the runs of lit pixels as (row, start, end) with exclusive end."""
+    color_planes = 3 if planes >= 3 else 1
+
+    if numpy is not None:
+        values = numpy.frombuffer(pixels, dtype=numpy.uint8)
+        values = values.reshape(height, width, planes)[:, :, :color_planes]
+        if white_only:
+            lit = values.min(axis=2) >= WHITE_MINIMUM
+        else:
+            lit = values.any(axis=2)
+
+        padded = numpy.zeros((height, width + 2), dtype=numpy.int8)
+        padded[:, 1:-1] = lit
+        changes = numpy.diff(padded, axis=1)
+        rows, starts = numpy.nonzero(changes == 1)
+        ends = numpy.nonzero(changes == -1)[1]
+        return list(zip(rows.tolist(), starts.tolist(), ends.tolist()))
+
+    values = bytearray(pixels)
+    runs = []
+    for row in range(height):
+        start = None
+        for column in range(width + 1):
+            lit = False
+            if column < width:
+                index = (row * width + column) * planes
+                channels = values[index:index + color_planes]
+                if white_only:
+                    lit = min(channels) >= WHITE_MINIMUM
+                else:
+                    lit = any(channels)
+
+            if lit and start is None:
+                start = column
+            elif not lit and start is not None:
+                runs.append((row, start, column))
+                start = None
+    return runs
+
+
+def get_regions(pixels, width, height, planes=4, white_only=False):
+    """Find the connected regions of intersection pixels in a frame.
+
+    Rows are reduced to runs of lit pixels, and runs touching runs of the
+    row above, also diagonally, are joined into regions.
+
+    Args:
+        pixels (str): Pixel data with 8 bits per channel, rows running top
+            to bottom.
+        width (int): Width of the frame in pixels.
+        height (int): Height of the frame in pixels.
+        planes (int, optional): Channels per pixel. Defaults to RGBA.
+        white_only (bool, optional): Only white pixels are lit, for frames
+            with meshes drawn in identifying colors. Defaults to any
+            non-black pixel.
+
+    Returns:
+        list: Regions as [left, top, right, bottom, share] lists, largest
+            first. The bounds are 0-1 values of the frame size, with right
+            and bottom exclusive, and share is the 0-1 value of the frame
+            pixels in the region.
+    """
+    if not width * height:
+        return []
+
+    runs = _get_runs(pixels, width, height, planes, white_only)
+
+    parents = list(range(len(runs)))
+
+    def find(index):
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    previous = []
+    current = []
+    row = -2
+    position = 0
+    for index, (run_row, start, end) in enumerate(runs):
+        if run_row != row:
+            previous = current if run_row == row + 1 else []
+            current = []
+            row = run_row
+            position = 0
+
+        # Skip runs of the row above that end before this run can touch.
+        while (position < len(previous) and
+               runs[previous[position]][2] < start):
+            position += 1
+        other = position
+        while other < len(previous) and runs[previous[other]][1] <= end:
+            parents[find(previous[other])] = find(index)
+            other += 1
+
+        current.append(index)
+
+    regions = {}
+    for index, (run_row, start, end) in enumerate(runs):
+        root = find(index)
+        if root not in regions:
+            regions[root] = [start, run_row, end, run_row + 1, 0]
+        region = regions[root]
+        region[0] = min(region[0], start)
+        region[1] = min(region[1], run_row)
+        region[2] = max(region[2], end)
+        region[3] = max(region[3], run_row + 1)
+        region[4] += end - start
+
+    pixel_count = float(width * height)
+    return [
+        [
+            left / float(width), top / float(height),
+            right / float(width), bottom / float(height),
+            count / pixel_count
+        ]
+        for left, top, right, bottom, count in sorted(
+            regions.values(), key=lambda region: -region[4]
+        )
+    ]
+
+
+def get_heatmap(frame_regions, width=40, height=30):
+    """Merge the regions of many frames into a heatmap.
+
+    Args:
+        frame_regions (list): Regions of `get_regions` per frame.
+        width (int, optional): Columns of the heatmap.
+        height (int, optional): Rows of the heatmap.
+
+    Returns:
+        list: Rows running top to bottom of the amount of frames with a
+            region covering each cell.
+    """
+    heatmap = [[0] * width for _ in range(height)]
+    for regions in frame_regions:
+        covered = set()
+        for left, top, right, bottom, share in regions:
+            rows = range(
+                int(top * height), int(math.ceil(bottom * height))
+            )
+            columns = range(
+                int(left * width), int(math.ceil(right * width))
+            )
+            covered.update((row, column) for row in rows for column in columns)
+
+        for row, column in covered:
+            heatmap[row][column] += 1
+
+    return heatmap
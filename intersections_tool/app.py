@@ -1,10 +1,12 @@
 import sys
+import timeit
+from array import array
 
 import maya.OpenMaya as om
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 from maya import cmds
 
-from intersections_tool.vendor.Qt import QtCore, QtWidgets
+from intersections_tool.vendor.Qt import QtCore, QtGui, QtWidgets
 from intersections_tool import lib
 
 
@@ -23,6 +25,7 @@ class TimeWidget(QtWidgets.QWidget):
     RangeTimeSlider = "Time Slider"
     RangeStartEnd = "Start/End"
     CurrentFrame = "Current Frame"
+    CustomFrames = "Custom Frames"
 
     def __init__(self, parent=None):
         super(TimeWidget, self).__init__(parent=parent)
@@ -36,7 +39,8 @@ class TimeWidget(QtWidgets.QWidget):
         self.mode = QtWidgets.QComboBox()
         self.mode.addItems([self.RangeTimeSlider,
                             self.RangeStartEnd,
-                            self.CurrentFrame])
+                            self.CurrentFrame,
+                            self.CustomFrames])
 
         frame_input_height = 20
         self.start = QtWidgets.QSpinBox()
@@ -100,6 +104,19 @@ class TimeWidget(QtWidgets.QWidget):
             self.custom_frames.setVisible(False)
             mode_values = self.start.value(), self.end.value()
 
+        elif mode == self.CustomFrames:
+            self.start.setVisible(False)
+            self.end.setVisible(False)
+            self.custom_frames.setVisible(True)
+            mode_values = "({})".format(self.custom_frames.text())
+
+            # Highlight frames that can not be analyzed.
+            try:
+                valid = bool(lib.parse_frames(self.custom_frames.text()))
+            except ValueError:
+                valid = False
+            self.custom_frames.setStyleSheet("" if valid else self.highlight)
+
         else:
             self.start.setEnabled(False)
             self.end.setEnabled(False)
@@ -134,13 +151,22 @@ class TimeWidget(QtWidgets.QWidget):
         elif mode == self.CurrentFrame:
             start = end = lib.get_current_frame()
 
+        elif mode == self.CustomFrames:
+            frames = lib.parse_frames(self.custom_frames.text())
+            if not frames:
+                raise ValueError("No custom frames to analyze.")
+            return {"start_frame": frames[0],
+                    "end_frame": frames[-1],
+                    "frames": frames}
+
         return {"start_frame": start,
                 "end_frame": end}
 
     def get_inputs(self, as_preset):
         return {"time": self.mode.currentText(),
                 "start_frame": self.start.value(),
-                "end_frame": self.end.value()}
+                "end_frame": self.end.value(),
+                "frame": self.custom_frames.text()}
 
     def apply_inputs(self, settings):
         # get values
@@ -213,10 +239,23 @@ class CameraWidget(QtWidgets.QWidget):
         self.get_active.setToolTip("Set camera from currently active view")
         self.refresh = QtWidgets.QPushButton("Refresh")
         self.refresh.setToolTip("Refresh the list of cameras")
+        self.multiple = QtWidgets.QCheckBox("More cameras")
+        self.multiple.setToolTip(
+            "Analyze the frames from more cameras with the same setup"
+        )
+
+        self.extra_cameras = QtWidgets.QListWidget()
+        self.extra_cameras.setSelectionMode(
+            QtWidgets.QAbstractItemView.ExtendedSelection
+        )
+        self.extra_cameras.setMaximumHeight(80)
+        self.extra_cameras.setVisible(False)
 
         self._layout.addWidget(self.cameras)
         self._layout.addWidget(self.get_active)
         self._layout.addWidget(self.refresh)
+        self._layout.addWidget(self.multiple)
+        self._layout.addWidget(self.extra_cameras)
 
         # Signals
         self.connections()
@@ -231,6 +270,7 @@ class CameraWidget(QtWidgets.QWidget):
 
         self.cameras.currentIndexChanged.connect(self.on_update_label)
         self.cameras.currentIndexChanged.connect(self.validate)
+        self.multiple.toggled.connect(self.extra_cameras.setVisible)
 
     def set_active_cam(self):
         cam = lib.get_current_camera()
@@ -272,6 +312,16 @@ class CameraWidget(QtWidgets.QWidget):
 
         return {"camera": camera}
 
+    def get_cameras(self):
+        """Return the selected camera followed by the extra cameras."""
+        camera = self.get_outputs()["camera"]
+        cameras = [camera] if camera else []
+        if self.multiple.isChecked():
+            for item in self.extra_cameras.selectedItems():
+                if item.text() not in cameras:
+                    cameras.append(str(item.text()))
+        return cameras
+
     def on_refresh(self, camera=None):
         """Refresh the camera list with all current cameras in scene.
         A currentIndexChanged signal is only emitted for the cameras combobox
@@ -302,6 +352,16 @@ class CameraWidget(QtWidgets.QWidget):
                                             fullPath=True)
         self.cameras.addItems(cam_transforms)
 
+        # Keep the selection of extra cameras that still exist.
+        selected = [
+            item.text() for item in self.extra_cameras.selectedItems()
+        ]
+        self.extra_cameras.clear()
+        self.extra_cameras.addItems(cam_transforms)
+        for i in range(self.extra_cameras.count()):
+            item = self.extra_cameras.item(i)
+            item.setSelected(item.text() in selected)
+
         # If original selection, try to reselect
         self.select_camera(camera)
 
@@ -321,20 +381,203 @@ class CameraWidget(QtWidgets.QWidget):
         self.label_changed.emit(self.label)
 
 
-class table_widget_item(QtWidgets.QTableWidgetItem):
-    def __init__(self, value):
-        super(table_widget_item, self).__init__(str(value))
+class CoverageModel(QtCore.QAbstractTableModel):
+    """Table model of frames, coverage and details kept in typed arrays.
 
-    def __lt__(self, other):
-        if (isinstance(other, table_widget_item)):
-            selfDataValue = float(self.data(QtCore.Qt.EditRole))
-            otherDataValue = float(other.data(QtCore.Qt.EditRole))
-            return selfDataValue < otherDataValue
+    Cells are formatted only when the view draws them, and sorting orders
+    the arrays by their numbers instead of comparing items.
+    """
+
+    headers = ["frame", "coverage", "details"]
+
+    def __init__(self, parent=None):
+        super(CoverageModel, self).__init__(parent)
+        self.frames = array("d")
+        self.coverages = array("d")
+        self.details = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.frames)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return str(self.frames[row])
+            if column == 1:
+                return str(self.coverages[row])
+            return self.details[row]
+        if role == QtCore.Qt.UserRole and column < 2:
+            return (self.frames, self.coverages)[column][row]
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if (role == QtCore.Qt.DisplayRole and
+                orientation == QtCore.Qt.Horizontal):
+            return self.headers[section]
+        return None
+
+    def clear(self):
+        self.beginResetModel()
+        self.frames = array("d")
+        self.coverages = array("d")
+        self.details = []
+        self.endResetModel()
+
+    def add_rows(self, rows):
+        """Add [frame, coverage, details] rows at the end."""
+        if not rows:
+            return
+
+        count = len(self.frames)
+        self.beginInsertRows(
+            QtCore.QModelIndex(), count, count + len(rows) - 1
+        )
+        for frame, coverage, details in rows:
+            self.frames.append(frame)
+            self.coverages.append(coverage)
+            self.details.append(details)
+        self.endInsertRows()
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        if column == 0:
+            keys = self.frames
+        elif column == 1:
+            keys = self.coverages
         else:
-            return QtWidgets.QTableWidgetItem.__lt__(self, other)
+            keys = self.details
+
+        self.layoutAboutToBeChanged.emit()
+        indices = sorted(
+            range(len(keys)),
+            key=keys.__getitem__,
+            reverse=order == QtCore.Qt.DescendingOrder
+        )
+        self.frames = array("d", [self.frames[i] for i in indices])
+        self.coverages = array("d", [self.coverages[i] for i in indices])
+        self.details = [self.details[i] for i in indices]
+        self.layoutChanged.emit()
+
+
+class TimelineWidget(QtWidgets.QWidget):
+    """Graph of coverage over frames. Clicking emits the frame under the
+    cursor.
+
+    Frames are reduced to the highest coverage per pixel column, so drawing
+    costs the same for any amount of frames.
+    """
+
+    frame_clicked = QtCore.Signal(float)
+
+    def __init__(self, parent=None):
+        super(TimelineWidget, self).__init__(parent)
+        self.setMinimumHeight(60)
+        self.frames = array("d")
+        self.coverages = array("d")
+        self.start_frame = 0.0
+        self.end_frame = 1.0
+        self.current_frame = None
+        self._columns = None
+
+    def set_range(self, start_frame, end_frame):
+        self.start_frame = float(start_frame)
+        self.end_frame = float(max(end_frame, start_frame + 1))
+        self.set_data(array("d"), array("d"))
+
+    def set_data(self, frames, coverages):
+        self.frames = frames
+        self.coverages = coverages
+        self._columns = None
+        self.update()
+
+    def add_data(self, frames, coverages):
+        """Append frames, updating the columns in place instead of
+        reducing every frame again."""
+        self.frames.extend(frames)
+        self.coverages.extend(coverages)
+        columns = self._columns
+        if columns is not None:
+            width = len(columns)
+            for frame, coverage in zip(frames, coverages):
+                x = self.get_x(frame)
+                if 0 <= x < width and coverage > columns[x]:
+                    columns[x] = coverage
+        self.update()
+
+    def get_frame(self, x):
+        ratio = min(max(float(x) / max(self.width() - 1, 1), 0.0), 1.0)
+        return float(round(
+            self.start_frame + ratio * (self.end_frame - self.start_frame)
+        ))
+
+    def get_x(self, frame):
+        length = self.end_frame - self.start_frame
+        ratio = (frame - self.start_frame) / length
+        return int(ratio * (self.width() - 1))
+
+    def get_columns(self):
+        """Get the highest coverage per pixel column."""
+        width = self.width()
+        if self._columns is None or len(self._columns) != width:
+            columns = [0.0] * width
+            for frame, coverage in zip(self.frames, self.coverages):
+                x = self.get_x(frame)
+                if 0 <= x < width and coverage > columns[x]:
+                    columns[x] = coverage
+            self._columns = columns
+        return self._columns
+
+    def resizeEvent(self, event):
+        self._columns = None
+        super(TimelineWidget, self).resizeEvent(event)
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), self.palette().base())
+
+        columns = self.get_columns()
+        highest = max(columns) if columns else 0.0
+        height = self.height() - 1
+        if highest:
+            painter.setPen(self.palette().highlight().color())
+            for x, coverage in enumerate(columns):
+                if coverage:
+                    top = height - int(coverage / highest * height)
+                    painter.drawLine(x, height, x, top)
+
+        if self.current_frame is not None:
+            painter.setPen(self.palette().text().color())
+            x = self.get_x(self.current_frame)
+            painter.drawLine(x, 0, x, height)
+        painter.end()
+
+    def mousePressEvent(self, event):
+        self.current_frame = self.get_frame(event.pos().x())
+        self.update()
+        self.frame_clicked.emit(self.current_frame)
 
 
 class Window(MayaQWidgetDockableMixin, QtWidgets.QDialog):
+
+    # Frames per playblast, so the table fills in between playblasts and
+    # each step of the analysis only blocks Maya briefly.
+    chunk_size = 5
+
+    # Seconds of analysis per event loop iteration, so the GUI and Maya
+    # stay responsive while analyzing.
+    time_slice = 0.05
+
+    # Milliseconds without scene changes before live mode scores the
+    # current frame, so scrubbing and dragging are scored once they pause.
+    live_delay = 50
+
     def __init__(self, parent=None):
         super(Window, self).__init__(parent)
 
@@ -358,51 +601,594 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QDialog):
         layout.addWidget(self.prune_checkbox)
         self.delete_pfx = QtWidgets.QCheckBox("Delete intersect PFX")
         layout.addWidget(self.delete_pfx)
+        self.in_memory = QtWidgets.QCheckBox("In-memory capture")
+        self.in_memory.setToolTip(
+            "Read frames from the viewport instead of playblasting to disk"
+        )
+        layout.addWidget(self.in_memory)
+        self.uncompressed = QtWidgets.QCheckBox("Uncompressed frames")
+        self.uncompressed.setToolTip(
+            "Playblast to bmp files that are read in place, which is faster "
+            "but uses more disk space"
+        )
+        layout.addWidget(self.uncompressed)
+        self.use_cache = QtWidgets.QCheckBox("Cache results")
+        self.use_cache.setToolTip(
+            "Only capture frames that changed since the last analysis"
+        )
+        layout.addWidget(self.use_cache)
+        self.broad_phase = QtWidgets.QCheckBox("Cull distant meshes")
+        self.broad_phase.setToolTip(
+            "Skip meshes whose bounding box never overlaps another mesh"
+        )
+        layout.addWidget(self.broad_phase)
+        self.partition = QtWidgets.QCheckBox("Static meshes once")
+        self.partition.setToolTip(
+            "Capture intersections of meshes that do not move once, and "
+            "only draw moving meshes and meshes near them per frame"
+        )
+        layout.addWidget(self.partition)
+        self.keep_setup = QtWidgets.QCheckBox("Keep setup")
+        self.keep_setup.setToolTip(
+            "Keep the pfx and render layer between analyses, so repeated "
+            "analyses skip creating them"
+        )
+        self.keep_setup.toggled.connect(self.on_keep_setup_toggled)
+        layout.addWidget(self.keep_setup)
+        self.attribution = QtWidgets.QCheckBox("Attribute meshes")
+        self.attribution.setToolTip(
+            "Draw each mesh in its own color to find which meshes intersect"
+        )
+        layout.addWidget(self.attribution)
+        self.regions = QtWidgets.QCheckBox("Locate regions")
+        self.regions.setToolTip(
+            "Find where intersections are on screen, so the view can be "
+            "framed on them"
+        )
+        layout.addWidget(self.regions)
+        self.layout().addLayout(layout)
+
+        layout = QtWidgets.QHBoxLayout()
+        layout.addWidget(QtWidgets.QLabel("Sample every"))
+        self.stride = QtWidgets.QSpinBox()
+        self.stride.setRange(1, 1000)
+        self.stride.setSuffix(" frames")
+        self.stride.setToolTip(
+            "Sample every Nth frame first and fill in the frames around "
+            "intersections.\nIntersections shorter than N frames can be "
+            "missed."
+        )
+        layout.addWidget(self.stride)
+        layout.addWidget(QtWidgets.QLabel("Width"))
+        self.capture_width = QtWidgets.QSpinBox()
+        self.capture_width.setRange(10, 4096)
+        self.capture_width.setValue(40)
+        self.capture_width.setSuffix(" px")
+        layout.addWidget(self.capture_width)
+        layout.addWidget(QtWidgets.QLabel("Refine width"))
+        self.refine_width = QtWidgets.QSpinBox()
+        self.refine_width.setRange(0, 4096)
+        self.refine_width.setSpecialValueText("Off")
+        self.refine_width.setSuffix(" px")
+        self.refine_width.setToolTip(
+            "Capture frames with intersections again at this width, scaling\n"
+            "their coverage back to the capture width"
+        )
+        layout.addWidget(self.refine_width)
+        layout.addStretch()
         self.layout().addLayout(layout)
+        self.camera_widget.multiple.toggled.connect(self.on_cameras_changed)
+        self.camera_widget.extra_cameras.itemSelectionChanged.connect(
+            self.on_cameras_changed
+        )
+        self.cache = None
+        self.session = None
+        self.metrics = {}
+        self.camera = None
 
+        layout = QtWidgets.QHBoxLayout()
         self.analyze_button = QtWidgets.QPushButton("Analyze Frames")
-        self.layout().addWidget(self.analyze_button)
+        layout.addWidget(self.analyze_button)
         self.analyze_button.clicked.connect(self.on_analyze_button_clicked)
+        self.cancel_button = QtWidgets.QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.on_cancel_button_clicked)
+        layout.addWidget(self.cancel_button)
+        self.live = QtWidgets.QCheckBox("Live")
+        self.live.setToolTip(
+            "Score the current frame whenever the time changes or meshes "
+            "are edited"
+        )
+        self.live.toggled.connect(self.on_live_toggled)
+        layout.addWidget(self.live)
+        self.live_label = QtWidgets.QLabel()
+        layout.addWidget(self.live_label)
+        self.layout().addLayout(layout)
+
+        layout = QtWidgets.QHBoxLayout()
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+        self.eta_label = QtWidgets.QLabel()
+        layout.addWidget(self.eta_label)
+        self.layout().addLayout(layout)
+
+        # The analysis runs in slices on the event loop.
+        self.analysis = None
+        self.results = None
+        self.settings = {}
+        self.start_time = 0.0
+        self.timer = QtCore.QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.on_timer_timeout)
+
+        # Live mode scores the current frame once scene changes settle.
+        self.live_capture = None
+        self.live_callbacks = []
+        self.live_scoring = False
+        self.live_meshes_changed = False
+        self.live_timer = QtCore.QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(self.live_delay)
+        self.live_timer.timeout.connect(self.on_live_timer_timeout)
+
+        self.timeline = TimelineWidget()
+        self.timeline.setToolTip("Click to go to a frame")
+        self.timeline.frame_clicked.connect(lib.set_current_frame)
+        self.layout().addWidget(self.timeline)
+
+        self.model = CoverageModel(self)
+        self.table_view = QtWidgets.QTableView()
+        self.table_view.setModel(self.model)
+        self.layout().addWidget(self.table_view)
+        self.table_view.horizontalHeader().setStretchLastSection(True)
+        self.table_view.verticalHeader().hide()
+        self.table_view.setSortingEnabled(True)
+        self.table_view.setSelectionBehavior(
+            QtWidgets.QAbstractItemView.SelectRows
+        )
+        self.table_view.setEditTriggers(
+            QtWidgets.QAbstractItemView.NoEditTriggers
+        )
+        self.table_view.clicked.connect(self.on_table_view_clicked)
+
+        layout = QtWidgets.QHBoxLayout()
+        self.frame_region_button = QtWidgets.QPushButton("Frame Region")
+        self.frame_region_button.setToolTip(
+            "Zoom the view onto the largest intersection of the selected "
+            "frame"
+        )
+        self.frame_region_button.clicked.connect(
+            self.on_frame_region_button_clicked
+        )
+        layout.addWidget(self.frame_region_button)
+        self.reset_region_button = QtWidgets.QPushButton("Reset View")
+        self.reset_region_button.setToolTip(
+            "Restore the view from before framing a region"
+        )
+        self.reset_region_button.clicked.connect(
+            self.on_reset_region_button_clicked
+        )
+        layout.addWidget(self.reset_region_button)
+        self.layout().addLayout(layout)
 
-        self.table_widget = QtWidgets.QTableWidget(1, 2)
-        self.layout().addWidget(self.table_widget)
-        self.table_widget.setHorizontalHeaderLabels(["frame", "coverage"])
-        self.table_widget.verticalHeader().hide()
-        self.table_widget.setSortingEnabled(True)
-        self.table_widget.setEditTriggers(
+        # Collapsible panel with the time spent per stage.
+        self.stats_button = QtWidgets.QToolButton()
+        self.stats_button.setText("Stages")
+        self.stats_button.setCheckable(True)
+        self.stats_button.setToolButtonStyle(
+            QtCore.Qt.ToolButtonTextBesideIcon
+        )
+        self.stats_button.setArrowType(QtCore.Qt.RightArrow)
+        self.stats_button.setStyleSheet("QToolButton { border: none; }")
+        self.stats_button.toggled.connect(self.on_stats_button_toggled)
+        self.layout().addWidget(self.stats_button)
+
+        self.stats_widget = QtWidgets.QTableWidget(0, 4)
+        self.stats_widget.setHorizontalHeaderLabels(
+            ["stage", "seconds", "frames", "bytes"]
+        )
+        self.stats_widget.verticalHeader().hide()
+        self.stats_widget.setEditTriggers(
             QtWidgets.QTableWidget.NoEditTriggers
         )
-        self.table_widget.cellClicked.connect(
-            self.on_table_widget_cell_clicked
+        self.stats_widget.setVisible(False)
+        self.layout().addWidget(self.stats_widget)
+
+    def get_single_camera_options(self):
+        """Return the checkboxes of options that need a single camera."""
+        return [
+            self.in_memory,
+            self.uncompressed,
+            self.use_cache,
+            self.partition,
+            self.attribution,
+            self.regions
+        ]
+
+    def on_cameras_changed(self):
+        # Analyses of more cameras read the viewport of each camera, so
+        # the options of single camera captures do not apply.
+        single = len(self.camera_widget.get_cameras()) <= 1
+        for widget in self.get_single_camera_options():
+            widget.setEnabled(single)
+        self.refine_width.setEnabled(single)
+
+    def on_keep_setup_toggled(self, checked):
+        # Live mode closes the setup when it stops.
+        if self.live_capture is not None:
+            return
+
+        if not checked and self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def closeEvent(self, event):
+        if self.results is not None:
+            self.on_cancel_button_clicked()
+        self.stop_live()
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        if self.camera is not None:
+            lib.reset_region(self.camera)
+        super(Window, self).closeEvent(event)
+
+    def on_live_toggled(self, checked):
+        if checked:
+            self.start_live()
+        else:
+            self.stop_live()
+
+    def start_live(self):
+        """Keep the pfx setup and a capture panel open, and score the
+        current frame when the time changes or meshes are edited."""
+        if self.results is not None:
+            self.on_cancel_button_clicked()
+
+        # Live scores are plain coverage, without mesh colors.
+        if self.session is not None and self.session.attribution:
+            self.session.close()
+            self.session = None
+        if self.session is None:
+            self.session = lib.Session()
+        self.session.delete_pfx = self.delete_pfx.isChecked()
+        self.session.update()
+
+        # The setup stays active until live mode stops, which switches back
+        # to the render layer of the user.
+        self.camera = self.camera_widget.get_outputs()["camera"]
+        self.live_capture = lib.LiveCapture(
+            self.camera, self.capture_width.value(), session=self.session
+        )
+        self.live_capture.open()
+        self._register_live_callbacks()
+        self.on_live_timer_timeout()
+
+    def stop_live(self):
+        """Remove the live callbacks, capture panel and pfx setup, unless
+        the setup is kept."""
+        self.live_timer.stop()
+        self._remove_live_callbacks()
+
+        if self.live_capture is not None:
+            self.live_capture.close()
+            self.live_capture = None
+
+            if self.session is not None and not self.keep_setup.isChecked():
+                self.session.close()
+                self.session = None
+
+        self.live_label.setText("")
+        self.live_label.setStyleSheet("")
+
+    def _register_live_callbacks(self):
+        """Register time change callbacks, callbacks for meshes being added
+        or removed, and dirty callbacks of the connected meshes and their
+        transforms."""
+        callback = lambda *args: self.on_live_scene_changed()
+
+        self.live_callbacks.append(
+            om.MEventMessage.addEventCallback("timeChanged", callback)
+        )
+
+        meshes_callback = lambda *args: self.on_live_meshes_changed()
+        self.live_callbacks.extend([
+            om.MDGMessage.addNodeAddedCallback(meshes_callback, "mesh"),
+            om.MDGMessage.addNodeRemovedCallback(meshes_callback, "mesh")
+        ])
+
+        meshes = [mesh.fullPath() for mesh in self.session.connections]
+        transforms = []
+        if meshes:
+            transforms = cmds.listRelatives(
+                meshes, parent=True, fullPath=True
+            ) or []
+        selection = om.MSelectionList()
+        for node in set(meshes + transforms):
+            selection.add(node)
+
+        for index in range(selection.length()):
+            node = om.MObject()
+            selection.getDependNode(index, node)
+            self.live_callbacks.append(
+                om.MNodeMessage.addNodeDirtyCallback(node, callback)
+            )
+
+    def _remove_live_callbacks(self):
+        for callback in self.live_callbacks:
+            try:
+                om.MMessage.removeCallback(callback)
+            except Exception as error:
+                lib.error("Encounter error : {}".format(error))
+        self.live_callbacks = []
+
+    def on_live_scene_changed(self):
+        # Drawing the capture panel can dirty nodes itself.
+        if not self.live_scoring:
+            self.live_timer.start()
+
+    def on_live_meshes_changed(self):
+        # Meshes are connected once the changes settle, as the callback
+        # runs while the node is being created or deleted.
+        self.live_meshes_changed = True
+        self.on_live_scene_changed()
+
+    def on_live_timer_timeout(self):
+        """Score the current frame in the live capture panel."""
+        if self.live_capture is None or self.results is not None:
+            return
+
+        frame = lib.get_current_frame()
+        start = timeit.default_timer()
+        self.live_scoring = True
+        try:
+            if self.live_meshes_changed:
+                self.live_meshes_changed = False
+                self._remove_live_callbacks()
+                self.session.update()
+                self._register_live_callbacks()
+            coverage = self.live_capture.score()
+        finally:
+            self.live_scoring = False
+        milliseconds = (timeit.default_timer() - start) * 1000
+
+        self.live_label.setText(
+            "Frame {0:g}: {1:.4f} ({2:.0f} ms)".format(
+                frame, coverage, milliseconds
+            )
         )
+        self.live_label.setStyleSheet("color: red;" if coverage else "")
+        self.timeline.current_frame = frame
+        self.timeline.update()
 
-    def on_table_widget_cell_clicked(self, row, column):
-        self.table_widget.selectRow(row)
-        frame = float(self.table_widget.item(row, 0).text())
+    def on_stats_button_toggled(self, checked):
+        self.stats_button.setArrowType(
+            QtCore.Qt.DownArrow if checked else QtCore.Qt.RightArrow
+        )
+        self.stats_widget.setVisible(checked)
+
+    def set_stages(self, stages):
+        self.stats_widget.setRowCount(0)
+        for stage, values in sorted(
+                stages.items(), key=lambda item: -item[1]["seconds"]):
+            row = self.stats_widget.rowCount()
+            self.stats_widget.insertRow(row)
+            self.stats_widget.setItem(
+                row, 0, QtWidgets.QTableWidgetItem(stage)
+            )
+            for column, value in enumerate([
+                    "{0:.3f}".format(values["seconds"]),
+                    str(values["frames"]),
+                    str(values["bytes"])], 1):
+                self.stats_widget.setItem(
+                    row, column, QtWidgets.QTableWidgetItem(value)
+                )
+
+    def on_frame_region_button_clicked(self):
+        rows = self.table_view.selectionModel().selectedRows()
+        if not rows or self.camera is None:
+            return
+
+        frame = self.model.frames[rows[0].row()]
+        regions = self.metrics.get(frame, {}).get("regions")
+        if not regions:
+            lib.error("No regions found on frame {0}.".format(frame))
+            return
+
+        lib.frame_region(self.camera, regions[0])
+
+    def on_reset_region_button_clicked(self):
+        if self.camera is not None:
+            lib.reset_region(self.camera)
+
+    def on_table_view_clicked(self, index):
+        frame = self.model.frames[index.row()]
+        self.timeline.current_frame = frame
+        self.timeline.update()
         lib.set_current_frame(frame)
 
     def on_analyze_button_clicked(self):
+        # Analyses use their own capture panel and setup.
+        self.live.setChecked(False)
+
         settings = {}
-        settings.update(self.time_widget.get_outputs())
+        try:
+            settings.update(self.time_widget.get_outputs())
+        except ValueError as exception:
+            lib.error(str(exception))
+            return
         settings.update(self.camera_widget.get_outputs())
         settings["delete_pfx"] = self.delete_pfx.isChecked()
+        settings["in_memory"] = self.in_memory.isChecked()
+        settings["image_format"] = (
+            "bmp" if self.uncompressed.isChecked() else "png"
+        )
+        settings["broad_phase"] = self.broad_phase.isChecked()
+        settings["stride"] = self.stride.value()
+        settings["width"] = self.capture_width.value()
+        settings["refine_width"] = self.refine_width.value() or None
+        settings["stats"] = {}
+        settings["metrics"] = self.metrics = {}
+        settings["regions"] = self.regions.isChecked()
+        self.camera = settings["camera"]
+        cameras = self.camera_widget.get_cameras()
+
+        attribution = self.attribution.isChecked() and len(cameras) == 1
+        if attribution:
+            settings["pairs"] = {}
+        settings["partition"] = self.partition.isChecked() and not attribution
+
+        if self.keep_setup.isChecked():
+            if (self.session is not None and
+                    self.session.attribution != attribution):
+                self.session.close()
+                self.session = None
+            if self.session is None:
+                self.session = lib.Session(attribution=attribution)
+            self.session.delete_pfx = self.delete_pfx.isChecked()
+            settings["session"] = self.session
+
+        if not self.in_memory.isChecked():
+            settings["chunk_size"] = self.chunk_size
+        if self.use_cache.isChecked():
+            self.cache = self.cache or lib.CoverageCache()
+            settings["cache"] = self.cache
+
+        self.model.clear()
+        self.timeline.set_range(settings["start_frame"], settings["end_frame"])
+
+        def describe_pairs(frame):
+            pairs = sorted(
+                settings.get("pairs", {}).get(frame, {}).items(),
+                key=lambda item: -item[1]
+            )
+            return ", ".join(" / ".join(pair) for pair, value in pairs)
+
+        def describe_cameras(coverages):
+            return ", ".join(
+                "{0}: {1:.4f}".format(
+                    camera.rsplit("|", 1)[-1], coverages[camera]
+                )
+                for camera in cameras
+            )
+
+        if len(cameras) > 1:
+            # The cameras share the setup and each frame is evaluated once,
+            # with the options the multi camera analysis supports.
+            ignored = [
+                widget.text() for widget in self.get_single_camera_options()
+                if widget.isChecked()
+            ]
+            if settings["refine_width"]:
+                ignored.append("Refine width")
+            if ignored:
+                lib.error(
+                    "Ignoring options not supported with more cameras: "
+                    "{0}".format(", ".join(ignored))
+                )
+            self.analysis = lib.iter_cameras_coverage(
+                cameras,
+                start_frame=settings["start_frame"],
+                end_frame=settings["end_frame"],
+                delete_pfx=settings["delete_pfx"],
+                broad_phase=settings["broad_phase"],
+                width=settings["width"],
+                stats=settings["stats"],
+                stride=settings["stride"],
+                session=settings.get("session"),
+                frames=settings.get("frames")
+            )
+            results = (
+                (frame, coverage, describe_cameras(coverages))
+                for frame, coverage, coverages in self.analysis
+            )
+        else:
+            self.analysis = lib.iter_coverage(**settings)
+            results = (
+                (frame, coverage, describe_pairs(frame))
+                for frame, coverage in self.analysis
+            )
+
+        # Fill the table as frames complete, from the event loop.
+        self.results = results
+        self.settings = settings
+        self.start_time = timeit.default_timer()
+        frame_count = int(settings["end_frame"] - settings["start_frame"]) + 1
+        self.progress_bar.setRange(
+            0, len(settings.get("frames") or []) or frame_count
+        )
+        self.progress_bar.setValue(0)
+        self.eta_label.setText("")
+        self.analyze_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.timer.start()
+
+    def on_timer_timeout(self):
+        """Analyze frames until the time slice is used up."""
+        slice_end = timeit.default_timer() + self.time_slice
+        rows = []
+        try:
+            while timeit.default_timer() < slice_end:
+                frame, coverage, details = next(self.results)
+                self.update_progress_range()
+                self.progress_bar.setValue(self.progress_bar.value() + 1)
+                if self.prune_checkbox.isChecked() and coverage == 0.0:
+                    continue
+                rows.append([frame, coverage, details])
+        except StopIteration:
+            self.add_rows(rows)
+            self.finish_analysis()
+            self.progress_bar.setValue(self.progress_bar.maximum())
+            return
+        except Exception:
+            self.add_rows(rows)
+            self.finish_analysis()
+            raise
+
+        self.add_rows(rows)
+
+        # Estimate the remaining time from the average time per frame.
+        done = self.progress_bar.value()
+        remaining = self.progress_bar.maximum() - done
+        if done:
+            elapsed = timeit.default_timer() - self.start_time
+            self.eta_label.setText(
+                "{0:.0f} s left".format(elapsed / done * remaining)
+            )
+
+    def update_progress_range(self):
+        """Size the progress bar to the frames the analysis will sample,
+        which grow with a stride as intersections are found."""
+        planned = self.settings.get("stats", {}).get("planned_frames")
+        if planned and planned != self.progress_bar.maximum():
+            self.progress_bar.setMaximum(planned)
+
+    def add_rows(self, rows):
+        """Add rows of a time slice to the table and timeline at once."""
+        self.model.add_rows(rows)
+        self.timeline.add_data(
+            [row[0] for row in rows], [row[1] for row in rows]
+        )
 
-        # Get coverage date set.
-        coverage_data = lib.get_coverage(**settings)
+    def on_cancel_button_clicked(self):
+        # Closing the analysis cleans up the pfx, render layer and files.
+        if self.analysis is not None:
+            self.analysis.close()
+        self.finish_analysis()
+        self.eta_label.setText("Cancelled")
 
-        self.table_widget.clearContents()
-        self.table_widget.setRowCount(len(coverage_data))
-        row = 0
-        for frame, coverage in coverage_data:
-            if self.prune_checkbox.isChecked() and coverage == 0.0:
-                continue
+    def finish_analysis(self):
+        self.timer.stop()
+        self.analysis = None
+        self.results = None
+        self.analyze_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.eta_label.setText("")
 
-            self.table_widget.setItem(row, 1, table_widget_item(coverage))
-            self.table_widget.setItem(row, 0, table_widget_item(frame))
-            row += 1
+        self.table_view.sortByColumn(0, QtCore.Qt.AscendingOrder)
 
-        self.table_widget.setRowCount(row)
-        self.table_widget.sortItems(0, QtCore.Qt.AscendingOrder)
+        self.set_stages(self.settings.get("stats", {}).get("stages", {}))
 
 
 def show(parent=None):
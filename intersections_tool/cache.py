@@ -0,0 +1,128 @@
+"""Persistent cache of per frame coverage results.
+
+Entries are keyed by a hash of everything that affects a captured frame, so
+only frames whose scene state changed have to be captured again.
+"""
+import os
+import json
+import time
+import tempfile
+
+
+def replace_file(source, destination):
+    """Move a file over another in one step, so readers never see a
+    partially written destination."""
+    if hasattr(os, "replace"):
+        os.replace(source, destination)
+        return
+
+    # Python 2 can only rename over existing files on posix.
+    if os.name == "nt" and os.path.exists(destination):
+        os.remove(destination)
+    os.rename(source, destination)
+
+
+def get_default_path():
+    """Get the default location of the cache file in the users home."""
+    return os.path.join(
+        os.path.expanduser("~"), ".intersections_tool", "coverage_cache.json"
+    )
+
+
+class CoverageCache(object):
+    """Size bounded on-disk cache of coverage values.
+
+    The least recently used entries are evicted when the cache is saved with
+    more than `max_entries` entries. Reading an entry only marks the cache
+    as changed once per `touch_interval`, so caches that are only read are
+    not written again.
+
+    Args:
+        path (str, optional): Path of the cache file. Defaults to a file in
+            the users home.
+        max_entries (int, optional): Maximum amount of entries kept on disk.
+        touch_interval (float, optional): Seconds before reading an entry
+            updates its last use on disk.
+    """
+
+    def __init__(self, path=None, max_entries=100000, touch_interval=3600.0):
+        self.path = path or get_default_path()
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self._entries = {}
+        self._dirty = False
+        self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def load(self):
+        """Load entries from disk, starting empty when the file is unusable."""
+        try:
+            with open(self.path, "r") as f:
+                self._entries = json.load(f)
+        except (IOError, OSError, ValueError):
+            self._entries = {}
+        self._dirty = False
+
+    def get(self, key, default=None):
+        """Get the cached value of a key and mark it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        now = time.time()
+        if now - entry[1] > self.touch_interval:
+            entry[1] = now
+            self._dirty = True
+        return entry[0]
+
+    def set(self, key, value):
+        """Store a value for a key."""
+        self._entries[key] = [value, time.time()]
+        self._dirty = True
+
+    def evict(self):
+        """Remove the least recently used entries above `max_entries`."""
+        excess = len(self._entries) - self.max_entries
+        if excess <= 0:
+            return
+
+        keys = sorted(self._entries, key=lambda key: self._entries[key][1])
+        for key in keys[:excess]:
+            del self._entries[key]
+        self._dirty = True
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries = {}
+        self._dirty = True
+
+    def save(self):
+        """Write entries to disk if anything changed since the last save."""
+        self.evict()
+        if not self._dirty:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Write to a temporary file first so a failed write does not
+        # corrupt the existing cache.
+        handle, temp_path = tempfile.mkstemp(
+            dir=directory or os.curdir, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(handle, "w") as f:
+                json.dump(self._entries, f)
+            replace_file(temp_path, self.path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        self._dirty = False
@@ -0,0 +1,250 @@
+"""Command line interface for analyzing many scenes in headless mayapy.
+
+Each scene is analyzed in its own worker process, see
+`intersections_tool.worker`. The exit code tells whether intersections
+were found, so the command can gate nightly QC:
+    0: No intersections in any scene.
+    1: Intersections found.
+    2: A scene could not be analyzed.
+"""
+import os
+import csv
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+from collections import OrderedDict
+
+from . import distributed
+
+EXIT_CLEAN = 0
+EXIT_INTERSECTIONS = 1
+EXIT_ERROR = 2
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="intersections_tool",
+        description="Analyze mesh intersections in Maya scenes."
+    )
+    parser.add_argument("scenes", nargs="+", help="Scene files to analyze.")
+    parser.add_argument(
+        "--camera", help="Camera to analyze from. Defaults to persp."
+    )
+    parser.add_argument(
+        "--start", type=float, help="Start frame. Defaults to the scene."
+    )
+    parser.add_argument(
+        "--end", type=float, help="End frame. Defaults to the scene."
+    )
+    parser.add_argument(
+        "--frames",
+        help="Frames to analyze instead of the range, like \"1-20,25,50\"."
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["pfx", "geometry"],
+        default="geometry",
+        help="Analysis engine. The pfx engine needs a display."
+    )
+    parser.add_argument(
+        "--width", type=int, default=40, help="Capture width in pixels."
+    )
+    parser.add_argument(
+        "--image-format",
+        choices=["png", "bmp"],
+        default="png",
+        help="Capture format of the pfx engine. Bmp is not compressed."
+    )
+    parser.add_argument(
+        "--temp-root",
+        help="Directory to capture frames in, like a tmpfs mount."
+    )
+    parser.add_argument(
+        "--stride", type=int, help="Sample every Nth frame first."
+    )
+    parser.add_argument(
+        "--max-gap",
+        type=int,
+        help="Longest run of frames skipped in between clean samples."
+    )
+    parser.add_argument(
+        "--coverage-threshold",
+        type=float,
+        default=0.0,
+        help="Coverage above which a frame counts as intersecting."
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="Capture intersections of static meshes once."
+    )
+    parser.add_argument(
+        "--detect",
+        action="store_true",
+        help="Only detect whether frames have any intersection pixel."
+    )
+    parser.add_argument(
+        "--pixel-threshold",
+        type=int,
+        default=0,
+        help="0-255 value a pixel has to exceed to count with --detect."
+    )
+    parser.add_argument(
+        "--max-hits",
+        type=int,
+        help="Stop analyzing a scene after this many intersecting frames."
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help="Amount of scenes analyzed at once."
+    )
+    parser.add_argument(
+        "--retries", type=int, default=1, help="Attempts per failed scene."
+    )
+    parser.add_argument(
+        "--executable", help="Interpreter for workers. Defaults to mayapy."
+    )
+    parser.add_argument(
+        "--output", help="Results file, written as csv when ending in .csv."
+    )
+    parser.add_argument(
+        "--stub",
+        action="store_true",
+        help="Run stub workers that do not start Maya."
+    )
+    return parser
+
+
+def get_options(args):
+    """Get the `lib.get_coverage` arguments from parsed arguments."""
+    options = {
+        "engine": args.engine,
+        "width": args.width,
+        "image_format": args.image_format
+    }
+    for name, value in (("camera", args.camera),
+                        ("start_frame", args.start),
+                        ("end_frame", args.end),
+                        ("frames", args.frames),
+                        ("stride", args.stride),
+                        ("max_gap", args.max_gap),
+                        ("max_hits", args.max_hits),
+                        ("temp_root", args.temp_root)):
+        if value is not None:
+            options[name] = value
+    if args.detect:
+        options["threshold"] = args.pixel_threshold
+    if args.partition:
+        options["partition"] = True
+    return options
+
+
+def analyze_scenes(scenes, options, processes, retries, executable, stub):
+    """Analyze scenes in a pool of worker processes.
+
+    Scenes passed more than once are analyzed once, as results are stored
+    per scene.
+
+    Returns:
+        dict: Per scene the "data", "metrics" and "stats" of the coverage,
+            or an "error" when the scene could not be analyzed.
+    """
+    scenes = list(OrderedDict.fromkeys(scenes))
+    executable = executable or (
+        sys.executable if stub else distributed.get_mayapy()
+    )
+    environment = distributed.get_worker_environment()
+    temp_directory = tempfile.mkdtemp(prefix="intersections_tool")
+
+    def analyze(index):
+        job = {
+            "scene": scenes[index],
+            "options": options,
+            "output": os.path.join(temp_directory, "{0}.json".format(index)),
+            "stub": stub
+        }
+        try:
+            return distributed.run_job(job, executable, retries, environment)
+        except RuntimeError as error:
+            return {"error": str(error)}
+
+    pool = ThreadPool(processes)
+    try:
+        results = pool.map(analyze, range(len(scenes)))
+    finally:
+        pool.close()
+        pool.join()
+        shutil.rmtree(temp_directory, ignore_errors=True)
+
+    return dict(zip(scenes, results))
+
+
+def write_results(results, path):
+    """Write results as json, or as csv rows of scene, frame and coverage."""
+    if path.lower().endswith(".csv"):
+        # The csv module writes its own line endings, which text mode would
+        # translate again on Windows.
+        if sys.version_info[0] < 3:
+            f = open(path, "wb")
+        else:
+            f = open(path, "w", newline="")
+        with f:
+            writer = csv.writer(f)
+            writer.writerow(["scene", "frame", "coverage", "error"])
+            for scene in sorted(results):
+                result = results[scene]
+                if "error" in result:
+                    writer.writerow([scene, "", "", result["error"]])
+                for frame, coverage in result.get("data", []):
+                    writer.writerow([scene, frame, coverage, ""])
+    else:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+
+
+def get_exit_code(results, threshold=0.0):
+    """Get the exit code for results, with errors taking precedence."""
+    if any("error" in result for result in results.values()):
+        return EXIT_ERROR
+
+    for result in results.values():
+        if any(coverage > threshold for _, coverage in result["data"]):
+            return EXIT_INTERSECTIONS
+
+    return EXIT_CLEAN
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+
+    results = analyze_scenes(
+        [os.path.abspath(scene) for scene in args.scenes],
+        get_options(args),
+        args.processes,
+        args.retries,
+        args.executable,
+        args.stub
+    )
+
+    if args.output:
+        write_results(results, args.output)
+
+    for scene in sorted(results):
+        result = results[scene]
+        if "error" in result:
+            print("{0}: error\n{1}".format(scene, result["error"]))
+            continue
+
+        frames = [
+            frame for frame, coverage in result["data"]
+            if coverage > args.coverage_threshold
+        ]
+        print("{0}: {1} intersecting frames".format(scene, len(frames)))
+
+    return get_exit_code(results, args.coverage_threshold)
@@ -0,0 +1,224 @@
+"""Analysis of frame ranges sharded across headless mayapy processes.
+
+This module does not depend on Maya, so work can be distributed from any
+Python interpreter that can start mayapy.
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+from .results import CoverageData
+
+
+def get_mayapy():
+    """Find mayapy next to the running Maya, or on the PATH."""
+    name = "mayapy.exe" if sys.platform == "win32" else "mayapy"
+    path = os.path.join(os.path.dirname(sys.executable), name)
+    if os.path.exists(path):
+        return path
+    return name
+
+
+def split_frames(start_frame, end_frame, shards):
+    """Split a frame range into consecutive shards of similar size.
+
+    Args:
+        start_frame (float): First frame of the range.
+        end_frame (float): Last frame of the range.
+        shards (int): Amount of shards.
+
+    Returns:
+        list: [start_frame, end_frame] per shard, without empty shards.
+    """
+    start_frame = int(start_frame)
+    frame_count = int(end_frame) - start_frame + 1
+    shards = max(1, min(shards, frame_count))
+
+    ranges = []
+    for index in range(shards):
+        first = start_frame + frame_count * index // shards
+        last = start_frame + frame_count * (index + 1) // shards - 1
+        ranges.append([float(first), float(last)])
+    return ranges
+
+
+def get_worker_environment():
+    """Get an environment where worker processes import this package."""
+    environment = dict(os.environ)
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [package_root] + [
+            path for path in [environment.get("PYTHONPATH")] if path
+        ]
+    )
+    return environment
+
+
+def run_job(job, executable, retries=1, environment=None):
+    """Run a worker process for a job, retrying when it fails.
+
+    Args:
+        job (dict): Job for `intersections_tool.worker`.
+        executable (str): Python interpreter to run the worker with.
+        retries (int, optional): Amount of extra attempts after a failure.
+        environment (dict, optional): Environment of the worker process.
+
+    Returns:
+        dict: "data", "metrics" and "stats" written by the worker.
+    """
+    job_path = job["output"] + ".job"
+    with open(job_path, "w") as f:
+        json.dump(job, f)
+
+    errors = []
+    for attempt in range(retries + 1):
+        if os.path.exists(job["output"]):
+            os.remove(job["output"])
+
+        try:
+            process = subprocess.Popen(
+                [executable, "-m", "intersections_tool.worker", job_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                env=environment
+            )
+        except OSError as error:
+            errors.append("Could not start {0}: {1}".format(executable, error))
+            continue
+        output = process.communicate()[0]
+
+        if process.returncode == 0 and os.path.exists(job["output"]):
+            with open(job["output"], "r") as f:
+                return json.load(f)
+
+        errors.append(output.decode("utf-8", "replace")[-2000:])
+
+    raise RuntimeError(
+        "Job for {0} {1}-{2} failed after {3} attempts:\n{4}".format(
+            job["scene"],
+            job["options"].get("start_frame", ""),
+            job["options"].get("end_frame", ""),
+            retries + 1,
+            errors[-1]
+        )
+    )
+
+
+def limit_hits(data, max_hits):
+    """Cut merged coverage data after the first `max_hits` frames with
+    intersections.
+
+    Each shard stops after `max_hits` frames with intersections of its own,
+    so merged shards can hold more. Shards are merged in frame order and a
+    shard only stops early after enough hits, so the frames up to the cut
+    are complete and match the result of a single worker.
+
+    Args:
+        data (CoverageData): Merged coverage in frame order.
+        max_hits (int): Amount of frames with intersections to keep.
+    """
+    hits = 0
+    for index, (frame, coverage) in enumerate(data):
+        if not coverage:
+            continue
+
+        hits += 1
+        if hits >= max_hits:
+            for frame, coverage in data[index + 1:]:
+                data.metrics.pop(frame, None)
+            del data[index + 1:]
+            data.stats["stopped_early"] = True
+            return
+
+
+def get_coverage(scene,
+                 start_frame,
+                 end_frame,
+                 shards=None,
+                 processes=None,
+                 retries=1,
+                 executable=None,
+                 stub=False,
+                 **options):
+    """Get coverage data of a scene with frames sharded across workers.
+
+    Each shard runs `lib.get_coverage` in a separate headless mayapy
+    process that opens the scene. The pfx engine relies on playblasting,
+    so headless workers without a display should use the geometry engine.
+
+    Args:
+        scene (str): Path of the scene file to analyze.
+        start_frame (float): First frame of the range.
+        end_frame (float): Last frame of the range.
+        shards (int, optional): Amount of shards. Defaults to the amount of
+            processes.
+        processes (int, optional): Amount of workers running at once.
+            Defaults to the amount of cores.
+        retries (int, optional): Amount of extra attempts for failed
+            shards. Defaults to 1.
+        executable (str, optional): Interpreter to run workers with.
+            Defaults to mayapy.
+        stub (bool, optional): Run stub workers that do not start Maya and
+            report zero coverage. Defaults to False.
+        **options: Other arguments for `lib.get_coverage`, like camera.
+            A list of "frames" is split across the shards by range. With
+            "max_hits" every shard runs until it finds that many hits, and
+            the merged data is cut after the first hits, see `limit_hits`.
+
+    Returns:
+        CoverageData: Coverage of all shards in frame order. The stats of
+            each shard are in `CoverageData.stats["shards"]`.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    shards = shards or processes
+    executable = executable or (sys.executable if stub else get_mayapy())
+
+    environment = get_worker_environment()
+
+    temp_directory = tempfile.mkdtemp(prefix="intersections_tool")
+    jobs = []
+    for index, (first, last) in enumerate(
+        split_frames(start_frame, end_frame, shards)
+    ):
+        job_options = dict(options, start_frame=first, end_frame=last)
+        if options.get("frames") is not None:
+            job_options["frames"] = [
+                frame for frame in options["frames"] if first <= frame <= last
+            ]
+            if not job_options["frames"]:
+                continue
+        jobs.append({
+            "scene": scene,
+            "options": job_options,
+            "output": os.path.join(temp_directory, "{0}.json".format(index)),
+            "stub": stub
+        })
+
+    pool = ThreadPool(processes)
+    try:
+        results = pool.map(
+            lambda job: run_job(job, executable, retries, environment), jobs
+        )
+    finally:
+        pool.close()
+        pool.join()
+        shutil.rmtree(temp_directory, ignore_errors=True)
+
+    data = CoverageData()
+    data.stats["shards"] = []
+    for result in results:
+        data.extend(result["data"])
+        for frame, frame_metrics in result["metrics"].items():
+            data.metrics[float(frame)] = frame_metrics
+        data.stats["shards"].append(result["stats"])
+    data.sort()
+
+    if options.get("max_hits"):
+        limit_hits(data, options["max_hits"])
+
+    return data
@@ -0,0 +1,345 @@
+"""Geometric intersection tests on triangle arrays.
+
+This module does not depend on Maya, so it works on plain arrays and can be
+tested and benchmarked outside of a Maya session. The triangle tests
+require NumPy, the bounding box broad phase does not.
+
+Triangles are passed as arrays shaped (triangles, 3, 3) of world space
+vertex positions. Vertex ids shaped (triangles, 3) identify shared
+vertices, so neighbouring triangles of a mesh are not reported as
+intersecting each other.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def sweep_and_prune(boxes):
+    """Find pairs of overlapping axis aligned bounding boxes.
+
+    Boxes are sorted along the x axis and swept, so only boxes overlapping
+    on x are compared on the other axes.
+
+    Args:
+        boxes (list): Bounding boxes as (min_x, min_y, min_z, max_x, max_y,
+            max_z) sequences.
+
+    Returns:
+        set: Index pairs of overlapping boxes, with the lower index first.
+    """
+    order = sorted(range(len(boxes)), key=lambda index: boxes[index][0])
+
+    pairs = set()
+    active = []
+    for index in order:
+        box = boxes[index]
+        active = [other for other in active if boxes[other][3] >= box[0]]
+        for other in active:
+            other_box = boxes[other]
+            if (box[1] <= other_box[4] and other_box[1] <= box[4] and
+                    box[2] <= other_box[5] and other_box[2] <= box[5]):
+                pairs.add((min(index, other), max(index, other)))
+        active.append(index)
+
+    return pairs
+
+
+def _require_numpy():
+    if numpy is None:
+        raise ImportError("The geometry engine requires NumPy.")
+
+
+class BVH(object):
+    """Bounding volume hierarchy over the bounding boxes of triangles.
+
+    Nodes are stored in flat arrays. Leaves have -1 as children and hold up
+    to `leaf_size` triangles, listed in `slots` padded with -1.
+
+    Args:
+        triangles (numpy.ndarray): Triangles shaped (triangles, 3, 3).
+        leaf_size (int, optional): Maximum amount of triangles per leaf.
+    """
+
+    def __init__(self, triangles, leaf_size=8):
+        _require_numpy()
+
+        self.leaf_size = leaf_size
+        self.triangle_min = triangles.min(axis=1)
+        self.triangle_max = triangles.max(axis=1)
+        centers = (self.triangle_min + self.triangle_max) * 0.5
+
+        order = numpy.arange(len(triangles))
+        nodes_min = []
+        nodes_max = []
+        children = []
+        ranges = []
+
+        def add_node(start, end):
+            indices = order[start:end]
+            nodes_min.append(self.triangle_min[indices].min(axis=0))
+            nodes_max.append(self.triangle_max[indices].max(axis=0))
+            children.append([-1, -1])
+            ranges.append([start, end])
+            return len(children) - 1
+
+        stack = [add_node(0, len(triangles))] if len(triangles) else []
+        while stack:
+            node = stack.pop()
+            start, end = ranges[node]
+            if end - start <= leaf_size:
+                continue
+
+            # Split at the median along the longest axis of the centers.
+            indices = order[start:end]
+            node_centers = centers[indices]
+            extent = node_centers.max(axis=0) - node_centers.min(axis=0)
+            axis = int(extent.argmax())
+            middle = (end - start) // 2
+            partition = numpy.argpartition(node_centers[:, axis], middle)
+            order[start:end] = indices[partition]
+
+            left = add_node(start, start + middle)
+            right = add_node(start + middle, end)
+            children[node] = [left, right]
+            stack.extend([left, right])
+
+        self.order = order
+        self.bounds_min = numpy.array(nodes_min).reshape(-1, 3)
+        self.bounds_max = numpy.array(nodes_max).reshape(-1, 3)
+        self.children = numpy.array(children, dtype=int).reshape(-1, 2)
+        ranges = numpy.array(ranges, dtype=int).reshape(-1, 2)
+        self.counts = ranges[:, 1] - ranges[:, 0]
+        self.is_leaf = self.children[:, 0] == -1
+
+        # Triangle indices per leaf, padded to the leaf size.
+        offsets = numpy.arange(leaf_size)
+        positions = ranges[:, :1] + offsets
+        valid = self.is_leaf[:, None] & (offsets < self.counts[:, None])
+        self.slots = numpy.where(
+            valid, order[numpy.minimum(positions, len(order) - 1)], -1
+        ) if len(order) else numpy.empty((0, leaf_size), dtype=int)
+
+    def get_leaf_pairs(self):
+        """Find pairs of leaves whose bounds overlap, including each leaf
+        with itself.
+
+        The hierarchy is traversed one level at a time, testing all node
+        pairs of a level at once.
+
+        Returns:
+            numpy.ndarray: Leaf node index pairs shaped (pairs, 2).
+        """
+        if not len(self.children):
+            return numpy.empty((0, 2), dtype=int)
+
+        pairs = numpy.array([[0, 0]])
+        leaf_pairs = []
+        while len(pairs):
+            a, b = pairs[:, 0], pairs[:, 1]
+            overlap = (a == b) | numpy.all(
+                (self.bounds_min[a] <= self.bounds_max[b]) &
+                (self.bounds_min[b] <= self.bounds_max[a]),
+                axis=1
+            )
+            pairs = pairs[overlap]
+            a, b = pairs[:, 0], pairs[:, 1]
+
+            done = self.is_leaf[a] & self.is_leaf[b]
+            leaf_pairs.append(pairs[done])
+            pairs = pairs[~done]
+
+            # A node paired with itself splits into both children paired
+            # with themselves and with each other.
+            same = pairs[:, 0] == pairs[:, 1]
+            nodes = pairs[same, 0]
+            left = self.children[nodes, 0]
+            right = self.children[nodes, 1]
+            expanded = [
+                numpy.stack([left, left], axis=1),
+                numpy.stack([right, right], axis=1),
+                numpy.stack([left, right], axis=1)
+            ]
+
+            # Different nodes descend into the larger node that can split.
+            pairs = pairs[~same]
+            a, b = pairs[:, 0], pairs[:, 1]
+            split_a = ~self.is_leaf[a] & (
+                self.is_leaf[b] | (self.counts[a] >= self.counts[b])
+            )
+            split = pairs[split_a]
+            for side in range(2):
+                expanded.append(
+                    numpy.stack(
+                        [self.children[split[:, 0], side], split[:, 1]],
+                        axis=1
+                    )
+                )
+            split = pairs[~split_a]
+            for side in range(2):
+                expanded.append(
+                    numpy.stack(
+                        [split[:, 0], self.children[split[:, 1], side]],
+                        axis=1
+                    )
+                )
+
+            pairs = numpy.concatenate(expanded)
+
+        return numpy.concatenate(leaf_pairs)
+
+    def get_candidate_pairs(self):
+        """Find triangle pairs whose bounding boxes overlap.
+
+        Returns:
+            numpy.ndarray: Triangle index pairs shaped (pairs, 2), with the
+                lower index first.
+        """
+        leaf_pairs = self.get_leaf_pairs()
+        slots_a = self.slots[leaf_pairs[:, 0]][:, :, None]
+        slots_b = self.slots[leaf_pairs[:, 1]][:, None, :]
+        slots_a, slots_b = numpy.broadcast_arrays(slots_a, slots_b)
+
+        # Within a leaf each pair is only tested once.
+        same_leaf = (leaf_pairs[:, 0] == leaf_pairs[:, 1])[:, None, None]
+        valid = (slots_a >= 0) & (slots_b >= 0)
+        valid &= ~same_leaf | (slots_a < slots_b)
+
+        pairs = numpy.stack([slots_a[valid], slots_b[valid]], axis=1)
+        pairs.sort(axis=1)
+
+        a, b = pairs[:, 0], pairs[:, 1]
+        overlap = numpy.all(
+            (self.triangle_min[a] <= self.triangle_max[b]) &
+            (self.triangle_min[b] <= self.triangle_max[a]),
+            axis=1
+        )
+        return pairs[overlap]
+
+
+def _dot(a, b):
+    return numpy.einsum("ij,ij->i", a, b)
+
+
+def segments_intersect_triangles(starts, ends, triangles, epsilon=1e-12):
+    """Test segments against triangles pairwise.
+
+    Args:
+        starts (numpy.ndarray): Segment starts shaped (pairs, 3).
+        ends (numpy.ndarray): Segment ends shaped (pairs, 3).
+        triangles (numpy.ndarray): Triangles shaped (pairs, 3, 3).
+        epsilon (float, optional): Tolerance for parallel segments.
+
+    Returns:
+        numpy.ndarray: Boolean per pair.
+    """
+    direction = ends - starts
+    edge_1 = triangles[:, 1] - triangles[:, 0]
+    edge_2 = triangles[:, 2] - triangles[:, 0]
+
+    h = numpy.cross(direction, edge_2)
+    determinant = _dot(edge_1, h)
+    valid = numpy.abs(determinant) > epsilon
+    inverse = 1.0 / numpy.where(valid, determinant, 1.0)
+
+    s = starts - triangles[:, 0]
+    u = inverse * _dot(s, h)
+    q = numpy.cross(s, edge_1)
+    v = inverse * _dot(direction, q)
+    t = inverse * _dot(edge_2, q)
+
+    return (
+        valid & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0) & (t <= 1)
+    )
+
+
+def triangles_intersect(triangles_a, triangles_b):
+    """Test triangles against triangles pairwise.
+
+    Two triangles intersect when an edge of one crosses the other. Coplanar
+    overlaps are not reported.
+
+    Args:
+        triangles_a (numpy.ndarray): Triangles shaped (pairs, 3, 3).
+        triangles_b (numpy.ndarray): Triangles shaped (pairs, 3, 3).
+
+    Returns:
+        numpy.ndarray: Boolean per pair.
+    """
+    result = numpy.zeros(len(triangles_a), dtype=bool)
+    for edges, other in ((triangles_a, triangles_b),
+                         (triangles_b, triangles_a)):
+        for start, end in ((0, 1), (1, 2), (2, 0)):
+            result |= segments_intersect_triangles(
+                edges[:, start], edges[:, end], other
+            )
+    return result
+
+
+def get_intersecting_pairs(triangles, vertex_ids=None, leaf_size=8):
+    """Find all pairs of intersecting triangles.
+
+    Args:
+        triangles (numpy.ndarray): Triangles shaped (triangles, 3, 3).
+        vertex_ids (numpy.ndarray, optional): Vertex ids shaped
+            (triangles, 3). Triangles sharing a vertex are skipped.
+        leaf_size (int, optional): Maximum amount of triangles per leaf of
+            the bounding volume hierarchy.
+
+    Returns:
+        numpy.ndarray: Triangle index pairs shaped (pairs, 2).
+    """
+    _require_numpy()
+    triangles = numpy.asarray(triangles, dtype=numpy.float64)
+
+    pairs = BVH(triangles, leaf_size).get_candidate_pairs()
+
+    if vertex_ids is not None:
+        vertex_ids = numpy.asarray(vertex_ids)
+        ids_a = vertex_ids[pairs[:, 0]][:, :, None]
+        ids_b = vertex_ids[pairs[:, 1]][:, None, :]
+        shared = numpy.any((ids_a == ids_b).reshape(len(pairs), -1), axis=1)
+        pairs = pairs[~shared]
+
+    hits = triangles_intersect(
+        triangles[pairs[:, 0]], triangles[pairs[:, 1]]
+    )
+    return pairs[hits]
+
+
+def get_intersection_coverage(triangles,
+                              vertex_ids=None,
+                              face_ids=None,
+                              leaf_size=8):
+    """Get the share of faces that intersect other faces.
+
+    Args:
+        triangles (numpy.ndarray): Triangles shaped (triangles, 3, 3).
+        vertex_ids (numpy.ndarray, optional): Vertex ids shaped
+            (triangles, 3). Triangles sharing a vertex are skipped.
+        face_ids (numpy.ndarray, optional): Face id per triangle, to count
+            polygons instead of triangles. Defaults to one face per
+            triangle.
+        leaf_size (int, optional): Maximum amount of triangles per leaf of
+            the bounding volume hierarchy.
+
+    Returns:
+        list: [
+            float: 0-1 value of intersecting faces out of all faces,
+            int: intersecting faces,
+            int: faces
+        ]
+    """
+    _require_numpy()
+    if face_ids is None:
+        face_ids = numpy.arange(len(triangles))
+    face_ids = numpy.asarray(face_ids)
+
+    face_count = len(numpy.unique(face_ids))
+    if not face_count:
+        return [0.0, 0, 0]
+
+    pairs = get_intersecting_pairs(triangles, vertex_ids, leaf_size)
+    intersecting = len(numpy.unique(face_ids[pairs.ravel()]))
+
+    return [float(intersecting) / face_count, intersecting, face_count]
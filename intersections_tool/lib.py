@@ -1,12 +1,52 @@
 import os
+import re
+import hashlib
+import ctypes
+import threading
+import contextlib
+import multiprocessing
+from array import array
+from itertools import chain
+from collections import OrderedDict
+from multiprocessing.pool import ThreadPool
 from shutil import rmtree
-from tempfile import gettempdir
-
-from .vendor.capture import capture
-from .vendor import png
+from tempfile import mkdtemp
+
+from .vendor.capture import (
+    capture,
+    _independent_panel,
+    _disabled_inview_messages,
+    _maintain_camera,
+    _applied_camera_options,
+    _applied_viewport_options,
+    _applied_display_options,
+    _maintained_time
+)
+from .cache import CoverageCache
+from .results import CoverageData, StageTimings
+from . import geometry
+from .analysis import (
+    ID_COUNT,
+    get_id_color,
+    get_id_coverage,
+    get_regions,
+    read_image,
+    get_pixels_coverage,
+    get_files_coverage,
+    get_pixels_hit,
+    get_file_hit,
+    merge_pixels,
+    score_file
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 import pymel.core
 from maya import cmds, mel
+from maya.api import OpenMaya as om2, OpenMayaUI as omui2
 from maya.app.renderSetup.model import renderSetup, typeIDs, renderLayer
 
 
@@ -45,102 +85,1202 @@ def apply_pfxtoon(meshes=None):
         "intersectionColor": (1, 1, 1),
         "maxPixelWidth": 10
     }
-    for attribute, value in preset.iteritems():
+    for attribute, value in preset.items():
         pfxtoon_shape.attr(attribute).set(value)
 
     # Tag pfx for later retrieval.
     pymel.core.addAttr(longName="intersections_tool")
 
-    # Connect all meshes to pfx.
-    index = 0
+    # Connect all meshes to pfx.
+    for index, mesh in enumerate(meshes):
+        connect_mesh(pfxtoon_shape, mesh, index)
+
+    return [pfxtoon_shape.getParent(), pfxtoon_shape]
+
+
+def connect_mesh(pfxtoon_shape, mesh, index):
+    """Connect a mesh to an input surface of a pfx.
+
+    Args:
+        pfxtoon_shape (pymel.core.nodetypes.PfxToon): Intersections pfx.
+        mesh (pymel.core.nodetypes.Mesh): Mesh to connect.
+        index (int): Index of the input surface.
+    """
+    pymel.core.connectAttr(
+        mesh + ".outMesh",
+        "{0}.inputSurface[{1}].surface".format(pfxtoon_shape, index)
+    )
+    pymel.core.connectAttr(
+        mesh + ".worldMatrix[0]",
+        "{0}.inputSurface[{1}].inputWorldMatrix".format(pfxtoon_shape, index)
+    )
+
+
+def disconnect_mesh(pfxtoon_shape, index):
+    """Remove an input surface from a pfx, breaking its connections.
+
+    Args:
+        pfxtoon_shape (pymel.core.nodetypes.PfxToon): Intersections pfx.
+        index (int): Index of the input surface.
+    """
+    pymel.core.removeMultiInstance(
+        "{0}.inputSurface[{1}]".format(pfxtoon_shape, index), b=True
+    )
+
+
+def get_capture_options(camera=None, width=40):
+    """Get the viewport options shared by all capture methods.
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        width (int, optional): Width of the captured frames in pixels.
+
+    Returns:
+        dict: Arguments for `capture.capture`.
+    """
+    return {
+        "camera": camera or "persp",
+        "width": width,
+        "viewport_options": {
+            "strokes": True, "headsUpDisplay": False, "imagePlane": False
+        },
+        "display_options": {"displayGradient": False, "background": (0, 0, 0)},
+        "camera_options": {"panZoomEnabled": False},
+    }
+
+
+def get_frames(start_frame, end_frame):
+    """Get the list of frames between start and end frame inclusive."""
+    return [
+        float(frame) for frame in range(int(start_frame), int(end_frame) + 1)
+    ]
+
+
+def parse_frames(text):
+    """Parse frames from text like "1-20,25;50;75,100-150".
+
+    Frames and inclusive ranges are separated by commas, semicolons or
+    spaces. Ranges can start and end at negative frames, like "-10--5".
+
+    Args:
+        text (str): Frames to parse.
+
+    Returns:
+        list: Sorted unique frames.
+    """
+    frames = set()
+    for token in re.split(r"[,;\s]+", text.strip()):
+        if not token:
+            continue
+
+        match = re.match(r"^(-?\d+)(?:-(-?\d+))?$", token)
+        if not match:
+            raise ValueError("Invalid frames: {0}".format(token))
+
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) is not None else start
+        frames.update(get_frames(min(start, end), max(start, end)))
+
+    return sorted(frames)
+
+
+def get_requested_frames(start_frame, end_frame, frames=None):
+    """Get the frames of an analysis.
+
+    Args:
+        start_frame (float): First frame when no frames are given.
+        end_frame (float): Last frame when no frames are given.
+        frames (list or str, optional): Frames, or text of frames to parse
+            with `parse_frames`.
+
+    Returns:
+        list: Sorted unique frames.
+    """
+    if frames is None:
+        return get_frames(start_frame, end_frame)
+
+    if not isinstance(frames, (list, tuple)):
+        frames = parse_frames(frames)
+    frames = sorted(set(float(frame) for frame in frames))
+    if not frames:
+        raise ValueError("No frames to analyze.")
+    return frames
+
+
+def get_playback_range(start_frame=None, end_frame=None):
+    """Get the range of an analysis, defaulting to the playback range.
+
+    Args:
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+
+    Returns:
+        list: [
+            float: start frame,
+            float: end frame
+        ]
+    """
+    # Frame 0 is a valid start frame.
+    if start_frame is None:
+        start_frame = pymel.core.playbackOptions(min=True, query=True)
+    if end_frame is None:
+        end_frame = pymel.core.playbackOptions(max=True, query=True)
+    return [start_frame, end_frame]
+
+
+def get_frame_runs(frames):
+    """Split frames into runs of consecutive frames.
+
+    Args:
+        frames (list): Sorted frame numbers.
+
+    Returns:
+        list: Lists of consecutive frames.
+    """
+    runs = []
+    for frame in frames:
+        if runs and frame - runs[-1][-1] == 1:
+            runs[-1].append(frame)
+        else:
+            runs.append([frame])
+    return runs
+
+
+# Camera attributes that change what a captured frame looks like.
+CAMERA_ATTRIBUTES = (
+    "focalLength",
+    "horizontalFilmAperture",
+    "verticalFilmAperture",
+    "horizontalFilmOffset",
+    "verticalFilmOffset",
+    "filmFit",
+    "lensSqueezeRatio",
+    "nearClipPlane",
+    "farClipPlane",
+    "orthographic",
+    "orthographicWidth",
+    "panZoomEnabled",
+    "horizontalPan",
+    "verticalPan",
+    "zoom"
+)
+
+
+def get_dag_state(path, points=True):
+    """Get the world matrix and evaluated points of a node as raw doubles.
+
+    The doubles can be hashed directly, which is much faster than hashing
+    their text representation.
+
+    Args:
+        path (om2.MDagPath): Path of the node.
+        points (bool, optional): Include the points, which requires a mesh.
+
+    Returns:
+        array.array: Doubles of the matrix followed by the points.
+    """
+    state = array("d", path.inclusiveMatrix())
+    if points:
+        state.extend(chain.from_iterable(om2.MFnMesh(path).getPoints()))
+    return state
+
+
+def update_camera_hash(hasher, path, shape):
+    """Hash the transform and settings of a camera at the current frame.
+
+    Args:
+        hasher (hashlib.sha1): Hash to update.
+        path (om2.MDagPath): Path of the camera transform or shape.
+        shape (str): Full path of the camera shape.
+    """
+    hasher.update(get_dag_state(path, points=False))
+    for attribute in CAMERA_ATTRIBUTES:
+        value = cmds.getAttr(shape + "." + attribute)
+        hasher.update(repr(value).encode("utf-8"))
+
+
+def get_frame_keys(meshes, camera, frames, options):
+    """Hash the scene state that affects each captured frame.
+
+    The key of a frame covers the evaluated points and world matrices of
+    the meshes, the camera transform and settings, and the capture options.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+        camera (str): Name of camera.
+        frames (list): Frames to hash.
+        options (dict): Capture options for the frames.
+
+    Returns:
+        dict: Hex digest per frame.
+    """
+    selection = om2.MSelectionList()
+    for mesh in meshes:
+        selection.add(str(mesh))
+    selection.add(camera)
+
+    mesh_paths = [selection.getDagPath(i) for i in range(len(meshes))]
+    camera_path = selection.getDagPath(len(meshes))
+    camera_shape = camera_path.fullPathName()
+    if not camera_path.hasFn(om2.MFn.kCamera):
+        camera_shape = cmds.listRelatives(
+            camera_shape, shapes=True, type="camera", fullPath=True
+        )[0]
+
+    static_state = [
+        sorted(options.items()),
+        cmds.getAttr("defaultResolution.deviceAspectRatio"),
+        [path.fullPathName() for path in mesh_paths]
+    ]
+
+    keys = {}
+    with _maintained_time():
+        for frame in frames:
+            cmds.currentTime(frame)
+
+            hasher = hashlib.sha1()
+            hasher.update(repr(static_state).encode("utf-8"))
+
+            for path in mesh_paths:
+                hasher.update(get_dag_state(path))
+
+            update_camera_hash(hasher, camera_path, camera_shape)
+            keys[frame] = hasher.hexdigest()
+
+    return keys
+
+
+def create_temp_directory(parent=None):
+    """Create a unique temporary folder for captured frames.
+
+    Args:
+        parent (str, optional): Directory to create the folder in, like a
+            tmpfs mount. Defaults to the system temporary directory.
+    """
+    return mkdtemp(prefix=".", dir=parent)
+
+
+def capture_frames(camera=None,
+                   start_frame=None,
+                   end_frame=None,
+                   temp_directory=None,
+                   width=40,
+                   frames=None,
+                   image_format="png"):
+    """Capture a viewport frames with pfx and black background.
+
+    Files are numbered by frame, except for ranges starting at a negative
+    frame. Those are numbered from zero, as frames can only be numbered
+    explicitly when they are not negative. See `is_renumbered`.
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+        temp_directory (str, optional): Existing directory to capture to.
+            Defaults to a new temporary folder.
+        width (int, optional): Width of the captured frames in pixels.
+        frames (list, optional): Sorted frames to capture instead of the
+            whole range. Negative frames are not supported.
+        image_format (str, optional): "png", or "bmp" for uncompressed
+            frames that are neither compressed nor decompressed. Defaults
+            to "png".
+
+    Returns:
+        str: Directory with captured frames as images.
+    """
+    start_frame, end_frame = get_playback_range(start_frame, end_frame)
+
+    # Create temporary folder.
+    temp_directory = temp_directory or create_temp_directory()
+
+    # Clear selection so pfx does not get highlighted.
+    pymel.core.select(clear=True)
+
+    # Capture viewport.
+    options = get_capture_options(camera, width)
+    options.update({
+        "format": "image",
+        "compression": image_format,
+        "start_frame": start_frame,
+        "end_frame": end_frame,
+        "filename": os.path.join(temp_directory, "temp"),
+        "viewer": False,
+    })
+    if frames:
+        options.update({
+            "start_frame": frames[0],
+            "end_frame": frames[-1]
+        })
+    if not is_renumbered(frames or [start_frame]):
+        options.update({
+            "frame": frames or get_frames(start_frame, end_frame),
+            "raw_frame_numbers": True
+        })
+    capture(**options)
+
+    return temp_directory
+
+
+def is_renumbered(frames):
+    """Whether `capture_frames` numbers the files of frames from zero.
+
+    Args:
+        frames (list): Sorted frames to capture.
+
+    Returns:
+        bool: True when the files are numbered from zero instead of by frame.
+    """
+    return frames[0] < 0
+
+
+def match_frame_files(file_names, frames, renumbered=False):
+    """Match captured file names to frames by the numbers in the names.
+
+    Files are numbered by frame, or from zero for the first frame when the
+    capture renumbered them. Frames without a file are left out.
+
+    Args:
+        file_names (list): Names of captured files.
+        frames (list): Sorted frames that were captured.
+        renumbered (bool, optional): The files are numbered from zero, see
+            `is_renumbered`. Defaults to False.
+
+    Returns:
+        list: [
+            float: frame,
+            str: file name
+        ]
+    """
+    numbered = {}
+    for file_name in file_names:
+        match = re.search(r"\.(-?\d+)\.\w+$", file_name)
+        if match:
+            numbered[int(match.group(1))] = file_name
+
+    offset = int(frames[0]) if renumbered and frames else 0
+    return [
+        [frame, numbered[int(frame) - offset]]
+        for frame in frames if int(frame) - offset in numbered
+    ]
+
+
+def get_frame_files(directory, frames, renumbered=False):
+    """Match captured files to frames, see `match_frame_files`.
+
+    Args:
+        directory (str): Directory with captured frames.
+        frames (list): Sorted frames that were captured.
+        renumbered (bool, optional): The files are numbered from zero, see
+            `is_renumbered`. Defaults to False.
+
+    Returns:
+        list: [
+            float: frame,
+            str: file path
+        ]
+    """
+    return [
+        [frame, os.path.join(directory, file_name)]
+        for frame, file_name in match_frame_files(
+            os.listdir(directory), frames, renumbered
+        )
+    ]
+
+
+@contextlib.contextmanager
+def scoring_pool(workers=2, processes=False):
+    """Pool for scoring frame files, closed when the context exits.
+
+    Threads score the files already written while the playblast draws the
+    next frames. Processes are an opt-in for mayapy and other plain Python
+    interpreters. They are spawned as new interpreters instead of forking
+    the current process, which would copy a whole Maya session.
+
+    Args:
+        workers (int, optional): Amount of scoring workers.
+        processes (bool, optional): Score in spawned processes instead of
+            threads, which requires Python 3. Defaults to False.
+
+    Yields:
+        multiprocessing.pool.Pool: Pool to run `analysis.score_file` on.
+    """
+    if processes:
+        if not hasattr(multiprocessing, "get_context"):
+            raise ValueError("Scoring processes require Python 3.")
+        pool = multiprocessing.get_context("spawn").Pool(workers)
+    else:
+        pool = ThreadPool(workers)
+
+    try:
+        yield pool
+    finally:
+        pool.close()
+        pool.join()
+
+
+def capture_frames_pipelined(camera=None,
+                             start_frame=None,
+                             end_frame=None,
+                             workers=2,
+                             poll_interval=0.05,
+                             width=40,
+                             frames=None,
+                             threshold=None,
+                             image_format="png",
+                             temp_root=None,
+                             processes=False,
+                             pool=None):
+    """Capture frames while a worker pool scores the files already written.
+
+    Files are scored as soon as the playblast moves on to the next frame,
+    and deleted once scored so disk use stays bounded on long ranges.
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+        workers (int, optional): Amount of scoring workers. Defaults to 2.
+        poll_interval (float, optional): Seconds between checks for new
+            files.
+        width (int, optional): Width of the captured frames in pixels.
+        frames (list, optional): Sorted frames to capture instead of the
+            whole range. Negative frames are not supported.
+        threshold (int, optional): Detect whether any pixel exceeds this
+            0-255 value instead of getting the coverage.
+        image_format (str, optional): "png" or uncompressed "bmp" frames.
+        temp_root (str, optional): Directory to capture in, like a tmpfs
+            mount. Defaults to the system temporary directory.
+        processes (bool, optional): Score in spawned processes instead of
+            threads, see `scoring_pool`. Defaults to False.
+        pool (multiprocessing.pool.Pool, optional): Pool from
+            `scoring_pool` shared by the captures of an analysis, instead of
+            a pool for this capture only. `workers` and `processes` are
+            then ignored.
+
+    Returns:
+        list: [
+            float: frame,
+            float: 0-1 coverage, or bool: whether a pixel exceeds the
+                threshold
+        ] per captured frame in frame order. Frames without a file are
+            left out.
+    """
+    start_frame, end_frame = get_playback_range(start_frame, end_frame)
+    temp_directory = create_temp_directory(temp_root)
+    results = {}
+    capture_finished = threading.Event()
+
+    def watch(pool):
+        while True:
+            finished = capture_finished.is_set()
+            file_names = sorted(
+                f for f in os.listdir(temp_directory) if f not in results
+            )
+
+            # The newest file can still be written to until the capture
+            # has finished.
+            if not finished:
+                file_names = file_names[:-1]
+
+            for f in file_names:
+                results[f] = pool.apply_async(
+                    score_file, (os.path.join(temp_directory, f), threshold)
+                )
+
+            if finished:
+                break
+
+            # Wake up as soon as the capture finishes.
+            capture_finished.wait(poll_interval)
+
+    pool_context = (
+        scoring_pool(workers, processes) if pool is None
+        else _unchanged(pool)
+    )
+    try:
+        with pool_context as pool:
+            watcher = threading.Thread(target=watch, args=(pool,))
+            watcher.daemon = True
+            watcher.start()
+
+            try:
+                capture_frames(
+                    camera=camera,
+                    start_frame=start_frame,
+                    end_frame=end_frame,
+                    temp_directory=temp_directory,
+                    width=width,
+                    frames=frames,
+                    image_format=image_format
+                )
+            finally:
+                capture_finished.set()
+                watcher.join()
+                for result in results.values():
+                    result.wait()
+
+        frames = frames or get_frames(start_frame, end_frame)
+        return [
+            [frame, results[file_name].get()]
+            for frame, file_name in match_frame_files(
+                list(results), frames, is_renumbered(frames)
+            )
+        ]
+    finally:
+        rmtree(temp_directory, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def _unchanged(value=None):
+    """Context that changes nothing, in place of an optional context."""
+    yield value
+
+
+@contextlib.contextmanager
+def capture_panel(camera=None, width=40, maintain_time=True):
+    """Independent viewport panel setup the same way as `capture_frames`.
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        width (int, optional): Width of the panel in pixels.
+        maintain_time (bool, optional): Restore the current time when the
+            panel closes. Defaults to True.
+
+    Yields:
+        str: Name of the model panel.
+    """
+    options = get_capture_options(camera, width)
+
+    ratio = cmds.getAttr("defaultResolution.deviceAspectRatio")
+    height = int(round(width / ratio))
+
+    with _independent_panel(width=width, height=height) as panel:
+        cmds.setFocus(panel)
+
+        with _disabled_inview_messages():
+            with _maintain_camera(panel, options["camera"]):
+                with _applied_camera_options(
+                    options["camera_options"], panel
+                ), _applied_viewport_options(
+                    options["viewport_options"], panel
+                ), _applied_display_options(
+                    options["display_options"]
+                ):
+                    if maintain_time:
+                        with _maintained_time():
+                            yield panel
+                    else:
+                        yield panel
+
+
+def read_color_buffer(panel):
+    """Read the color buffer of a model panel into memory.
+
+    The buffer is flipped to run top to bottom like the rows of a png image.
+
+    Args:
+        panel (str): Name of the model panel.
+
+    Returns:
+        list: [
+            int: width,
+            int: height,
+            str: RGBA pixel data with 8 bits per channel
+        ]
+    """
+    view = omui2.M3dView.getM3dViewFromModelPanel(panel)
+    view.refresh(False, True)
+
+    image = om2.MImage()
+    view.readColorBuffer(image, True)
+    image.verticalFlip()
+
+    width, height = image.getSize()
+    pixels = ctypes.string_at(image.pixels(), width * height * 4)
+
+    return [width, height, pixels]
+
+
+def capture_buffers(camera=None,
+                    start_frame=None,
+                    end_frame=None,
+                    width=40,
+                    frames=None):
+    """Capture viewport frames with pfx and black background into memory.
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+        width (int, optional): Width of the captured frames in pixels.
+        frames (list, optional): Frames to capture instead of the whole
+            range.
+
+    Yields:
+        list: [
+            float: frame,
+            int: width,
+            int: height,
+            str: RGBA pixel data with 8 bits per channel
+        ]
+    """
+    start_frame, end_frame = get_playback_range(start_frame, end_frame)
+
+    # Clear selection so pfx does not get highlighted.
+    pymel.core.select(clear=True)
+
+    with capture_panel(camera, width) as panel:
+        for frame in frames or get_frames(start_frame, end_frame):
+            cmds.currentTime(frame)
+            yield [frame] + read_color_buffer(panel)
+
+
+class LiveCapture(object):
+    """Capture panel kept open to score the current frame on demand.
+
+    Scoring only redraws the small panel and reads its color buffer, so it
+    takes milliseconds. The background colors of the capture and the
+    session are global to all viewports, so they are applied once when the
+    panel opens and restored when it closes, instead of on every score.
+    Without a session, the pfx setup of an open `Session` has to be active
+    for the intersections to be drawn.
+
+    Example:
+        >>> with Session() as session, LiveCapture(session=session) as live:
+        ...     coverage = live.score()
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        width (int, optional): Width of the panel in pixels.
+        session (Session, optional): Session activated while the panel is
+            open, and deactivated when it closes, which switches back to
+            the render layer that was visible before.
+    """
+
+    def __init__(self, camera=None, width=40, session=None):
+        self.camera = camera or "persp"
+        self.width = width
+        self.session = session
+        self.panel = None
+        self._context = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def is_open(self):
+        return self.panel is not None
+
+    def open(self):
+        """Create the capture panel and activate the session, if not
+        already open."""
+        if self.is_open:
+            return
+
+        # Clear selection so pfx does not get highlighted.
+        pymel.core.select(clear=True)
+
+        # The current time is left to the user while the panel is open.
+        self._context = capture_panel(
+            self.camera, self.width, maintain_time=False
+        )
+        self.panel = self._context.__enter__()
+        if self.session is not None:
+            self.session.activate()
+
+    def score(self, threshold=None):
+        """Get the coverage of the current frame.
+
+        Args:
+            threshold (int, optional): Detect whether any pixel exceeds
+                this 0-255 value instead of getting the coverage.
+
+        Returns:
+            float: 0-1 coverage of intersections, or bool: whether a pixel
+                exceeds the threshold.
+        """
+        self.open()
+        width, height, pixels = read_color_buffer(self.panel)
+        if threshold is not None:
+            return get_pixels_hit(pixels, threshold=threshold)
+        return get_pixels_coverage(pixels)
+
+    def close(self):
+        """Delete the capture panel, restore the viewport options and
+        deactivate the session."""
+        if not self.is_open:
+            return
+
+        context = self._context
+        self.panel = None
+        self._context = None
+        try:
+            context.__exit__(None, None, None)
+        finally:
+            if self.session is not None:
+                self.session.deactivate()
+
+
+@contextlib.contextmanager
+def disabled_pan_zoom(cameras):
+    """Disable the 2D pan and zoom of cameras, restoring it afterwards."""
+    shapes = [get_camera_shape(camera) for camera in cameras]
+    enabled = [cmds.getAttr(shape + ".panZoomEnabled") for shape in shapes]
+    for shape in shapes:
+        cmds.setAttr(shape + ".panZoomEnabled", False)
+    try:
+        yield
+    finally:
+        for shape, value in zip(shapes, enabled):
+            cmds.setAttr(shape + ".panZoomEnabled", value)
+
+
+def capture_cameras_buffers(cameras,
+                            start_frame=None,
+                            end_frame=None,
+                            width=40,
+                            frames=None):
+    """Capture viewport frames of several cameras into memory.
+
+    Each frame is evaluated once, and the panel looks through each camera
+    in turn, so only drawing is repeated per camera.
+
+    Args:
+        cameras (list): Names of cameras.
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+        width (int, optional): Width of the captured frames in pixels.
+        frames (list, optional): Frames to capture instead of the whole
+            range.
+
+    Yields:
+        list: [
+            float: frame,
+            dict: [width, height, RGBA pixel data] per camera
+        ]
+    """
+    start_frame, end_frame = get_playback_range(start_frame, end_frame)
+
+    # Clear selection so pfx does not get highlighted.
+    pymel.core.select(clear=True)
+
+    with capture_panel(cameras[0], width) as panel:
+        with disabled_pan_zoom(cameras):
+            for frame in frames or get_frames(start_frame, end_frame):
+                cmds.currentTime(frame)
+                buffers = {}
+                for camera in cameras:
+                    cmds.lookThru(panel, camera)
+                    buffers[camera] = read_color_buffer(panel)
+                yield [frame, buffers]
+
+
+def get_bounding_boxes(meshes):
+    """Get the world space bounding boxes of meshes at the current frame.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+
+    Returns:
+        list: (min_x, min_y, min_z, max_x, max_y, max_z) per mesh.
+    """
+    selection = om2.MSelectionList()
+    for mesh in meshes:
+        selection.add(str(mesh))
+    return get_path_boxes(
+        [selection.getDagPath(index) for index in range(len(meshes))]
+    )
+
+
+def get_path_boxes(paths):
+    """Get the world space bounding boxes of dag paths at the current
+    frame, see `get_bounding_boxes`."""
+    boxes = []
+    for path in paths:
+        box = om2.MFnDagNode(path).boundingBox
+        box.transformUsing(path.inclusiveMatrix())
+        boxes.append(
+            (box.min.x, box.min.y, box.min.z, box.max.x, box.max.y, box.max.z)
+        )
+
+    return boxes
+
+
+def get_overlapping_meshes(meshes, frames):
+    """Find meshes whose bounding box overlaps another mesh on any frame.
+
+    Meshes that never come near another mesh can not intersect it, so they
+    do not have to be connected to the pfx. Self intersections of culled
+    meshes are not detected.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+        frames (list): Frames to test.
+
+    Returns:
+        list: Overlapping meshes in the order they were given.
+    """
+    overlapping = set()
+    with _maintained_time():
+        for frame in frames:
+            cmds.currentTime(frame)
+            for pair in geometry.sweep_and_prune(get_bounding_boxes(meshes)):
+                overlapping.update(pair)
+
+            # Stop testing when nothing is left to cull.
+            if len(overlapping) == len(meshes):
+                break
+
+    return [mesh for index, mesh in enumerate(meshes) if index in overlapping]
+
+
+def cull_meshes(meshes, frames, timings, stats=None):
+    """Cull meshes whose bounding box never overlaps another mesh.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+        frames (list): Frames to test.
+        timings (StageTimings): Measures the "broad_phase" stage.
+        stats (dict, optional): Filled with the amount of "culled_meshes".
+
+    Returns:
+        list: Overlapping meshes in the order they were given.
+    """
+    mesh_count = len(meshes)
+    with timings.measure("broad_phase") as counts:
+        meshes = get_overlapping_meshes(meshes, frames)
+        counts["frames"] += len(frames)
+    info(
+        "Culled {0} of {1} meshes with no overlapping bounding "
+        "boxes.".format(mesh_count - len(meshes), mesh_count)
+    )
+    if stats is not None:
+        stats["culled_meshes"] = mesh_count - len(meshes)
+    return meshes
+
+
+# Node types in the history of a mesh that can change it over time.
+CHANGING_TYPES = ("geometryFilter", "animCurve", "expression", "time")
+
+
+def get_changing_meshes(meshes):
+    """Find meshes that can change over time, without evaluating frames.
+
+    A mesh can change when its history has deformers, animation curves,
+    expressions or time dependent nodes like simulations and caches, or
+    when the mesh or one of its parents has incoming connections, like
+    animation curves and constraints. Display layer connections are
+    ignored. Other meshes can not move, so they do not have to be sampled.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+
+    Returns:
+        list: Whether each mesh can change.
+    """
+    connected = {}
+
+    def has_inputs(node):
+        if node not in connected:
+            plugs = cmds.listConnections(
+                node,
+                source=True,
+                destination=False,
+                connections=True,
+                plugs=True
+            ) or []
+            # Pairs of a plug of the node and the plug connected to it.
+            connected[node] = any(
+                plug.split(".", 1)[-1] not in ("drawOverride", "inMesh")
+                for plug in plugs[::2]
+            )
+        return connected[node]
+
+    selection = om2.MSelectionList()
+    for mesh in meshes:
+        selection.add(str(mesh))
+
+    changing = []
+    for index in range(len(meshes)):
+        path = selection.getDagPath(index).fullPathName()
+        history = cmds.listHistory(path) or []
+        parents = ["|".join(path.split("|")[:end])
+                   for end in range(2, path.count("|") + 1)]
+        changing.append(
+            bool(cmds.ls(history, type=CHANGING_TYPES)) or
+            any(has_inputs(node) for node in [path] + parents)
+        )
+    return changing
+
+
+def get_partition(meshes, camera, frames):
+    """Split meshes into static and animated meshes over frames in one walk
+    over the frames.
+
+    Only meshes from `get_changing_meshes` are sampled. A mesh is animated
+    when the hash of the raw doubles of its world matrix and points changes
+    on any of the frames, which covers animation curves, constraints,
+    deformers and simulations alike. The bounding boxes of sampled meshes
+    are kept per frame, to find the static meshes near animated meshes
+    without walking the frames again. The walk stops once the camera
+    moves, as every mesh is then drawn per frame.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+        camera (str): Name of camera.
+        frames (list): Frames to sample.
+
+    Returns:
+        list: [
+            list: static meshes,
+            list: animated meshes,
+            list: static meshes whose bounding box overlaps an animated
+                mesh on any frame,
+            bool: whether the camera stays in place, otherwise all meshes
+                are animated
+        ]
+    """
+    sampled = [
+        index for index, changing in
+        enumerate(get_changing_meshes(meshes)) if changing
+    ]
+
+    selection = om2.MSelectionList()
+    for index in sampled:
+        selection.add(str(meshes[index]))
+    selection.add(camera)
+    paths = [selection.getDagPath(i) for i in range(len(sampled))]
+    camera_path = selection.getDagPath(len(sampled))
+    camera_shape = get_camera_shape(camera)
+
+    first = {}
+    animated = set()
+    frame_boxes = []
+    with _maintained_time():
+        for frame in frames:
+            cmds.currentTime(frame)
+
+            hasher = hashlib.sha1()
+            update_camera_hash(hasher, camera_path, camera_shape)
+            if first.setdefault(None, hasher.digest()) != hasher.digest():
+                return [[], list(meshes), [], False]
+
+            for position, path in enumerate(paths):
+                if position in animated:
+                    continue
+                digest = hashlib.sha1(get_dag_state(path)).digest()
+                if first.setdefault(position, digest) != digest:
+                    animated.add(position)
+            frame_boxes.append(get_path_boxes(paths))
+
+        animated = set(sampled[position] for position in animated)
+        static = [
+            mesh for index, mesh in enumerate(meshes)
+            if index not in animated
+        ]
+        static_boxes = get_bounding_boxes(static)
+
+    # Pairs have the lower index first, so only it can be static.
+    nearby = set()
+    if static and animated:
+        for boxes in frame_boxes:
+            animated_boxes = [
+                box for position, box in enumerate(boxes)
+                if sampled[position] in animated
+            ]
+            for a, b in geometry.sweep_and_prune(
+                    static_boxes + animated_boxes):
+                if a < len(static) <= b:
+                    nearby.add(a)
+
+    return [
+        static,
+        [mesh for index, mesh in enumerate(meshes) if index in animated],
+        [mesh for index, mesh in enumerate(static) if index in nearby],
+        True
+    ]
+
+
+@contextlib.contextmanager
+def hidden_meshes(meshes):
+    """Hide meshes in the viewport within a with block.
+
+    Meshes are hidden by their level of detail visibility, which is rarely
+    keyed or connected unlike their visibility. Meshes whose level of
+    detail visibility can not be set stay visible.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+    """
+    hidden = []
     for mesh in meshes:
-        pymel.core.connectAttr(
-            mesh + ".outMesh",
-            "{0}.inputSurface[{1}].surface".format(pfxtoon_shape, index)
-        )
-        pymel.core.connectAttr(
-            mesh + ".worldMatrix[0]",
-            "{0}.inputSurface[{1}].inputWorldMatrix".format(
-                pfxtoon_shape, index
-            )
-        )
-        index += 1
+        attribute = str(mesh) + ".lodVisibility"
+        if (cmds.getAttr(attribute) and
+                cmds.getAttr(attribute, settable=True)):
+            cmds.setAttr(attribute, False)
+            hidden.append(attribute)
+    try:
+        yield
+    finally:
+        for attribute in hidden:
+            cmds.setAttr(attribute, True)
 
-    return [pfxtoon_shape.getParent(), pfxtoon_shape]
 
+def get_mesh_triangles(meshes):
+    """Get the evaluated world space triangles of meshes.
 
-def capture_frames(camera=None, start_frame=None, end_frame=None):
-    """Capture a viewport frames with pfx and black background.
+    Vertex and face ids are offset per mesh, so they are unique across all
+    meshes.
 
     Args:
-        camera (str, optional): Name of camera, defaults to "persp"
-        start_frame (float, optional): Defaults to current start frame.
-        end_frame (float, optional): Defaults to current end frame.
+        meshes (list): List of pymel.core.nodetypes.Mesh.
 
     Returns:
-        str: Directory with captured frames as png images.
+        list: [
+            numpy.ndarray: triangles shaped (triangles, 3, 3),
+            numpy.ndarray: vertex ids shaped (triangles, 3),
+            numpy.ndarray: face id per triangle
+        ]
     """
+    if numpy is None:
+        raise ImportError("The geometry engine requires NumPy.")
 
-    # Create temporary folder.
-    temp_directory = os.path.join(gettempdir(), '.{}'.format(hash(os.times())))
-    os.makedirs(temp_directory)
+    selection = om2.MSelectionList()
+    for mesh in meshes:
+        selection.add(str(mesh))
+
+    triangles = [numpy.empty((0, 3, 3))]
+    vertex_ids = [numpy.empty((0, 3), dtype=int)]
+    face_ids = [numpy.empty(0, dtype=int)]
+    vertex_offset = 0
+    face_offset = 0
+    for index in range(len(meshes)):
+        mesh_fn = om2.MFnMesh(selection.getDagPath(index))
+
+        points = numpy.array(
+            mesh_fn.getPoints(om2.MSpace.kWorld), dtype=numpy.float64
+        )[:, :3]
+        counts, vertices = mesh_fn.getTriangles()
+        vertices = numpy.array(vertices, dtype=int).reshape(-1, 3)
+        faces = numpy.repeat(
+            numpy.arange(mesh_fn.numPolygons), numpy.array(counts, dtype=int)
+        )
 
-    # Clear selection so pfx does not get highlighted.
-    pymel.core.select(clear=True)
+        triangles.append(points[vertices])
+        vertex_ids.append(vertices + vertex_offset)
+        face_ids.append(faces + face_offset)
+        vertex_offset += mesh_fn.numVertices
+        face_offset += mesh_fn.numPolygons
 
-    # Capture viewport.
-    options = {
-        "camera": camera or "persp",
-        "format": "image",
-        "compression": "png",
-        "width": 40,
-        "start_frame": start_frame,
-        "end_frame": end_frame,
-        "filename": os.path.join(temp_directory, "temp"),
-        "viewer": False,
-        "viewport_options": {
-            "strokes": True, "headsUpDisplay": False, "imagePlane": False
-        },
-        "display_options": {"displayGradient": False, "background": (0, 0, 0)},
-    }
-    capture(**options)
+    return [
+        numpy.concatenate(triangles),
+        numpy.concatenate(vertex_ids),
+        numpy.concatenate(face_ids)
+    ]
 
-    return temp_directory
 
+def iter_geometry_coverage(meshes, frames, metrics=None, timings=None):
+    """Find intersecting faces of meshes without capturing the viewport.
 
-def get_white_coverage(file_path):
-    """Analyze the luminance coverage as 0-1 float in an image.
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+        frames (list): Frames to analyze.
+        metrics (dict, optional): Filled with the amount of intersecting
+            faces and faces per frame.
+        timings (StageTimings, optional): Records the time spent reading
+            and testing triangles.
+
+    Yields:
+        tuple: (float: frame, float: share of intersecting faces)
+    """
+    timings = timings or StageTimings()
+    with _maintained_time():
+        for frame in frames:
+            with timings.measure("triangles") as counts:
+                cmds.currentTime(frame)
+                triangles, vertex_ids, face_ids = get_mesh_triangles(meshes)
+                counts["frames"] += 1
+                counts["bytes"] += triangles.nbytes
+
+            with timings.measure("geometry") as counts:
+                coverage, intersecting, faces = (
+                    geometry.get_intersection_coverage(
+                        triangles, vertex_ids, face_ids
+                    )
+                )
+                counts["frames"] += 1
+
+            if metrics is not None:
+                metrics[frame] = {
+                    "intersecting_faces": intersecting, "faces": faces
+                }
+            yield frame, coverage
+
+
+# Every mesh group is a render setup collection, which are slow to create,
+# so meshes are grouped well below the amount of identifying colors.
+MAX_GROUPS = min(64, ID_COUNT)
+
+
+def get_mesh_groups(meshes, max_groups=MAX_GROUPS):
+    """Group meshes so each group can be drawn in its own color.
+
+    Every mesh is its own group when there are few enough meshes. Otherwise
+    meshes are grouped by their top level transform. Unrelated hierarchies
+    are never merged, as an intersection between them would be reported as
+    a self intersection of the merged group.
 
     Args:
-        file_path (str): Path to png image file to analyze.
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+        max_groups (int, optional): Maximum amount of groups, at most
+            `analysis.ID_COUNT`. Defaults to `MAX_GROUPS`.
 
     Returns:
-        float: 0-1 value for the percentage of non-black pixels.
-    """
+        list: [
+            str: group name,
+            list: pymel.core.nodetypes.Mesh in the group
+        ]
 
-    img = png.Reader(filename=file_path)
-    data = img.read()
+    Raises:
+        ValueError: When the meshes are under more top level transforms
+            than `max_groups`.
+    """
+    if len(meshes) <= max_groups:
+        return [[str(mesh), [mesh]] for mesh in meshes]
 
-    # A full white image has 255 in RGBA.
-    pixel_count = data[0] * data[1]
-    values_max = pixel_count * 4 * 255
+    roots = OrderedDict()
+    for mesh in meshes:
+        roots.setdefault(str(mesh.root()), []).append(mesh)
 
-    # Scan pixels for values.
-    values_count = 0.0
-    for row in data[2]:
-        values_count += sum(row)
+    if len(roots) > max_groups:
+        raise ValueError(
+            "Attribution supports {0} mesh groups, but the {1} meshes are "
+            "under {2} top level transforms. Group them under fewer "
+            "transforms.".format(max_groups, len(meshes), len(roots))
+        )
 
-    # Return 0-1 value of white coverage.
-    return values_count / values_max
+    return [[name, members] for name, members in roots.items()]
 
 
-def create_material_override():
+def create_material_override(groups=None):
     """Setup a render layer which only shows pfx shapes.
 
+    Args:
+        groups (list, optional): [name, meshes] lists from
+            `get_mesh_groups`. Each group is drawn in the flat color of
+            `get_id_color` for its index instead of black.
+
     Returns:
         list: [
             pymel.core.nodetypes.UseBackground: UseBackground shader,
             pymel.core.nodetypes.ShadingEngine: Shading group,
+            pymel.core.nodetypes.SurfaceShader: shader per group,
+            pymel.core.nodetypes.ShadingEngine: shading group per group,
             maya.app.renderSetup.model.renderLayer.RenderLayer: render layer
         ]
     """
@@ -179,10 +1319,44 @@ def create_material_override():
     pymel.core.connectAttr(
         shading_group.message, override.name() + ".attrValue"
     )
+    nodes = [shader, shading_group]
+
+    # Later collections take precedence over the black background.
+    for index, (name, meshes) in enumerate(groups or []):
+        id_shader = pymel.core.shadingNode(
+            "surfaceShader",
+            asShader=True,
+            name="intersections_id{0}".format(index)
+        )
+        id_shader.outColor.set(get_id_color(index))
+        id_shading_group = pymel.core.sets(
+            renderable=True,
+            noSurfaceShader=True,
+            empty=True,
+            name="intersections_id{0}SG".format(index)
+        )
+        pymel.core.connectAttr(
+            id_shader + ".outColor", id_shading_group + ".surfaceShader"
+        )
+
+        id_collection = layer.createCollection("id{0}".format(index))
+        id_collection.getSelector().setFilterType(2)
+        # Full paths only match these meshes, where short names can also
+        # match meshes of the same name under other parents.
+        id_collection.getSelector().setPattern(
+            ";".join(mesh.fullPath() for mesh in meshes)
+        )
+        id_override = id_collection.createOverride(
+            "id{0}_override".format(index), typeIDs.materialOverride
+        )
+        pymel.core.connectAttr(
+            id_shading_group.message, id_override.name() + ".attrValue"
+        )
+        nodes.extend([id_shader, id_shading_group])
 
     render_setup.switchToLayer(layer)
 
-    return [shader, shading_group, layer]
+    return nodes + [layer]
 
 
 def delete_node(node):
@@ -193,10 +1367,1280 @@ def delete_node(node):
         pymel.core.delete(node)
 
 
+class Session(object):
+    """Pfx setup kept alive over multiple analyses.
+
+    The pfx, background shader and render layer are created when the
+    session opens and deleted when it closes. In between, analyses passed
+    the session only update which meshes are connected to the pfx, and
+    `deactivate` it once done, so other viewports show the scene as usual
+    while the setup is kept.
+
+    Example:
+        >>> with Session() as session:
+        ...     coverage = get_coverage(session=session)
+        ...     coverage = get_coverage(session=session, stride=10)
+
+    Args:
+        delete_pfx (bool, optional): Deletes the pfx when the session
+            closes. Defaults to True.
+        attribution (bool, optional): Draw each mesh group in its own
+            color, so intersections can be attributed to pairs of mesh
+            groups. Color management is disabled while the session is
+            open. Defaults to False.
+    """
+
+    def __init__(self, delete_pfx=True, attribution=False):
+        self.delete_pfx = delete_pfx
+        self.attribution = attribution
+        self.pfx = None
+        self.pfxtoon_shape = None
+        self.render_layer_nodes = []
+        self.connections = {}
+        self.groups = []
+        self.color_management = None
+        self.previous_layer = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def is_open(self):
+        return self.pfx is not None
+
+    def open(self, meshes=None, timings=None):
+        """Create the pfx and render layer, if not already open.
+
+        Args:
+            meshes (list, optional): List of pymel.core.nodetypes.Mesh to
+                connect. Defaults to all meshes in the scene.
+            timings (StageTimings, optional): Records the time spent on the
+                pfx and the render layer.
+        """
+        if self.is_open:
+            self.update(meshes, timings)
+            return
+
+        timings = timings or StageTimings()
+        meshes = meshes or pymel.core.ls(type="mesh")
+        with timings.measure("pfx"):
+            self.pfx, self.pfxtoon_shape = apply_pfxtoon(meshes)
+            self.connections = dict(
+                (mesh, index) for index, mesh in enumerate(meshes)
+            )
+
+        with timings.measure("render_layer"):
+            if self.attribution:
+                self.groups = get_mesh_groups(meshes)
+                self.color_management = cmds.colorManagementPrefs(
+                    query=True, cmEnabled=True
+                )
+                cmds.colorManagementPrefs(edit=True, cmEnabled=False)
+            self.previous_layer = (
+                renderSetup.instance().getVisibleRenderLayer()
+            )
+            self.render_layer_nodes = create_material_override(self.groups)
+
+    def update(self, meshes=None, timings=None):
+        """Connect only the meshes given to the pfx.
+
+        Meshes that are already connected keep their connections, so only
+        meshes that were added or removed since the last update cost time.
+
+        Args:
+            meshes (list, optional): List of pymel.core.nodetypes.Mesh.
+                Defaults to all meshes in the scene.
+            timings (StageTimings, optional): Records the time spent on the
+                pfx and the render layer.
+        """
+        # Analyses without the session delete any previous pfx.
+        if self.is_open and not pymel.core.objExists(self.pfx):
+            self.close()
+
+        if not self.is_open:
+            self.open(meshes, timings)
+            return
+
+        timings = timings or StageTimings()
+        if meshes is None:
+            meshes = pymel.core.ls(type="mesh")
+
+        with timings.measure("pfx"):
+            wanted = set(meshes)
+            for mesh in list(self.connections):
+                if mesh not in wanted:
+                    disconnect_mesh(
+                        self.pfxtoon_shape, self.connections.pop(mesh)
+                    )
+
+            used = set(self.connections.values())
+            index = 0
+            for mesh in meshes:
+                if mesh in self.connections:
+                    continue
+                while index in used:
+                    index += 1
+                connect_mesh(self.pfxtoon_shape, mesh, index)
+                self.connections[mesh] = index
+                used.add(index)
+
+        with timings.measure("render_layer"):
+            # Group colors are part of the render layer, so it is recreated
+            # when the groups change.
+            if self.attribution:
+                groups = get_mesh_groups(meshes)
+                if groups != self.groups:
+                    for node in self.render_layer_nodes:
+                        delete_node(node)
+                    self.groups = groups
+                    self.render_layer_nodes = create_material_override(
+                        groups
+                    )
+
+            self.activate()
+
+    def activate(self):
+        """Make the render layer of the session visible and show the pfx
+        again, in case another layer was switched to or the session was
+        deactivated."""
+        layer = self.render_layer_nodes[-1]
+        render_setup = renderSetup.instance()
+        visible = render_setup.getVisibleRenderLayer()
+        if visible != layer:
+            self.previous_layer = visible
+            render_setup.switchToLayer(layer)
+        self.pfx.visibility.set(True)
+
+    def deactivate(self):
+        """Switch back to the render layer that was visible before the
+        session and hide the pfx, so viewports show the scene as usual
+        until the session is activated again."""
+        if not self.is_open:
+            return
+
+        self._restore_layer()
+        self.pfx.visibility.set(False)
+
+    def _restore_layer(self):
+        layer = self.previous_layer
+        render_setup = renderSetup.instance()
+        if layer is not None and render_setup.getVisibleRenderLayer() != layer:
+            render_setup.switchToLayer(layer)
+
+    def close(self):
+        """Delete the render layer, and the pfx if `delete_pfx` is set."""
+        if not self.is_open:
+            return
+
+        self._restore_layer()
+        for node in self.render_layer_nodes:
+            delete_node(node)
+
+        if self.delete_pfx and pymel.core.objExists(self.pfx):
+            pymel.core.delete(self.pfx)
+
+        if self.color_management is not None:
+            cmds.colorManagementPrefs(
+                edit=True, cmEnabled=self.color_management
+            )
+
+        self.pfx = None
+        self.pfxtoon_shape = None
+        self.render_layer_nodes = []
+        self.connections = {}
+        self.groups = []
+        self.color_management = None
+        self.previous_layer = None
+
+
+def iter_frames_coverage(camera,
+                         start_frame,
+                         end_frame,
+                         in_memory=False,
+                         pipelined=False,
+                         workers=2,
+                         chunk_size=None,
+                         width=40,
+                         timings=None,
+                         id_pairs=None,
+                         regions=None,
+                         frames=None,
+                         threshold=None,
+                         image_format="png",
+                         temp_root=None,
+                         base_pixels=None,
+                         kept_pixels=None,
+                         pool=None):
+    """Capture and score frames with the pfx setup already in place.
+
+    Args:
+        camera (str): Name of camera.
+        start_frame (float): First frame to capture.
+        end_frame (float): Last frame to capture.
+        in_memory (bool, optional): Read frames straight from the viewport
+            color buffer instead of playblasting to png files.
+        pipelined (bool, optional): Score png files on a worker pool while
+            the playblast is still running.
+        workers (int, optional): Amount of scoring threads when pipelined.
+        chunk_size (int, optional): Amount of frames per playblast, so
+            results are yielded in between playblasts. Defaults to the
+            whole range.
+        width (int, optional): Width of the captured frames in pixels.
+        timings (StageTimings, optional): Records the time spent capturing,
+            decoding and cleaning up.
+        id_pairs (dict, optional): Filled with the coverage per pair of mesh
+            group indices per frame, for frames drawn with a session in
+            attribution mode. Coverage is then the share of line pixels,
+            and png files are not pipelined.
+        regions (dict, optional): Filled with the connected regions of
+            intersection pixels per frame, from `analysis.get_regions`. Png
+            files are not pipelined.
+        frames (list, optional): Sorted frames to capture instead of every
+            frame from start to end frame. Frames that are not consecutive
+            are playblasted together, except for negative frames which are
+            playblasted per run of consecutive frames.
+        threshold (int, optional): Detect whether any pixel exceeds this
+            0-255 value instead of getting the coverage. Png files are
+            decoded row by row until the first such pixel. Can not be
+            combined with `id_pairs` or `regions`.
+        image_format (str, optional): "png", or "bmp" for uncompressed
+            frames that are memory mapped and scored in place.
+        temp_root (str, optional): Directory to capture in, like a tmpfs
+            mount. Defaults to the system temporary directory.
+        base_pixels (list, optional): [width, height, planes, pixel data]
+            merged into each frame of the same layout before scoring, like
+            the intersections of static meshes. Png files are not
+            pipelined.
+        kept_pixels (dict, optional): Filled with the [width, height,
+            planes, pixel data] of each frame. Png files are not
+            pipelined.
+        pool (multiprocessing.pool.Pool, optional): Pool from
+            `scoring_pool` that scores the pipelined frames of every batch.
+            Defaults to a pool per batch.
+
+    Yields:
+        tuple: (
+            float: frame,
+            float: coverage of intersections, or bool: whether the frame
+                has a pixel above the threshold
+        )
+
+    Raises:
+        RuntimeError: When a playblast did not write every frame.
+    """
+    timings = timings or StageTimings()
+    detailed = (
+        id_pairs is not None or regions is not None or
+        base_pixels is not None or kept_pixels is not None
+    )
+
+    def analyze_pixels(frame, pixels, width, height, planes=4):
+        if (base_pixels is not None and
+                base_pixels[:3] == [width, height, planes]):
+            pixels = merge_pixels(pixels, base_pixels[3])
+
+        if kept_pixels is not None:
+            kept_pixels[frame] = [width, height, planes, pixels]
+
+        if threshold is not None:
+            return get_pixels_hit(pixels, planes, threshold)
+
+        if regions is not None:
+            regions[frame] = get_regions(
+                pixels, width, height, planes, white_only=id_pairs is not None
+            )
+
+        if id_pairs is None:
+            return get_pixels_coverage(pixels, planes)
+
+        coverage, id_pairs[frame] = get_id_coverage(
+            pixels, width, height, planes
+        )
+        return coverage
+
+    if in_memory:
+        buffers = capture_buffers(
+            start_frame=start_frame,
+            end_frame=end_frame,
+            camera=camera,
+            width=width,
+            frames=frames
+        )
+        while True:
+            with timings.measure("capture") as counts:
+                try:
+                    frame, buffer_width, buffer_height, pixels = next(buffers)
+                except StopIteration:
+                    break
+                counts["frames"] += 1
+
+            with timings.measure("decode") as counts:
+                coverage = analyze_pixels(
+                    frame, pixels, buffer_width, buffer_height
+                )
+                counts["frames"] += 1
+                counts["bytes"] += len(pixels)
+
+            yield frame, coverage
+        return
+
+    frames = frames or get_frames(start_frame, end_frame)
+    chunk_size = chunk_size or len(frames)
+    batches = []
+    for index in range(0, len(frames), chunk_size):
+        chunk_frames = frames[index:index + chunk_size]
+
+        # Explicit frame numbers can not be negative, so negative frames
+        # are captured per run of consecutive frames.
+        negative = [frame for frame in chunk_frames if frame < 0]
+        batches.extend(get_frame_runs(negative))
+        if len(negative) < len(chunk_frames):
+            batches.append(chunk_frames[len(negative):])
+
+    for batch_frames in batches:
+        sparse = batch_frames[-1] - batch_frames[0] + 1 != len(batch_frames)
+        capture_options = {
+            "start_frame": batch_frames[0],
+            "end_frame": batch_frames[-1],
+            "camera": camera,
+            "width": width,
+            "frames": batch_frames if sparse else None,
+            "image_format": image_format
+        }
+
+        if pipelined and not detailed:
+            # Capture and decoding overlap, so they are timed together.
+            with timings.measure("capture_decode") as counts:
+                frame_coverages = capture_frames_pipelined(
+                    workers=workers,
+                    threshold=threshold,
+                    temp_root=temp_root,
+                    pool=pool,
+                    **capture_options
+                )
+                counts["frames"] += len(frame_coverages)
+            captured_frames = [frame for frame, _ in frame_coverages]
+            coverages = [coverage for _, coverage in frame_coverages]
+        else:
+            with timings.measure("capture") as counts:
+                capture_directory = capture_frames(
+                    temp_directory=create_temp_directory(temp_root),
+                    **capture_options
+                )
+                counts["frames"] += len(batch_frames)
+
+            with timings.measure("decode") as counts:
+                frame_files = get_frame_files(
+                    capture_directory,
+                    batch_frames,
+                    is_renumbered(batch_frames)
+                )
+                captured_frames = [frame for frame, path in frame_files]
+                file_paths = [path for frame, path in frame_files]
+                if threshold is not None and not detailed:
+                    coverages = [
+                        get_file_hit(path, threshold) for path in file_paths
+                    ]
+                elif not detailed:
+                    coverages = get_files_coverage(file_paths)
+                else:
+                    coverages = [
+                        analyze_pixels(
+                            frame, pixels, image_width, image_height, planes
+                        )
+                        for frame, (image_width, image_height, planes, pixels)
+                        in zip(captured_frames, map(read_image, file_paths))
+                    ]
+                counts["frames"] += len(file_paths)
+                counts["bytes"] += sum(
+                    os.path.getsize(path) for path in file_paths
+                )
+
+            # Clean up.
+            with timings.measure("cleanup"):
+                rmtree(capture_directory, ignore_errors=True)
+
+        # A playblast can skip frames, which would otherwise shift or drop
+        # results silently.
+        missing = sorted(set(batch_frames) - set(captured_frames))
+        if missing or len(coverages) != len(batch_frames):
+            raise RuntimeError(
+                "Captured {0} of {1} frames, missing: {2}".format(
+                    len(coverages),
+                    len(batch_frames),
+                    missing or "unknown"
+                )
+            )
+
+        for frame, coverage in zip(captured_frames, coverages):
+            yield frame, coverage
+
+
+def iter_strided(analyze, frames, stride=None, max_gap=None, stats=None):
+    """Analyze every stride frame first, then bisect the gaps next to
+    frames with intersections.
+
+    Args:
+        analyze (callable): Yields tuples starting with frame and coverage
+            for a list of frames.
+        frames (list): Sorted frames.
+        stride (int, optional): Only sample every stride frame and the
+            last frame first. Defaults to analyzing every frame.
+        max_gap (int, optional): Longest run of frames in between clean
+            frames that is skipped, bisecting longer ones. Defaults to
+            `stride` - 1.
+        stats (dict, optional): Filled with the amount of frames known to
+            be analyzed so far in "planned_frames", which grows as gaps are
+            bisected, and the amount of "sampled_frames" when sampling.
+
+    Yields:
+        tuple: Results of `analyze`, in the order frames are analyzed.
+    """
+    stats = {} if stats is None else stats
+    if not stride or stride <= 1:
+        stats["planned_frames"] = len(frames)
+        for result in analyze(frames):
+            yield result
+        return
+
+    # Sample every stride frame and the last frame, by index.
+    indices = list(range(0, len(frames), stride))
+    if indices[-1] != len(frames) - 1:
+        indices.append(len(frames) - 1)
+    positions = dict((frame, index) for index, frame in enumerate(frames))
+    gap = stride - 1 if max_gap is None else max_gap
+
+    analyzed = set()
+    hits = set()
+    while indices:
+        stats["planned_frames"] = len(analyzed) + len(indices)
+        for result in analyze([frames[i] for i in indices]):
+            analyzed.add(positions[result[0]])
+            if result[1]:
+                hits.add(positions[result[0]])
+            yield result
+
+        # Bisect every gap next to a hit until each intersecting interval
+        # is resolved, and clean gaps above the maximum gap.
+        ordered = sorted(analyzed)
+        indices = [
+            (a + b) // 2 for a, b in zip(ordered, ordered[1:])
+            if b - a > 1 and (a in hits or b in hits or b - a > gap + 1)
+        ]
+
+    stats["sampled_frames"] = len(analyzed)
+
+
+class AnalysisOptions(object):
+    """Options deciding how `iter_coverage` captures and scores frames.
+
+    Combinations that do not work together raise when the options are
+    created, before anything in the scene changes.
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        engine (str, optional): "pfx" or "geometry". Defaults to "pfx".
+        in_memory (bool, optional): Read frames straight from the viewport
+            color buffer. Defaults to False.
+        pipelined (bool, optional): Score png files on a worker pool while
+            the playblast is still running. Defaults to False.
+        workers (int, optional): Amount of scoring threads when pipelined.
+            Defaults to 2.
+        chunk_size (int, optional): Amount of frames per playblast.
+            Defaults to 10 with `max_hits`, otherwise the whole range.
+        width (int, optional): Width of the captured frames in pixels.
+            Defaults to 40.
+        refine_width (int, optional): Width to capture frames with
+            intersections again at. Defaults to no refinement.
+        attribution (bool, optional): Attribute intersections to pairs of
+            mesh groups. Defaults to False.
+        regions (bool, optional): Locate connected regions of intersection
+            pixels. Defaults to False.
+        threshold (int, optional): Detect whether any pixel exceeds this
+            0-255 value instead of getting the coverage.
+        max_hits (int, optional): Stop once this amount of frames with
+            intersections is found.
+        image_format (str, optional): "png" or "bmp". Defaults to "png".
+        temp_root (str, optional): Directory to capture frames in.
+        partition (bool, optional): Capture intersections of static meshes
+            once. Defaults to False.
+
+    Raises:
+        ValueError: When an option is not supported, or options can not be
+            combined.
+    """
+
+    def __init__(self,
+                 camera=None,
+                 engine="pfx",
+                 in_memory=False,
+                 pipelined=False,
+                 workers=2,
+                 chunk_size=None,
+                 width=40,
+                 refine_width=None,
+                 attribution=False,
+                 regions=False,
+                 threshold=None,
+                 max_hits=None,
+                 image_format="png",
+                 temp_root=None,
+                 partition=False):
+        self.camera = camera or "persp"
+        self.engine = engine
+        self.in_memory = in_memory
+        self.pipelined = pipelined
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.width = width
+        self.refine_width = refine_width
+        self.attribution = attribution
+        self.regions = regions
+        self.threshold = threshold
+        self.max_hits = max_hits
+        self.image_format = image_format
+        self.temp_root = temp_root
+        self.partition = partition
+
+        # Capture in small chunks so the analysis can stop soon after the
+        # last hit.
+        if max_hits and not in_memory:
+            self.chunk_size = chunk_size or 10
+
+        self.validate()
+
+    def validate(self):
+        """Raise a ValueError for options that can not be combined."""
+        if self.engine not in ("pfx", "geometry"):
+            raise ValueError("Unsupported engine: {0}".format(self.engine))
+
+        if self.regions and self.engine != "pfx":
+            raise ValueError("Regions require the pfx engine.")
+
+        if self.image_format not in ("png", "bmp"):
+            raise ValueError(
+                "Unsupported image format: {0}".format(self.image_format)
+            )
+
+        if self.partition and (self.engine != "pfx" or self.attribution):
+            raise ValueError(
+                "Partitioning requires the pfx engine without attribution."
+            )
+
+        if self.threshold is not None and (self.regions or self.attribution):
+            raise ValueError(
+                "Detection can not be combined with attribution or regions."
+            )
+
+        if self.attribution and self.engine != "pfx":
+            raise ValueError("Attribution requires the pfx engine.")
+
+    @property
+    def refine(self):
+        """Whether frames with intersections are captured again, which
+        only applies to the coverage of the pfx engine."""
+        return bool(
+            self.refine_width and self.engine == "pfx" and
+            self.threshold is None
+        )
+
+    def get_key_options(self):
+        """Get the options that change the result of a frame, for the keys
+        of `get_frame_keys`."""
+        options = get_capture_options(self.camera, self.width)
+        options["in_memory"] = self.in_memory
+        options["engine"] = self.engine
+        options["refine_width"] = self.refine_width
+        options["regions"] = self.regions
+        options["threshold"] = self.threshold
+        options["partition"] = self.partition
+        options["image_format"] = self.image_format
+        return options
+
+
+def _set_metric(metrics, frame, name, value):
+    if metrics is not None:
+        metrics.setdefault(frame, {})[name] = value
+
+
+def iter_limited(results, max_hits=None, stats=None):
+    """Yield results until `max_hits` of them have intersections.
+
+    Args:
+        results (iterable): Tuples starting with frame and coverage.
+        max_hits (int, optional): Amount of results with intersections to
+            stop after. Defaults to yielding every result.
+        stats (dict, optional): Sets "stopped_early" when stopping.
+
+    Yields:
+        tuple: The results.
+    """
+    hit_count = 0
+    for result in results:
+        yield result
+
+        if result[1]:
+            hit_count += 1
+        if max_hits and hit_count >= max_hits:
+            if stats is not None:
+                stats["stopped_early"] = True
+            return
+
+
+def iter_cached(analyze, frames, cache=None, keys=None, metrics=None):
+    """Get coverage of frames from a cache, analyzing the other frames.
+
+    Frames are yielded in order, with cached frames in between the analyzed
+    ones as soon as they are reached. Analyzed frames are stored in the
+    cache together with their metrics.
+
+    Args:
+        analyze (callable): Yields tuples of frame and coverage in frame
+            order for a list of frames. Only called for frames missing from
+            the cache.
+        frames (list): Sorted frames.
+        cache (CoverageCache, optional): Cache of earlier results. Defaults
+            to analyzing every frame.
+        keys (dict, optional): Cache key per frame, from `get_frame_keys`.
+        metrics (dict, optional): Filled with the metrics of cached frames.
+
+    Yields:
+        tuple: (
+            float: frame,
+            float: coverage
+        )
+    """
+    cached = {}
+    if cache is not None:
+        for frame in frames:
+            value = cache.get(keys[frame])
+            if value is None:
+                continue
+
+            # Entries can also be plain coverage values.
+            if not isinstance(value, list):
+                value = [value, None]
+            cached[frame] = value
+
+    def get_cached(frame):
+        coverage, frame_metrics = cached[frame]
+        if metrics is not None and frame_metrics:
+            metrics[frame] = frame_metrics
+        return frame, coverage
+
+    missing = [frame for frame in frames if frame not in cached]
+    position = 0
+    if missing:
+        for frame, coverage in analyze(missing):
+            while position < len(frames) and frames[position] < frame:
+                yield get_cached(frames[position])
+                position += 1
+
+            if cache is not None:
+                frame_metrics = (metrics or {}).get(frame)
+                cache.set(keys[frame], [coverage, frame_metrics])
+            yield frame, coverage
+
+            # Step past the analyzed frame without assuming it is the next
+            # frame.
+            while position < len(frames) and frames[position] <= frame:
+                position += 1
+
+    for frame in frames[position:]:
+        yield get_cached(frame)
+
+
+def iter_refined(capture,
+                 frames,
+                 width,
+                 refine_width,
+                 batch_size=None,
+                 metrics=None):
+    """Capture frames, and frames with intersections again at a higher
+    width.
+
+    Pfx lines are drawn a fixed amount of pixels thick, so their share of a
+    frame shrinks as the width grows. Refined coverage is scaled back to the
+    capture width to stay comparable with the other frames. Frames are
+    yielded in order once the hits before them are refined, so results keep
+    streaming while refining.
+
+    Args:
+        capture (callable): Yields tuples of frame and coverage for a list
+            of frames captured at a width, as `capture(frames, width)`.
+        frames (list): Sorted frames.
+        width (int): Width to capture every frame at.
+        refine_width (int): Width to capture frames with intersections at.
+        batch_size (int, optional): Amount of frames captured before their
+            hits are refined. Defaults to every frame.
+        metrics (dict, optional): Filled with the "width" each value was
+            captured at, and the unscaled "refined_coverage".
+
+    Yields:
+        tuple: (
+            float: frame,
+            float: coverage
+        )
+    """
+    batch_size = batch_size or len(frames)
+    pending = []
+    hits = []
+
+    def flush():
+        refined = dict(capture(hits, refine_width)) if hits else {}
+        scale = float(refine_width) / width
+        results = []
+        for frame, coverage in pending:
+            if frame in refined:
+                _set_metric(metrics, frame, "width", refine_width)
+                _set_metric(
+                    metrics, frame, "refined_coverage", refined[frame]
+                )
+                coverage = min(refined[frame] * scale, 1.0)
+            else:
+                _set_metric(metrics, frame, "width", width)
+            results.append((frame, coverage))
+        del pending[:]
+        del hits[:]
+        return results
+
+    for frame, coverage in capture(frames, width):
+        pending.append((frame, coverage))
+        if coverage:
+            hits.append(frame)
+        if not hits or len(pending) >= batch_size:
+            for result in flush():
+                yield result
+
+    for result in flush():
+        yield result
+
+
+class GeometryCapture(object):
+    """Scores frames by testing the mesh triangles against each other.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+        options (AnalysisOptions): Options of the analysis.
+        metrics (dict, optional): Filled with the face counts per frame.
+        timings (StageTimings, optional): Records the time spent.
+    """
+
+    def __init__(self, meshes, options, metrics=None, timings=None):
+        self.meshes = meshes
+        self.options = options
+        self.metrics = metrics
+        self.timings = timings
+
+    def capture(self, frames, width=None):
+        """Get the share of intersecting faces of frames, or whether any
+        face intersects when detecting.
+
+        Yields:
+            tuple: (
+                float: frame,
+                float: coverage, or bool: whether any face intersects
+            )
+        """
+        results = iter_geometry_coverage(
+            self.meshes, frames, self.metrics, self.timings
+        )
+        if self.options.threshold is None:
+            return results
+        return ((frame, coverage > 0) for frame, coverage in results)
+
+    def close(self):
+        """Nothing is left in the scene to clean up."""
+
+
+class PfxCapture(object):
+    """Captures frames drawn with the pfx setup of a session.
+
+    The setup is prepared on the first capture, so analyses that only read
+    cached frames leave the scene untouched. With partitioning, the
+    intersections of static meshes are captured once on the first frame and
+    merged into every frame.
+
+    Args:
+        meshes (list): List of pymel.core.nodetypes.Mesh.
+        frames (list): Sorted frames of the whole analysis.
+        options (AnalysisOptions): Options of the analysis.
+        session (Session, optional): Session to connect the meshes to,
+            which is deactivated instead of closed once done. Defaults to a
+            session of this capture.
+        delete_pfx (bool, optional): Deletes the pfx of a session of this
+            capture once done. Defaults to True.
+        timings (StageTimings, optional): Records the time spent per stage.
+        stats (dict, optional): Filled with the amount of static and nearby
+            meshes when partitioning.
+        metrics (dict, optional): Filled with the "regions" per frame.
+        pairs (dict, optional): Filled with the coverage per pair of mesh
+            group names per frame, when attributing.
+    """
+
+    def __init__(self,
+                 meshes,
+                 frames,
+                 options,
+                 session=None,
+                 delete_pfx=True,
+                 timings=None,
+                 stats=None,
+                 metrics=None,
+                 pairs=None):
+        self.meshes = meshes
+        self.frames = frames
+        self.options = options
+        self.owned_session = session is None
+        self.session = session or Session(
+            delete_pfx=delete_pfx, attribution=options.attribution
+        )
+        self.timings = timings or StageTimings()
+        self.stats = stats
+        self.metrics = metrics
+        self.pairs = pairs
+        self.prepared = False
+
+        # Intersections of static meshes per capture width, and the meshes
+        # drawn per frame.
+        self.static_passes = {}
+        self.drawn_meshes = []
+
+        # Pipelined frames are scored by one pool for the whole analysis.
+        self.pool = None
+        self._pool_context = None
+
+    def prepare(self):
+        """Create the pfx and render layer for showing pfx only, or connect
+        the meshes to the existing setup. Partitioned static intersections
+        are captured first."""
+        options = self.options
+        drawn = self.meshes
+        if options.partition:
+            with self.timings.measure("partition") as counts:
+                static, animated, nearby, camera_static = get_partition(
+                    self.meshes, options.camera, self.frames
+                )
+                counts["frames"] += len(self.frames)
+
+            if self.stats is not None:
+                self.stats["static_meshes"] = len(static)
+                self.stats["nearby_meshes"] = len(nearby)
+
+            if not camera_static:
+                info("The camera moves, so all meshes are drawn per frame.")
+            elif static:
+                # Static intersections are merged into every frame, so
+                # animated meshes must not hide them on the first frame.
+                with hidden_meshes(animated):
+                    self._capture_static(static)
+                drawn = animated + nearby
+                info(
+                    "Drawing {0} animated and {1} nearby static meshes per "
+                    "frame.".format(len(animated), len(nearby))
+                )
+
+        if drawn:
+            self.session.update(drawn, self.timings)
+        self.drawn_meshes = drawn
+
+        if options.pipelined:
+            self._pool_context = scoring_pool(options.workers)
+            self.pool = self._pool_context.__enter__()
+        self.prepared = True
+
+    def _capture_static(self, static):
+        """Capture the intersections of static meshes once per capture
+        width, on the first frame."""
+        options = self.options
+        self.session.update(static, self.timings)
+
+        widths = [options.width]
+        if options.refine and options.refine_width != options.width:
+            widths.append(options.refine_width)
+
+        first_frame = self.frames[0]
+        for capture_width in widths:
+            kept_pixels = {}
+            frame_regions = {} if options.regions else None
+            results = list(iter_frames_coverage(
+                options.camera,
+                first_frame,
+                first_frame,
+                in_memory=options.in_memory,
+                width=capture_width,
+                timings=self.timings,
+                regions=frame_regions,
+                frames=[first_frame],
+                threshold=options.threshold,
+                image_format=options.image_format,
+                temp_root=options.temp_root,
+                kept_pixels=kept_pixels
+            ))
+            self.static_passes[capture_width] = [
+                results[0][1],
+                kept_pixels[first_frame],
+                (frame_regions or {}).get(first_frame)
+            ]
+
+    def capture(self, frames, width):
+        """Capture and score frames at a width.
+
+        Yields:
+            tuple: (
+                float: frame,
+                float: coverage, or bool: whether the frame has a pixel
+                    above the threshold
+            )
+        """
+        if not self.prepared:
+            self.prepare()
+
+        options = self.options
+        static_pass = self.static_passes.get(width)
+        if static_pass is not None and not self.drawn_meshes:
+            return self._repeat_static(frames, static_pass)
+
+        id_pairs = {} if self.pairs is not None else None
+        frame_regions = {} if options.regions else None
+        results = iter_frames_coverage(
+            options.camera,
+            frames[0],
+            frames[-1],
+            in_memory=options.in_memory,
+            pipelined=options.pipelined,
+            workers=options.workers,
+            chunk_size=options.chunk_size,
+            width=width,
+            timings=self.timings,
+            id_pairs=id_pairs,
+            regions=frame_regions,
+            frames=frames,
+            threshold=options.threshold,
+            image_format=options.image_format,
+            temp_root=options.temp_root,
+            base_pixels=static_pass[1] if static_pass else None,
+            pool=self.pool
+        )
+        if id_pairs is None and frame_regions is None:
+            return results
+        return self._store_details(results, id_pairs, frame_regions)
+
+    def _repeat_static(self, frames, static_pass):
+        """Yield the static intersections for frames without animated
+        meshes to draw."""
+        coverage, pixels, static_regions = static_pass
+        for frame in frames:
+            if self.options.regions:
+                _set_metric(self.metrics, frame, "regions", static_regions)
+            yield frame, coverage
+
+    def _store_details(self, results, id_pairs, frame_regions):
+        """Store pairs of mesh group indices by group names, and regions
+        as metrics."""
+        names = [name for name, members in self.session.groups]
+        for frame, coverage in results:
+            if id_pairs is not None:
+                self.pairs[frame] = dict(
+                    ((names[a], names[b]), value)
+                    for (a, b), value in id_pairs.pop(frame).items()
+                )
+            if frame_regions is not None:
+                _set_metric(
+                    self.metrics, frame, "regions", frame_regions.pop(frame)
+                )
+            yield frame, coverage
+
+    def close(self):
+        """Close the scoring pool, and delete the pfx setup of this capture
+        or deactivate the session passed in, so other viewports show the
+        scene as usual."""
+        if self._pool_context is not None:
+            context = self._pool_context
+            self._pool_context = None
+            self.pool = None
+            context.__exit__(None, None, None)
+
+        if self.owned_session:
+            self.session.close()
+        else:
+            self.session.deactivate()
+
+
+def iter_coverage(camera=None,
+                  start_frame=None,
+                  end_frame=None,
+                  delete_pfx=True,
+                  in_memory=False,
+                  pipelined=False,
+                  workers=2,
+                  chunk_size=None,
+                  cache=None,
+                  engine="pfx",
+                  metrics=None,
+                  broad_phase=False,
+                  stats=None,
+                  stride=None,
+                  max_gap=None,
+                  width=40,
+                  refine_width=None,
+                  log=False,
+                  session=None,
+                  pairs=None,
+                  regions=False,
+                  frames=None,
+                  threshold=None,
+                  max_hits=None,
+                  image_format="png",
+                  temp_root=None,
+                  partition=False):
+    """Get coverage of multiple frames as each frame completes.
+
+    Closing the generator stops the analysis early and cleans up the scene.
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+        delete_pfx (bool, optional): Deletes the pfx node. Defaults to True.
+        in_memory (bool, optional): Read frames straight from the viewport
+            color buffer instead of playblasting to png files. Frames are
+            yielded one at a time. Defaults to False.
+        pipelined (bool, optional): Score png files on a worker pool while
+            the playblast is still running. Defaults to False.
+        workers (int, optional): Amount of scoring threads when pipelined.
+            Defaults to 2.
+        chunk_size (int, optional): Amount of frames per playblast when
+            capturing to png files. Defaults to the whole range.
+        cache (CoverageCache, optional): Cache of earlier results. Only
+            frames whose scene state is not in the cache are captured.
+        engine (str, optional): "pfx" captures pfx intersection lines in
+            the viewport. "geometry" tests the mesh triangles directly and
+            scores the share of intersecting faces, which needs no viewport
+            but requires NumPy. Defaults to "pfx".
+        metrics (dict, optional): Filled with extra values per frame, like
+            intersecting face counts of the geometry engine.
+        broad_phase (bool, optional): Only analyze meshes whose bounding
+            box overlaps another mesh on some frame. Self intersections of
+            the culled meshes are not detected. Defaults to False.
+        stats (dict, optional): Filled with values about the whole
+            analysis, like the amount of culled meshes.
+        stride (int, optional): Only sample every stride frame first, then
+            recursively bisect the gaps next to samples with intersections
+            until each intersecting interval is resolved up to clean
+            frames. Intersections lasting more than `max_gap` frames are
+            always found, shorter ones in between clean frames can be
+            skipped. Frames that are skipped are not yielded. Defaults to
+            analyzing every frame.
+        max_gap (int, optional): Longest run of frames in between clean
+            frames that is skipped with `stride`, bisecting longer ones.
+            Defaults to `stride` - 1.
+        width (int, optional): Width of the captured frames in pixels.
+            Defaults to 40.
+        refine_width (int, optional): Capture frames with intersections
+            again at this width, for accurate coverage at the cost of only
+            those frames. Refined coverage is scaled by `refine_width` /
+            `width`, as lines are as thick in pixels at any width, so it is
+            comparable with the coverage of other frames. The width each
+            value was captured at is in the "width" metric, and the
+            unscaled refined coverage in the "refined_coverage" metric.
+            Defaults to no refinement.
+        log (bool, optional): Show the time spent per stage when the
+            analysis ends. The timings are always stored in the "stages"
+            of `stats`. Defaults to False.
+        session (Session, optional): Reuse the pfx setup of a session
+            instead of creating and deleting it for this analysis. Only the
+            connected meshes are updated, and `delete_pfx` is ignored. The
+            session must be in attribution mode exactly when `pairs` is
+            passed.
+        pairs (dict, optional): Filled with the coverage per pair of
+            intersecting mesh names per frame, as {frame: {(mesh_a, mesh_b):
+            coverage}}. A mesh paired with itself intersects itself. Meshes
+            are drawn in colors identifying them in the same captures, and
+            coverage becomes the share of intersection line pixels, which
+            counts antialiased line pixels fully unlike the share of white
+            of other analyses. Above `MAX_GROUPS` meshes, they are grouped
+            by their top level transform, named after it, which raises a
+            ValueError above `MAX_GROUPS` transforms. Requires the pfx
+            engine and a session in attribution mode if a session is
+            passed. The cache is not used, and png files are not pipelined.
+        regions (bool, optional): Store the connected regions of
+            intersection pixels of each frame in the "regions" metric, as
+            [left, top, right, bottom, share] lists from
+            `analysis.get_regions`. Requires the pfx engine. Png files are
+            not pipelined. Defaults to False.
+        frames (list or str, optional): Frames to analyze instead of every
+            frame from start to end frame, or text like "1-20,25,50".
+        threshold (int, optional): Only detect whether each frame has any
+            pixel above this 0-255 value, instead of getting the coverage.
+            Decoding a frame stops at the first such pixel. The geometry
+            engine detects any intersecting face. Can not be combined with
+            `pairs` or `regions`, and `refine_width` is ignored.
+        max_hits (int, optional): Stop the analysis once this amount of
+            frames with intersections is found. Png frames are then
+            captured in chunks of `chunk_size` frames, defaulting to 10.
+        image_format (str, optional): "png", or "bmp" to capture
+            uncompressed frames that are memory mapped and scored in place,
+            skipping compression and decompression at the cost of disk
+            space. Defaults to "png".
+        temp_root (str, optional): Directory to capture frames in, like a
+            tmpfs mount such as "/dev/shm". Defaults to the system
+            temporary directory.
+        partition (bool, optional): Split meshes into static and animated
+            meshes over the frames, by hashing their points and world
+            matrices. Intersections of static meshes are captured once and
+            merged into every frame, and only animated meshes and static
+            meshes whose bounding boxes overlap them are drawn per frame.
+            Static intersections are not occluded by animated meshes. Only
+            applies when the camera does not move. Requires the pfx engine
+            and can not be combined with `pairs`. Png files are not
+            pipelined. Defaults to False.
+
+    Yields:
+        tuple: (
+            float: frame,
+            float: coverage of intersections, or bool: whether the frame
+                has intersections when detecting with a threshold
+        )
+
+    Raises:
+        ValueError: When options can not be combined, see
+            `AnalysisOptions`, or the session does not match `pairs`.
+    """
+    start_frame, end_frame = get_playback_range(start_frame, end_frame)
+    options = AnalysisOptions(
+        camera=camera,
+        engine=engine,
+        in_memory=in_memory,
+        pipelined=pipelined,
+        workers=workers,
+        chunk_size=chunk_size,
+        width=width,
+        refine_width=refine_width,
+        attribution=pairs is not None,
+        regions=regions,
+        threshold=threshold,
+        max_hits=max_hits,
+        image_format=image_format,
+        temp_root=temp_root,
+        partition=partition
+    )
+
+    # Meshes of attribution sessions are drawn in colors, which would count
+    # as coverage on every frame without decoding them to pairs.
+    if session is not None and session.attribution != options.attribution:
+        raise ValueError(
+            "Attribution requires an attribution session, and other "
+            "analyses a session without attribution."
+        )
+
+    if options.attribution:
+        cache = None
+
+    frames = get_requested_frames(start_frame, end_frame, frames)
+    meshes = pymel.core.ls(type="mesh")
+
+    timings = StageTimings()
+    if stats is not None:
+        stats["stages"] = timings.stages
+
+    if broad_phase:
+        meshes = cull_meshes(meshes, frames, timings, stats)
+
+        # Without overlapping meshes there is nothing to intersect.
+        if not meshes:
+            for frame in frames:
+                yield frame, 0.0 if threshold is None else False
+            return
+
+    if engine == "geometry":
+        capturer = GeometryCapture(meshes, options, metrics, timings)
+    else:
+        capturer = PfxCapture(
+            meshes,
+            frames,
+            options,
+            session=session,
+            delete_pfx=delete_pfx,
+            timings=timings,
+            stats=stats,
+            metrics=metrics,
+            pairs=pairs
+        )
+
+    def capture(requested):
+        if not options.refine:
+            return capturer.capture(requested, width)
+        return iter_refined(
+            capturer.capture,
+            requested,
+            width,
+            refine_width,
+            batch_size=1 if in_memory else options.chunk_size,
+            metrics=metrics
+        )
+
+    def analyze(requested):
+        """Get coverage of frames from the cache or by capturing them."""
+        keys = None
+        if cache is not None:
+            with timings.measure("cache") as counts:
+                keys = get_frame_keys(
+                    meshes, options.camera, requested,
+                    options.get_key_options()
+                )
+                counts["frames"] += len(requested)
+        return iter_cached(capture, requested, cache, keys, metrics)
+
+    sampled = iter_strided(analyze, frames, stride, max_gap, stats)
+    results = iter_limited(sampled, max_hits, stats)
+    try:
+        for frame, coverage in results:
+            yield frame, coverage
+    finally:
+        # Stop capturing before the scene is cleaned up.
+        results.close()
+        sampled.close()
+
+        with timings.measure("cleanup"):
+            # Kept sessions stop hiding the scene in other viewports.
+            capturer.close()
+
+            if cache is not None:
+                cache.save()
+
+        if log:
+            info("Intersections analysis stages:\n" + timings.format())
+
+
 def get_coverage(camera=None,
                  start_frame=None,
                  end_frame=None,
-                 delete_pfx=True):
+                 delete_pfx=True,
+                 in_memory=False,
+                 pipelined=False,
+                 workers=2,
+                 cache=None,
+                 engine="pfx",
+                 broad_phase=False,
+                 stride=None,
+                 max_gap=None,
+                 width=40,
+                 refine_width=None,
+                 log=False,
+                 session=None,
+                 attribution=False,
+                 regions=False,
+                 frames=None,
+                 threshold=None,
+                 max_hits=None,
+                 image_format="png",
+                 temp_root=None,
+                 partition=False):
     """Get coverage data set on multiple frames.
 
     Args:
@@ -204,64 +2648,328 @@ def get_coverage(camera=None,
         start_frame (float, optional): Defaults to current start frame.
         end_frame (float, optional): Defaults to current end frame.
         delete_pfx (bool, optional): Deletes the pfx node. Defaults to True.
+        in_memory (bool, optional): Read frames straight from the viewport
+            color buffer instead of playblasting to png files.
+            Defaults to False.
+        pipelined (bool, optional): Score png files on a worker pool while
+            the playblast is still running. Defaults to False.
+        workers (int, optional): Amount of scoring threads when pipelined.
+            Defaults to 2.
+        cache (CoverageCache, optional): Cache of earlier results. Only
+            frames whose scene state is not in the cache are captured.
+        engine (str, optional): "pfx" captures pfx intersection lines in
+            the viewport. "geometry" tests the mesh triangles directly.
+            Defaults to "pfx".
+        broad_phase (bool, optional): Only analyze meshes whose bounding
+            box overlaps another mesh on some frame. Defaults to False.
+        stride (int, optional): Only sample every stride frame first, then
+            bisect the gaps around samples with intersections until they
+            are resolved. Intersections of up to `max_gap` frames can be
+            skipped. Defaults to analyzing every frame.
+        max_gap (int, optional): Longest run of frames in between clean
+            frames that is skipped with `stride`. Defaults to `stride` - 1.
+        width (int, optional): Width of the captured frames in pixels.
+            Defaults to 40.
+        refine_width (int, optional): Capture frames with intersections
+            again at this width. Their coverage is scaled to `width`. The
+            width each value was captured at is in the "width" metric.
+            Defaults to no refinement.
+        log (bool, optional): Show the time spent per stage when the
+            analysis ends. Defaults to False.
+        session (Session, optional): Reuse the pfx setup of a session
+            instead of creating and deleting it for this analysis.
+        attribution (bool, optional): Attribute intersections to pairs of
+            meshes in the same captures. The coverage per pair of mesh names
+            per frame is in `CoverageData.pairs`, and coverage is the share
+            of intersection line pixels. Defaults to False.
+        regions (bool, optional): Store the connected regions of
+            intersection pixels of each frame in the "regions" metric.
+            Defaults to False.
+        frames (list or str, optional): Frames to analyze instead of every
+            frame from start to end frame, or text like "1-20,25,50".
+        threshold (int, optional): Only detect whether each frame has any
+            pixel above this 0-255 value. Coverage is then 1.0 for frames
+            with intersections and 0.0 otherwise.
+        max_hits (int, optional): Stop the analysis once this amount of
+            frames with intersections is found.
+        image_format (str, optional): "png", or "bmp" to capture
+            uncompressed frames that are scored in place. Defaults to "png".
+        temp_root (str, optional): Directory to capture frames in, like a
+            tmpfs mount. Defaults to the system temporary directory.
+        partition (bool, optional): Capture the intersections of static
+            meshes once, and only draw animated meshes and static meshes
+            near them per frame. Defaults to False.
 
     Returns:
-        list: [
+        CoverageData: [
             list: [
                 float: frame,
                 float: coverage of intersections
             ]
         ]
+        Extra values per frame are in `CoverageData.metrics` and values
+        about the whole analysis in `CoverageData.stats`, like the wall
+        time, frames and bytes read per stage in "stages".
     """
-
-    data = []
-    camera = camera or "persp"
-    start_frame = start_frame or pymel.core.playbackOptions(
-        min=True, query=True
-    )
-    end_frame = end_frame or pymel.core.playbackOptions(
-        max=True, query=True
+    data = CoverageData()
+    results = iter_coverage(
+        camera=camera,
+        start_frame=start_frame,
+        end_frame=end_frame,
+        delete_pfx=delete_pfx,
+        in_memory=in_memory,
+        pipelined=pipelined,
+        workers=workers,
+        cache=cache,
+        engine=engine,
+        metrics=data.metrics,
+        broad_phase=broad_phase,
+        stats=data.stats,
+        stride=stride,
+        max_gap=max_gap,
+        width=width,
+        refine_width=refine_width,
+        log=log,
+        session=session,
+        pairs=data.pairs if attribution else None,
+        regions=regions,
+        frames=frames,
+        threshold=threshold,
+        max_hits=max_hits,
+        image_format=image_format,
+        temp_root=temp_root,
+        partition=partition
     )
+    data.extend([frame, coverage] for frame, coverage in results)
+    data.sort()
+    return data
 
-    # Create pfx.
-    pfx, pfx_shape = apply_pfxtoon(pymel.core.ls(type="mesh"))
 
-    # Create render layer for showing pfx only.
-    render_layer_nodes = create_material_override()
+def get_hit_frames(camera=None,
+                   start_frame=None,
+                   end_frame=None,
+                   max_hits=1,
+                   threshold=0,
+                   **kwargs):
+    """Get the first frames with any intersection.
+
+    Frames are only checked for any pixel above the threshold, and the
+    analysis stops once `max_hits` frames with intersections are found,
+    which is much cheaper than getting the coverage of every frame.
+
+    Args:
+        camera (str, optional): Name of camera, defaults to "persp"
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+        max_hits (int, optional): Amount of frames with intersections to
+            find. Defaults to the first one, None finds all of them.
+        threshold (int, optional): 0-255 value pixels have to exceed.
+            Defaults to any non-black pixel.
+        **kwargs: Other arguments for `iter_coverage`, like frames.
 
-    # Get white coverage in frames.
-    capture_directory = capture_frames(
+    Returns:
+        list: Sorted frames with intersections, empty when clean.
+    """
+    results = iter_coverage(
+        camera=camera,
         start_frame=start_frame,
         end_frame=end_frame,
-        camera=camera
+        threshold=threshold,
+        max_hits=max_hits,
+        **kwargs
     )
+    return sorted(frame for frame, hit in results if hit)
+
+
+def iter_cameras_coverage(cameras,
+                          start_frame=None,
+                          end_frame=None,
+                          delete_pfx=True,
+                          broad_phase=False,
+                          width=40,
+                          stats=None,
+                          stride=None,
+                          max_gap=None,
+                          log=False,
+                          session=None,
+                          frames=None):
+    """Get coverage of multiple frames seen by several cameras.
+
+    The pfx setup is created once, and each frame is evaluated once and
+    read from the viewport color buffer of each camera.
 
-    frame_count = start_frame
-    for f in os.listdir(capture_directory):
-        data.append(
-            [
-                frame_count,
-                get_white_coverage(os.path.join(capture_directory, f))
-            ]
+    Args:
+        cameras (list): Names of cameras.
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+        delete_pfx (bool, optional): Deletes the pfx node. Defaults to True.
+        broad_phase (bool, optional): Only analyze meshes whose bounding
+            box overlaps another mesh on some frame. Defaults to False.
+        width (int, optional): Width of the captured frames in pixels.
+            Defaults to 40.
+        stats (dict, optional): Filled with values about the whole
+            analysis, like the time spent per stage in "stages".
+        stride (int, optional): Only sample every stride frame first, then
+            bisect the gaps next to samples with intersections on any
+            camera, like `iter_coverage`. Defaults to analyzing every
+            frame.
+        max_gap (int, optional): Longest run of frames in between clean
+            frames that is skipped with `stride`. Defaults to `stride` - 1.
+        log (bool, optional): Show the time spent per stage when the
+            analysis ends. Defaults to False.
+        session (Session, optional): Reuse the pfx setup of a session
+            without attribution instead of creating and deleting it for
+            this analysis.
+        frames (list or str, optional): Frames to analyze instead of every
+            frame from start to end frame, or text like "1-20,25,50".
+
+    Yields:
+        tuple: (
+            float: frame,
+            float: highest coverage of all cameras,
+            dict: coverage per camera
         )
-        frame_count += 1
+    """
+    start_frame, end_frame = get_playback_range(start_frame, end_frame)
 
-    # Clean up.
-    rmtree(capture_directory, ignore_errors=True)
+    if session is not None and session.attribution:
+        raise ValueError("Cameras can not be analyzed with attribution.")
 
-    for node in render_layer_nodes:
-        delete_node(node)
+    frames = get_requested_frames(start_frame, end_frame, frames)
+    meshes = pymel.core.ls(type="mesh")
 
-    if delete_pfx:
-        pymel.core.delete(pfx)
+    timings = StageTimings()
+    if stats is not None:
+        stats["stages"] = timings.stages
 
-    return data
+    if broad_phase:
+        meshes = cull_meshes(meshes, frames, timings, stats)
+
+        # Without overlapping meshes there is nothing to intersect.
+        if not meshes:
+            for frame in frames:
+                yield frame, 0.0, dict((camera, 0.0) for camera in cameras)
+            return
+
+    owned_session = session is None
+    session = session or Session(delete_pfx=delete_pfx)
+
+    def analyze(requested):
+        """Get coverage of frames from the color buffer of each camera."""
+        buffers = capture_cameras_buffers(
+            cameras, start_frame, end_frame, width, frames=requested
+        )
+        while True:
+            with timings.measure("capture") as counts:
+                try:
+                    frame, camera_buffers = next(buffers)
+                except StopIteration:
+                    break
+                counts["frames"] += 1
+
+            coverages = {}
+            with timings.measure("decode") as counts:
+                for camera, (buffer_width, buffer_height, pixels) in (
+                        camera_buffers.items()):
+                    coverages[camera] = get_pixels_coverage(pixels)
+                    counts["frames"] += 1
+                    counts["bytes"] += len(pixels)
+
+            yield frame, max(coverages.values()), coverages
+
+    results = iter_strided(analyze, frames, stride, max_gap, stats)
+    try:
+        session.update(meshes, timings)
+        for frame, coverage, coverages in results:
+            yield frame, coverage, coverages
+    finally:
+        # Stop capturing before the scene is cleaned up.
+        results.close()
+
+        with timings.measure("cleanup"):
+            if owned_session:
+                session.close()
+
+        if log:
+            info("Intersections analysis stages:\n" + timings.format())
+
+
+def get_cameras_coverage(cameras,
+                         start_frame=None,
+                         end_frame=None,
+                         delete_pfx=True,
+                         broad_phase=False,
+                         width=40,
+                         stride=None,
+                         max_gap=None,
+                         log=False,
+                         session=None,
+                         frames=None):
+    """Get coverage data sets of several cameras with one scene setup.
+
+    Args:
+        cameras (list): Names of cameras.
+        start_frame (float, optional): Defaults to current start frame.
+        end_frame (float, optional): Defaults to current end frame.
+        delete_pfx (bool, optional): Deletes the pfx node. Defaults to True.
+        broad_phase (bool, optional): Only analyze meshes whose bounding
+            box overlaps another mesh on some frame. Defaults to False.
+        width (int, optional): Width of the captured frames in pixels.
+            Defaults to 40.
+        stride (int, optional): Only sample every stride frame first, see
+            `iter_cameras_coverage`. Defaults to analyzing every frame.
+        max_gap (int, optional): Longest run of frames in between clean
+            frames that is skipped with `stride`. Defaults to `stride` - 1.
+        log (bool, optional): Show the time spent per stage when the
+            analysis ends. Defaults to False.
+        session (Session, optional): Reuse the pfx setup of a session
+            instead of creating and deleting it for this analysis.
+        frames (list or str, optional): Frames to analyze instead of every
+            frame from start to end frame, or text like "1-20,25,50".
+
+    Returns:
+        list: [
+            CoverageData: highest coverage of all cameras per frame, with
+                values about the whole analysis in `CoverageData.stats`,
+            dict: CoverageData per camera
+        ]
+    """
+    merged = CoverageData()
+    per_camera = dict((camera, CoverageData()) for camera in cameras)
+    results = iter_cameras_coverage(
+        cameras,
+        start_frame=start_frame,
+        end_frame=end_frame,
+        delete_pfx=delete_pfx,
+        broad_phase=broad_phase,
+        width=width,
+        stats=merged.stats,
+        stride=stride,
+        max_gap=max_gap,
+        log=log,
+        session=session,
+        frames=frames
+    )
+    for frame, coverage, coverages in results:
+        merged.append([frame, coverage])
+        for camera, camera_coverage in coverages.items():
+            per_camera[camera].append([frame, camera_coverage])
+
+    # Sampled frames are analyzed out of order.
+    merged.sort()
+    for data in per_camera.values():
+        data.sort()
+    return [merged, per_camera]
 
 
 def error(message):
     pymel.core.displayWarning(message)
 
 
+def info(message):
+    pymel.core.displayInfo(message)
+
+
 # Taken from https://github.com/BigRoy/maya-capture-gui/
 #                   blob/master/capture_gui/lib.py#L148
 def get_time_slider_range(highlighted=True,
@@ -348,3 +3056,126 @@ def get_current_camera():
             return cmds.listRelatives(cam_shapes,
                                       parent=True,
                                       fullPath=True)[0]
+
+
+def get_camera_shape(camera):
+    """Get the camera shape of a camera transform or shape."""
+    shapes = cmds.ls(camera, type="camera", long=True)
+    if shapes:
+        return shapes[0]
+    return cmds.listRelatives(
+        camera, shapes=True, type="camera", fullPath=True
+    )[0]
+
+
+# Original 2D pan and zoom of cameras framed with `frame_region`.
+_framed_cameras = {}
+
+PAN_ZOOM_ATTRIBUTES = (
+    "panZoomEnabled", "horizontalPan", "verticalPan", "zoom"
+)
+
+
+def get_frame_size(shape):
+    """Get the size of the frames of a camera in inches of film back.
+
+    The frames fill the resolution gate, which is fitted into the film gate
+    by the film fit of the camera, and the overscan around it.
+
+    Args:
+        shape (str): Name of camera shape.
+
+    Returns:
+        list: [
+            float: width,
+            float: height
+        ]
+    """
+    aperture_width = cmds.getAttr(shape + ".horizontalFilmAperture")
+    aperture_height = cmds.getAttr(shape + ".verticalFilmAperture")
+    ratio = cmds.getAttr("defaultResolution.deviceAspectRatio")
+    film_fit = cmds.getAttr(shape + ".filmFit")
+    overscan = cmds.getAttr(shape + ".overscan")
+
+    # Fill fits the film gate on its narrow side, overscan on its wide side.
+    wider = aperture_width / aperture_height > ratio
+    if film_fit == 0:
+        horizontal = not wider
+    elif film_fit == 3:
+        horizontal = wider
+    else:
+        horizontal = film_fit == 1
+
+    if horizontal:
+        width, height = aperture_width, aperture_width / ratio
+    else:
+        width, height = aperture_height * ratio, aperture_height
+    return [width * overscan, height * overscan]
+
+
+def get_region_view(camera, region, margin=1.5):
+    """Get the 2D pan and zoom of a camera that frames a region.
+
+    Args:
+        camera (str): Name of camera.
+        region (list): [left, top, right, bottom, ...] 0-1 bounds of the
+            frame, like the regions of `analysis.get_regions`.
+        margin (float, optional): Size of the view relative to the region.
+
+    Returns:
+        dict: Value per camera shape attribute.
+    """
+    left, top, right, bottom = region[:4]
+    width, height = get_frame_size(get_camera_shape(camera))
+    return {
+        "panZoomEnabled": True,
+        "horizontalPan": ((left + right) * 0.5 - 0.5) * width,
+        "verticalPan": (0.5 - (top + bottom) * 0.5) * height,
+        "zoom": min(max(right - left, bottom - top, 0.01) * margin, 1.0)
+    }
+
+
+def frame_region(camera, region, margin=1.5):
+    """Pan and zoom the 2D view of a camera onto a region of its frames.
+
+    Only the view through the camera changes, not the camera itself.
+    Captures ignore the 2D pan and zoom. The original pan and zoom are
+    restored by `reset_region`.
+
+    Args:
+        camera (str): Name of camera.
+        region (list): [left, top, right, bottom, ...] 0-1 bounds of the
+            frame, like the regions of `analysis.get_regions`.
+        margin (float, optional): Size of the view relative to the region.
+    """
+    shape = get_camera_shape(camera)
+    if shape not in _framed_cameras:
+        _framed_cameras[shape] = dict(
+            (attribute, cmds.getAttr(shape + "." + attribute))
+            for attribute in PAN_ZOOM_ATTRIBUTES
+        )
+
+    for attribute, value in get_region_view(camera, region, margin).items():
+        cmds.setAttr(shape + "." + attribute, value)
+
+
+def reset_region(camera):
+    """Restore the 2D pan and zoom of a camera framed by `frame_region`."""
+    shape = get_camera_shape(camera)
+    original = _framed_cameras.pop(shape, None)
+    if original is None:
+        return
+
+    for attribute, value in original.items():
+        cmds.setAttr(shape + "." + attribute, value)
+
+
+@contextlib.contextmanager
+def framed_region(camera, region, margin=1.5):
+    """Frame the 2D view of a camera onto a region only within the context,
+    like while capturing a close up of an intersection."""
+    frame_region(camera, region, margin)
+    try:
+        yield
+    finally:
+        reset_region(camera)
@@ -0,0 +1,448 @@
+"""Containers for coverage results."""
+import sys
+import mmap
+import json
+import struct
+import timeit
+import contextlib
+from array import array
+
+try:
+    from collections.abc import MutableSequence
+except ImportError:
+    from collections import MutableSequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# Layout of saved coverage data: a header, the names and types of the
+# columns, stats as json, then each column as little endian doubles aligned
+# to 8 bytes, so columns can be memory mapped as they are.
+MAGIC = b"ITCD"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sIQIII")
+_NAME = struct.Struct("<Hc")
+
+
+def _is_number(value):
+    return (
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+    )
+
+
+def json_default(value):
+    """Convert coverage data for `json.dump`, as its `default` argument.
+
+    Example:
+        >>> json.dumps(coverage, default=json_default)
+    """
+    if isinstance(value, CoverageData):
+        return value.tolist()
+    raise TypeError("{0!r} is not JSON serializable".format(value))
+
+
+class CoverageData(MutableSequence):
+    """Sequence of [frame, coverage] lists with extra values per frame.
+
+    Behaves like the list returned by `lib.get_coverage` before, so existing
+    callers can keep indexing, unpacking, sorting and concatenating frame
+    and coverage. Frames and coverage are stored in typed arrays instead of
+    a list per frame, and rows are created when accessed, so changing a
+    returned row does not change the data. It is not a list subclass, so
+    code checking for lists or serializing to json needs `tolist` or
+    `json_default`.
+
+    Args:
+        data (list, optional): [frame, coverage] lists.
+        metrics (dict, optional): Extra values per frame, like the amount of
+            intersecting faces.
+        stats (dict, optional): Values about the whole analysis, like the
+            amount of culled meshes.
+        pairs (dict, optional): Coverage per pair of intersecting meshes per
+            frame, as {frame: {(mesh_a, mesh_b): coverage}}.
+    """
+
+    def __init__(self, data=(), metrics=None, stats=None, pairs=None):
+        self.frames = array("d")
+        self.coverages = array("d")
+        self.metrics = metrics if metrics is not None else {}
+        self.stats = stats if stats is not None else {}
+        self.pairs = pairs if pairs is not None else {}
+        self.extend(data)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                [float(frame), float(coverage)] for frame, coverage in
+                zip(self.frames[index], self.coverages[index])
+            ]
+        return [float(self.frames[index]), float(self.coverages[index])]
+
+    def __setitem__(self, index, value):
+        self._make_writable()
+        if isinstance(index, slice):
+            rows = list(value)
+            self.frames[index] = array("d", [row[0] for row in rows])
+            self.coverages[index] = array("d", [row[1] for row in rows])
+        else:
+            self.frames[index], self.coverages[index] = value
+
+    def __delitem__(self, index):
+        self._make_writable()
+        del self.frames[index]
+        del self.coverages[index]
+
+    def __iter__(self):
+        for frame, coverage in zip(self.frames, self.coverages):
+            yield [float(frame), float(coverage)]
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __add__(self, other):
+        try:
+            rows = list(other)
+        except TypeError:
+            return NotImplemented
+        result = self.copy()
+        result.extend(rows)
+        if isinstance(other, CoverageData):
+            result.metrics.update(other.metrics)
+            result.pairs.update(other.pairs)
+        return result
+
+    def __radd__(self, other):
+        try:
+            rows = list(other)
+        except TypeError:
+            return NotImplemented
+        result = CoverageData(
+            rows, dict(self.metrics), dict(self.stats), dict(self.pairs)
+        )
+        result.extend(self)
+        return result
+
+    def __copy__(self):
+        return self.copy()
+
+    def copy(self):
+        """Get a copy with its own columns and copies of the dicts of
+        metrics, stats and pairs."""
+        result = CoverageData(
+            metrics=dict(self.metrics),
+            stats=dict(self.stats),
+            pairs=dict(self.pairs)
+        )
+        result.frames = array("d", self.frames)
+        result.coverages = array("d", self.coverages)
+        return result
+
+    def tolist(self):
+        """Get the rows as a list of [frame, coverage] lists."""
+        return list(self)
+
+    def _make_writable(self):
+        """Copy memory mapped columns into arrays before changing them."""
+        if not isinstance(self.frames, array):
+            self.frames = array("d", self.frames)
+            self.coverages = array("d", self.coverages)
+
+    def insert(self, index, value):
+        self._make_writable()
+        frame, coverage = value
+        self.frames.insert(index, frame)
+        self.coverages.insert(index, coverage)
+
+    def append(self, value):
+        self._make_writable()
+        frame, coverage = value
+        self.frames.append(frame)
+        self.coverages.append(coverage)
+
+    def extend(self, values):
+        self._make_writable()
+        for frame, coverage in values:
+            self.frames.append(frame)
+            self.coverages.append(coverage)
+
+    def sort(self, key=None, reverse=False):
+        """Sort rows in place, by frame and coverage by default."""
+        rows = sorted(self, key=key, reverse=reverse)
+        self.frames = array("d", [row[0] for row in rows])
+        self.coverages = array("d", [row[1] for row in rows])
+
+    def get_column(self, name):
+        """Get a numeric metric of every row.
+
+        Args:
+            name (str): Name of the metric.
+
+        Returns:
+            array.array: Metric value per row, NaN where a frame has no
+                numeric value.
+        """
+        column = array("d")
+        for frame in self.frames:
+            value = self.metrics.get(frame, {}).get(name)
+            column.append(value if _is_number(value) else float("nan"))
+        return column
+
+    def get_arrays(self):
+        """Get the frames and coverage as NumPy arrays without copying.
+
+        The arrays share memory with the data, so the data can not grow
+        while they are in use.
+
+        Returns:
+            list: [
+                numpy.ndarray: frames,
+                numpy.ndarray: coverage
+            ]
+        """
+        if numpy is None:
+            raise ImportError("NumPy is required for arrays.")
+
+        return [
+            numpy.frombuffer(self.frames, dtype=numpy.float64),
+            numpy.frombuffer(self.coverages, dtype=numpy.float64)
+        ]
+
+    def diff(self, other, tolerance=0.0):
+        """Compare coverage with another run.
+
+        Args:
+            other (CoverageData): Coverage of the other run.
+            tolerance (float, optional): Largest coverage difference that
+                counts as equal.
+
+        Returns:
+            list: [frame, coverage, other coverage] lists in frame order
+                of the frames that differ, with None as coverage when a
+                frame is missing from one of the runs.
+        """
+        coverages = dict(zip(self.frames, self.coverages))
+        other_coverages = dict(zip(other.frames, other.coverages))
+
+        differences = []
+        for frame in sorted(set(coverages) | set(other_coverages)):
+            coverage = coverages.get(frame)
+            other_coverage = other_coverages.get(frame)
+            if (coverage is None or other_coverage is None or
+                    abs(coverage - other_coverage) > tolerance):
+                differences.append([frame, coverage, other_coverage])
+        return differences
+
+    def save(self, path):
+        """Write frames, coverage, numeric metrics and stats to a file.
+
+        Metrics with other values, like regions, and pairs are not saved.
+
+        Args:
+            path (str): Path of the file.
+        """
+        kinds = {}
+        for frame_metrics in self.metrics.values():
+            for name, value in frame_metrics.items():
+                if _is_number(value) and kinds.get(name) != b"d":
+                    kinds[name] = b"d" if isinstance(value, float) else b"i"
+
+        names = sorted(kinds)
+        columns = [("frame", b"d", self.frames),
+                   ("coverage", b"d", self.coverages)]
+        columns.extend(
+            (name, kinds[name], self.get_column(name)) for name in names
+        )
+
+        names_data = bytearray()
+        for name, kind, values in columns:
+            encoded = name.encode("utf-8")
+            names_data.extend(_NAME.pack(len(encoded), kind))
+            names_data.extend(encoded)
+        stats_data = json.dumps(self.stats).encode("utf-8")
+
+        header = bytearray(_HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            len(self),
+            len(columns),
+            len(names_data),
+            len(stats_data)
+        ))
+        header.extend(names_data)
+        header.extend(stats_data)
+        header.extend(b"\0" * (-len(header) % 8))
+
+        with open(path, "wb") as f:
+            f.write(header)
+            for name, kind, values in columns:
+                values = array("d", values)
+                if sys.byteorder != "little":
+                    values.byteswap()
+                values.tofile(f)
+
+    @classmethod
+    def load(cls, path, memory_map=True):
+        """Read coverage data written by `save`.
+
+        Args:
+            path (str): Path of the file.
+            memory_map (bool, optional): Map the columns into memory with
+                NumPy instead of reading them, so loading takes the same
+                time for any length of data. Changing the data copies the
+                columns. Without NumPy the columns are read. Defaults to
+                True.
+
+        Returns:
+            CoverageData: The data with numeric metrics and stats.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError("{0} is not coverage data.".format(path))
+
+            magic, version, rows, column_count, names_size, stats_size = (
+                _HEADER.unpack(header)
+            )
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError("{0} is not coverage data.".format(path))
+
+            names_data = f.read(names_size)
+            stats = json.loads(f.read(stats_size).decode("utf-8"))
+
+            columns = []
+            offset = 0
+            for _ in range(column_count):
+                size, kind = _NAME.unpack_from(names_data, offset)
+                offset += _NAME.size
+                name = names_data[offset:offset + size].decode("utf-8")
+                offset += size
+                columns.append([name, kind])
+
+            offset = _HEADER.size + names_size + stats_size
+            offset += -offset % 8
+
+            mapped = None
+            if memory_map and numpy is not None and rows:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            f.seek(offset)
+            for column in columns:
+                if mapped is not None:
+                    values = numpy.frombuffer(
+                        mapped, dtype="<f8", count=rows, offset=offset
+                    )
+                else:
+                    values = array("d")
+                    values.fromfile(f, rows)
+                    if sys.byteorder != "little":
+                        values.byteswap()
+                column.append(values)
+                offset += rows * 8
+
+        data = cls(stats=stats)
+        data.frames = columns[0][2]
+        data.coverages = columns[1][2]
+        data.metrics.update(cls._get_metrics(data.frames, columns[2:]))
+        return data
+
+    @staticmethod
+    def _get_metrics(frames, columns):
+        """Get metrics per frame from [name, kind, values] columns, leaving
+        out the NaN values of frames without a value."""
+        metrics = {}
+        if not columns:
+            return metrics
+
+        if numpy is not None:
+            frames = numpy.asarray(frames)
+            for name, kind, values in columns:
+                values = numpy.asarray(values)
+                present = ~numpy.isnan(values)
+                values = values[present]
+                if kind == b"i":
+                    values = values.astype(numpy.int64)
+                for frame, value in zip(frames[present].tolist(),
+                                        values.tolist()):
+                    metrics.setdefault(frame, {})[name] = value
+            return metrics
+
+        frames = frames.tolist()
+        for name, kind, values in columns:
+            convert = int if kind == b"i" else float
+            for frame, value in zip(frames, values.tolist()):
+                if value == value:
+                    metrics.setdefault(frame, {})[name] = convert(value)
+        return metrics
+
+
+class StageTimings(object):
+    """Wall time, frame count and bytes read per stage of an analysis.
+
+    Stages are kept in the order they first ran. Each stage is a dict with
+    "seconds", "frames" and "bytes", accumulated over all times it ran.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.order = []
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        """Time a block as a stage.
+
+        Yields:
+            dict: Counts of this run of the stage, where "frames" and
+                "bytes" can be increased by the block.
+        """
+        counts = {"frames": 0, "bytes": 0}
+        start = timeit.default_timer()
+        try:
+            yield counts
+        finally:
+            self.add(
+                stage,
+                timeit.default_timer() - start,
+                counts["frames"],
+                counts["bytes"]
+            )
+
+    def add(self, stage, seconds=0.0, frames=0, bytes_read=0):
+        """Add a run of a stage."""
+        if stage not in self.stages:
+            self.order.append(stage)
+            self.stages[stage] = {"seconds": 0.0, "frames": 0, "bytes": 0}
+
+        values = self.stages[stage]
+        values["seconds"] += seconds
+        values["frames"] += frames
+        values["bytes"] += bytes_read
+
+    def format(self):
+        """Format the stages as aligned lines of text."""
+        lines = []
+        for stage in self.order:
+            values = self.stages[stage]
+            lines.append(
+                "{0:<16}{1:>9.3f} s{2:>8} frames{3:>12} bytes".format(
+                    stage, values["seconds"], values["frames"], values["bytes"]
+                )
+            )
+        return "\n".join(lines)
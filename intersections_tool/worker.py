@@ -0,0 +1,74 @@
+"""Worker process analyzing one shard of frames in a headless Maya.
+
+Run with the path to a json job file:
+    mayapy -m intersections_tool.worker job.json
+
+The job holds the "scene" to open, the "options" for `lib.get_coverage`
+and the "output" path the results are written to as json. Jobs with "stub"
+set do not start Maya and report zero coverage for every frame, so the
+distribution of work can be tried without Maya.
+"""
+import sys
+import json
+
+
+def run_stub(job):
+    """Report zero coverage for every frame of the job without Maya."""
+    options = job["options"]
+    start_frame = options.get("start_frame") or 1
+    end_frame = options.get("end_frame") or start_frame
+    frames = range(int(start_frame), int(end_frame) + 1)
+    if isinstance(options.get("frames"), list):
+        frames = options["frames"]
+    return {
+        "data": [[float(frame), 0.0] for frame in frames],
+        "metrics": {},
+        "stats": {}
+    }
+
+
+def run(job):
+    """Open the scene of a job and get the coverage of its frames.
+
+    Args:
+        job (dict): Job with "scene" and "options" for `lib.get_coverage`.
+
+    Returns:
+        dict: "data", "metrics" and "stats" of the coverage data.
+    """
+    if job.get("stub"):
+        return run_stub(job)
+
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    try:
+        from maya import cmds
+        cmds.file(job["scene"], open=True, force=True)
+
+        from intersections_tool import lib
+        data = lib.get_coverage(**job["options"])
+
+        return {
+            "data": list(data),
+            "metrics": data.metrics,
+            "stats": data.stats
+        }
+    finally:
+        maya.standalone.uninitialize()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    with open(argv[0], "r") as f:
+        job = json.load(f)
+
+    result = run(job)
+
+    with open(job["output"], "w") as f:
+        json.dump(result, f)
+
+
+if __name__ == "__main__":
+    main()
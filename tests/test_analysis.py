@@ -0,0 +1,183 @@
+import os
+import struct
+import shutil
+import tempfile
+import unittest
+
+from intersections_tool import analysis
+from intersections_tool.vendor import png
+
+
+def create_pixels(width, height, lit, color=(255, 255, 255)):
+    """Create RGBA pixels on black, with `lit` (row, column) pixels set to
+    a color."""
+    pixels = bytearray(b"\x00\x00\x00\xff" * (width * height))
+    for row, column in lit:
+        index = (row * width + column) * 4
+        pixels[index:index + 3] = bytearray(color)
+    return pixels
+
+
+def write_png(path, width, height, pixels):
+    rows = [
+        pixels[offset:offset + width * 4]
+        for offset in range(0, len(pixels), width * 4)
+    ]
+    with open(path, "wb") as f:
+        png.Writer(width, height, alpha=True).write(f, rows)
+
+
+def write_bmp(path, width, height, pixels):
+    """Write 24 bit bmp rows bottom to top in BGR order, like Maya."""
+    stride = (width * 3 + 3) // 4 * 4
+    rows = []
+    for row in reversed(range(height)):
+        data = bytearray()
+        for column in range(width):
+            index = (row * width + column) * 4
+            data.extend(reversed(pixels[index:index + 3]))
+        rows.append(bytes(data) + b"\x00" * (stride - width * 3))
+
+    offset = 14 + 40
+    with open(path, "wb") as f:
+        f.write(struct.pack(
+            "<2sIHHI", b"BM", offset + stride * height, 0, 0, offset
+        ))
+        f.write(struct.pack(
+            "<IiiHHIIiiII", 40, width, height, 1, 24, 0, stride * height,
+            2835, 2835, 0, 0
+        ))
+        f.write(b"".join(rows))
+
+
+class TestCoverage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.width = 8
+        self.height = 5
+        self.pixels = create_pixels(
+            self.width, self.height, [(1, 1), (1, 2), (3, 6)]
+        )
+        self.paths = []
+        for extension, write in (("png", write_png), ("bmp", write_bmp)):
+            path = os.path.join(self.temp_directory, "temp.0001." + extension)
+            write(path, self.width, self.height, self.pixels)
+            self.paths.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory)
+
+    def test_pixels_coverage(self):
+        self.assertAlmostEqual(
+            analysis.get_pixels_coverage(self.pixels), 3 / 40.0
+        )
+        self.assertEqual(
+            analysis.get_pixels_coverage(create_pixels(4, 4, [])), 0.0
+        )
+
+    def test_file_coverage(self):
+        for path in self.paths:
+            self.assertAlmostEqual(
+                analysis.get_white_coverage(path), 3 / 40.0
+            )
+        self.assertEqual(
+            [round(value, 6) for value in
+             analysis.get_files_coverage(self.paths)],
+            [round(3 / 40.0, 6)] * len(self.paths)
+        )
+
+    def test_read_image(self):
+        for path in self.paths:
+            width, height, planes, pixels = analysis.read_image(path)
+            self.assertEqual((width, height), (self.width, self.height))
+            self.assertAlmostEqual(
+                analysis.get_pixels_coverage(pixels, planes), 3 / 40.0
+            )
+
+    def test_hits(self):
+        dim = create_pixels(4, 4, [(2, 2)], color=(10, 10, 10))
+        self.assertTrue(analysis.get_pixels_hit(dim))
+        self.assertFalse(analysis.get_pixels_hit(dim, threshold=10))
+        for path in self.paths:
+            self.assertTrue(analysis.get_file_hit(path, threshold=254))
+
+    def test_score_file_deletes_the_file(self):
+        for path in self.paths:
+            self.assertAlmostEqual(analysis.score_file(path), 3 / 40.0)
+            self.assertFalse(os.path.exists(path))
+
+
+class TestRegions(unittest.TestCase):
+
+    def test_connected_regions(self):
+        pixels = create_pixels(
+            10, 10, [(1, 1), (1, 2), (2, 3), (8, 8)]
+        )
+        regions = analysis.get_regions(pixels, 10, 10)
+        self.assertEqual(len(regions), 2)
+
+        # Diagonal neighbours join, and the largest region comes first.
+        left, top, right, bottom, share = regions[0]
+        self.assertEqual((left, top, right, bottom), (0.1, 0.1, 0.4, 0.3))
+        self.assertAlmostEqual(share, 0.03)
+
+    def test_heatmap(self):
+        heatmap = analysis.get_heatmap(
+            [[[0.0, 0.0, 0.5, 0.5, 0.1]], [[0.0, 0.0, 1.0, 1.0, 0.5]]],
+            width=2,
+            height=2
+        )
+        self.assertEqual(heatmap, [[2, 1], [1, 1]])
+
+
+def create_id_pixels(width, height, columns):
+    """Create RGBA pixels with a mesh group index per column, -1 for black
+    background and None for white intersection lines."""
+    pixels = bytearray()
+    for row in range(height):
+        for group in columns:
+            if group is None:
+                color = (255, 255, 255)
+            elif group < 0:
+                color = (0, 0, 0)
+            else:
+                color = [
+                    int(value * 255) for value in analysis.get_id_color(group)
+                ]
+            pixels.extend(bytearray(color) + b"\xff")
+    return pixels
+
+
+class TestIdCoverage(unittest.TestCase):
+
+    def get_pairs(self, columns, height=3, radius=1, corner=None):
+        pixels = create_id_pixels(len(columns), height, columns)
+        if corner is not None:
+            pixels[:3] = bytearray(
+                int(value * 255) for value in analysis.get_id_color(corner)
+            )
+        coverage, pairs = analysis.get_id_coverage(
+            pixels, len(columns), height, radius=radius
+        )
+        self.assertAlmostEqual(coverage, 1.0 / len(columns))
+        return sorted(pairs)
+
+    def test_pair_of_groups(self):
+        self.assertEqual(self.get_pairs([0, 0, 0, None, 4, 4]), [(0, 4)])
+
+    def test_third_group_nearby_is_not_paired(self):
+        self.assertEqual(
+            self.get_pairs([2, 0, None, 4, 4], radius=2, corner=1),
+            [(0, 4)]
+        )
+
+    def test_self_intersection(self):
+        self.assertEqual(self.get_pairs([3, 3, None, 3, 3]), [(3, 3)])
+
+    def test_single_group_and_background_is_not_attributed(self):
+        self.assertEqual(self.get_pairs([3, 3, None, -1, -1]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
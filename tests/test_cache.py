@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from intersections_tool.cache import CoverageCache
+
+
+class TestCoverageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_directory, "cache", "cache.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory)
+
+    def test_save_and_load(self):
+        cache = CoverageCache(self.path)
+        cache.set("a", [0.5, {"faces": 2}])
+        cache.save()
+
+        cache = CoverageCache(self.path)
+        self.assertEqual(cache.get("a"), [0.5, {"faces": 2}])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(
+            os.listdir(os.path.dirname(self.path)), ["cache.json"]
+        )
+
+    def test_reading_does_not_rewrite(self):
+        cache = CoverageCache(self.path)
+        cache.set("a", 0.5)
+        cache.save()
+        modified = int(os.path.getmtime(self.path)) - 10
+        os.utime(self.path, (modified, modified))
+
+        cache = CoverageCache(self.path)
+        cache.get("a")
+        cache.save()
+        self.assertEqual(os.path.getmtime(self.path), modified)
+
+    def test_evicts_least_recently_used(self):
+        cache = CoverageCache(self.path, max_entries=2, touch_interval=0)
+        for index, key in enumerate("abc"):
+            cache.set(key, index)
+            cache._entries[key][1] = index
+        cache.get("a")
+        cache.save()
+
+        self.assertEqual(sorted(CoverageCache(self.path)._entries), ["a", "c"])
+
+    def test_unusable_file_starts_empty(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{")
+        self.assertEqual(len(CoverageCache(self.path)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from intersections_tool import cli
+
+
+class TestGetOptions(unittest.TestCase):
+
+    def get_options(self, argv):
+        return cli.get_options(cli.get_parser().parse_args(argv))
+
+    def test_defaults(self):
+        self.assertEqual(
+            self.get_options(["scene.ma"]),
+            {"engine": "geometry", "width": 40, "image_format": "png"}
+        )
+
+    def test_options(self):
+        options = self.get_options([
+            "scene.ma", "--camera", "shotCam", "--start", "1", "--end",
+            "20", "--stride", "4", "--partition", "--engine", "pfx"
+        ])
+        self.assertEqual(options["camera"], "shotCam")
+        self.assertEqual(options["start_frame"], 1.0)
+        self.assertEqual(options["end_frame"], 20.0)
+        self.assertEqual(options["stride"], 4)
+        self.assertTrue(options["partition"])
+        self.assertNotIn("threshold", options)
+
+    def test_detect(self):
+        self.assertEqual(
+            self.get_options(["scene.ma", "--detect"])["threshold"], 0
+        )
+        options = self.get_options(
+            ["scene.ma", "--detect", "--pixel-threshold", "128"]
+        )
+        self.assertEqual(options["threshold"], 128)
+
+    def test_pixel_threshold_needs_detect(self):
+        options = self.get_options(["scene.ma", "--pixel-threshold", "128"])
+        self.assertNotIn("threshold", options)
+
+
+class TestWriteResults(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory)
+
+    def test_csv_rows(self):
+        path = os.path.join(self.temp_directory, "results.csv")
+        cli.write_results(
+            {"a.ma": {"data": [[1.0, 0.5]]}, "b.ma": {"error": "failed"}},
+            path
+        )
+        with open(path, "rb") as f:
+            self.assertEqual(f.read().splitlines(), [
+                b"scene,frame,coverage,error",
+                b"a.ma,1.0,0.5,",
+                b"b.ma,,,failed"
+            ])
+        with open(path, "rb") as f:
+            self.assertNotIn(b"\r\r\n", f.read())
+
+
+class TestAnalyzeScenes(unittest.TestCase):
+
+    def test_repeated_scenes_are_analyzed_once(self):
+        options = cli.get_options(cli.get_parser().parse_args(["a.ma"]))
+        results = cli.analyze_scenes(
+            ["a.ma", "b.ma", "a.ma"], options, 2, 0, None, True
+        )
+        self.assertEqual(sorted(results), ["a.ma", "b.ma"])
+        for result in results.values():
+            self.assertIn("data", result)
+
+
+class TestExitCode(unittest.TestCase):
+
+    def test_errors_take_precedence(self):
+        results = {
+            "a.ma": {"data": [[1.0, 0.5]]},
+            "b.ma": {"error": "failed"}
+        }
+        self.assertEqual(cli.get_exit_code(results), cli.EXIT_ERROR)
+        del results["b.ma"]
+        self.assertEqual(cli.get_exit_code(results), cli.EXIT_INTERSECTIONS)
+        self.assertEqual(
+            cli.get_exit_code(results, threshold=0.5), cli.EXIT_CLEAN
+        )
+
+    def test_stub_scenes(self):
+        self.assertEqual(
+            cli.main(["a.ma", "b.ma", "--stub", "--processes", "2"]),
+            cli.EXIT_CLEAN
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from intersections_tool import distributed
+from intersections_tool.results import CoverageData
+
+
+class TestSplitFrames(unittest.TestCase):
+
+    def test_consecutive_shards(self):
+        self.assertEqual(
+            distributed.split_frames(1, 10, 3),
+            [[1.0, 3.0], [4.0, 6.0], [7.0, 10.0]]
+        )
+
+    def test_no_empty_shards(self):
+        self.assertEqual(
+            distributed.split_frames(1, 2, 8), [[1.0, 1.0], [2.0, 2.0]]
+        )
+
+
+class TestLimitHits(unittest.TestCase):
+
+    def test_cut_after_first_hits(self):
+        # Two shards that each stopped after two hits.
+        data = CoverageData([
+            [1.0, 0.0], [2.0, 0.1], [3.0, 0.2], [6.0, 0.3], [7.0, 0.4]
+        ])
+        data.metrics[6.0] = {"width": 40}
+        distributed.limit_hits(data, 2)
+        self.assertEqual(data.tolist(), [[1.0, 0.0], [2.0, 0.1], [3.0, 0.2]])
+        self.assertNotIn(6.0, data.metrics)
+        self.assertTrue(data.stats["stopped_early"])
+
+    def test_fewer_hits_are_kept(self):
+        data = CoverageData([[1.0, 0.0], [2.0, 0.1]])
+        distributed.limit_hits(data, 2)
+        self.assertEqual(len(data), 2)
+        self.assertNotIn("stopped_early", data.stats)
+
+
+class TestGetCoverage(unittest.TestCase):
+
+    def test_shards_merged_in_frame_order(self):
+        data = distributed.get_coverage(
+            "scene.ma", 1, 20, shards=4, processes=4, stub=True
+        )
+        self.assertEqual(
+            [frame for frame, coverage in data],
+            [float(frame) for frame in range(1, 21)]
+        )
+        self.assertEqual(len(data.stats["shards"]), 4)
+
+    def test_frames_split_across_shards(self):
+        frames = [2.0, 3.0, 11.0, 19.0]
+        data = distributed.get_coverage(
+            "scene.ma", 1, 20, shards=4, processes=2, stub=True,
+            frames=frames
+        )
+        self.assertEqual([frame for frame, coverage in data], frames)
+
+        # Shards without any of the frames are not run.
+        self.assertEqual(len(data.stats["shards"]), 3)
+
+    def test_failed_shards_raise(self):
+        with self.assertRaises(RuntimeError):
+            distributed.get_coverage(
+                "scene.ma", 1, 4, shards=2, processes=2, retries=0,
+                executable="intersections_tool_missing_python", stub=True
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
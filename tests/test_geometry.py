@@ -0,0 +1,55 @@
+import unittest
+
+from intersections_tool import geometry
+
+
+class TestSweepAndPrune(unittest.TestCase):
+
+    def test_overlapping_pairs(self):
+        boxes = [
+            (0, 0, 0, 1, 1, 1),
+            (0.5, 0.5, 0.5, 2, 2, 2),
+            (5, 0, 0, 6, 1, 1),
+            (0.5, 5, 0, 1, 6, 1)
+        ]
+        self.assertEqual(geometry.sweep_and_prune(boxes), set([(0, 1)]))
+
+
+@unittest.skipIf(geometry.numpy is None, "requires NumPy")
+class TestIntersections(unittest.TestCase):
+
+    def setUp(self):
+        numpy = geometry.numpy
+        self.flat = numpy.array([[0, 0, 0], [2, 0, 0], [0, 2, 0]], float)
+        self.crossing = numpy.array(
+            [[0.5, 0.5, -1], [0.5, 0.5, 1], [1.5, 0.5, 0]], float
+        )
+        self.apart = self.crossing + [0, 0, 5]
+
+    def test_triangles_intersect(self):
+        numpy = geometry.numpy
+        result = geometry.triangles_intersect(
+            numpy.array([self.flat, self.flat]),
+            numpy.array([self.crossing, self.apart])
+        )
+        self.assertEqual(list(result), [True, False])
+
+    def test_coverage(self):
+        numpy = geometry.numpy
+        triangles = numpy.array([self.flat, self.crossing, self.apart])
+        coverage, intersecting, faces = geometry.get_intersection_coverage(
+            triangles
+        )
+        self.assertEqual((intersecting, faces), (2, 3))
+        self.assertAlmostEqual(coverage, 2 / 3.0)
+
+    def test_shared_vertices_are_skipped(self):
+        numpy = geometry.numpy
+        triangles = numpy.array([self.flat, self.crossing])
+        vertex_ids = numpy.array([[0, 1, 2], [2, 3, 4]])
+        pairs = geometry.get_intersecting_pairs(triangles, vertex_ids)
+        self.assertEqual(len(pairs), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,460 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "benchmarks"
+))
+
+import fake_maya  # noqa: E402
+
+import intersections_tool  # noqa: E402, F401
+
+fake_maya.install()
+
+from intersections_tool import lib  # noqa: E402
+
+
+class TestParseFrames(unittest.TestCase):
+
+    def test_frames_and_ranges(self):
+        self.assertEqual(
+            lib.parse_frames("1-3,5;7 3 9-8"),
+            [1.0, 2.0, 3.0, 5.0, 7.0, 8.0, 9.0]
+        )
+
+    def test_negative_frames(self):
+        self.assertEqual(
+            lib.parse_frames("-10--8, -1-1"),
+            [-10.0, -9.0, -8.0, -1.0, 0.0, 1.0]
+        )
+
+    def test_invalid_frames(self):
+        for text in ("1-", "a", "1..5", "1-2-3"):
+            with self.assertRaises(ValueError):
+                lib.parse_frames(text)
+
+    def test_requested_frames(self):
+        self.assertEqual(
+            lib.get_requested_frames(1, 3), [1.0, 2.0, 3.0]
+        )
+        self.assertEqual(
+            lib.get_requested_frames(1, 3, [5, 4, 4]), [4.0, 5.0]
+        )
+        with self.assertRaises(ValueError):
+            lib.get_requested_frames(1, 3, " ")
+
+
+class TestMatchFrameFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [float(frame) for frame in range(1, 11)]
+
+    def get_names(self, numbers):
+        return ["temp.{0:04d}.png".format(number) for number in numbers]
+
+    def test_numbered_by_frame(self):
+        names = self.get_names(range(1, 11))
+        self.assertEqual(
+            lib.match_frame_files(names, self.frames),
+            [[frame, name] for frame, name in zip(self.frames, names)]
+        )
+
+    def test_numbered_from_zero(self):
+        names = self.get_names(range(10))
+        self.assertEqual(
+            lib.match_frame_files(names, self.frames, renumbered=True),
+            [[frame, name] for frame, name in zip(self.frames, names)]
+        )
+
+        # Files numbered from zero are not taken for frame numbers.
+        matched = lib.match_frame_files(names, self.frames)
+        self.assertEqual(
+            [frame for frame, name in matched], self.frames[:-1]
+        )
+        self.assertEqual(matched[0], [1.0, "temp.0001.png"])
+
+    def test_missing_frames_are_left_out(self):
+        names = self.get_names([2, 4, 7])
+        self.assertEqual(
+            lib.match_frame_files(names, [2.0, 3.0, 4.0, 7.0]),
+            [[2.0, names[0]], [4.0, names[1]], [7.0, names[2]]]
+        )
+        self.assertEqual(
+            lib.match_frame_files(
+                ["temp.-0003.png", "temp.0000.png", "temp.0002.png"],
+                [-5.0, -4.0, -3.0],
+                renumbered=True
+            ),
+            [[-5.0, "temp.0000.png"], [-3.0, "temp.0002.png"]]
+        )
+
+    def test_renumbered_negative_frames(self):
+        self.assertTrue(lib.is_renumbered([-2.0, -1.0]))
+        self.assertFalse(lib.is_renumbered([0.0, 1.0]))
+
+
+class TestGetFrameRuns(unittest.TestCase):
+
+    def test_consecutive_runs(self):
+        self.assertEqual(
+            lib.get_frame_runs([-3.0, -2.0, 1.0, 2.0, 3.0, 7.0]),
+            [[-3.0, -2.0], [1.0, 2.0, 3.0], [7.0]]
+        )
+
+    def test_no_frames(self):
+        self.assertEqual(lib.get_frame_runs([]), [])
+
+
+class TestIterStrided(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [float(frame) for frame in range(1, 11)]
+        self.hits = [5.0, 6.0, 7.0]
+        self.requests = []
+
+    def analyze(self, frames):
+        self.requests.append(frames)
+        for frame in frames:
+            yield frame, frame in self.hits
+
+    def test_every_frame_without_stride(self):
+        stats = {}
+        results = list(
+            lib.iter_strided(self.analyze, self.frames, stats=stats)
+        )
+        self.assertEqual([frame for frame, hit in results], self.frames)
+        self.assertEqual(stats, {"planned_frames": 10})
+
+    def test_bisects_gaps_next_to_hits(self):
+        stats = {}
+        results = list(
+            lib.iter_strided(self.analyze, self.frames, 4, stats=stats)
+        )
+        self.assertEqual(self.requests[0], [1.0, 5.0, 9.0, 10.0])
+        self.assertEqual(
+            sorted(frame for frame, hit in results if hit), self.hits
+        )
+
+        # The clean gap between the first samples is skipped.
+        self.assertEqual(
+            sorted(frame for frame, hit in results),
+            [1.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0, 10.0]
+        )
+        self.assertEqual(stats["sampled_frames"], 9)
+        self.assertEqual(stats["planned_frames"], 9)
+
+    def test_max_gap_bisects_clean_gaps(self):
+        self.hits = []
+        results = list(
+            lib.iter_strided(self.analyze, self.frames, 4, max_gap=0)
+        )
+        self.assertEqual(sorted(frame for frame, hit in results), self.frames)
+
+
+class TestGetFrameSize(unittest.TestCase):
+
+    def setUp(self):
+        self.attributes = {
+            "cameraShape.horizontalFilmAperture": 1.5,
+            "cameraShape.verticalFilmAperture": 1.0,
+            "defaultResolution.deviceAspectRatio": 2.0,
+            "cameraShape.filmFit": 0,
+            "cameraShape.overscan": 1.0
+        }
+        self.get_attr = lib.cmds.getAttr
+        lib.cmds.getAttr = lambda attribute: self.attributes[attribute]
+
+    def tearDown(self):
+        lib.cmds.getAttr = self.get_attr
+
+    def get_frame_size(self, film_fit, overscan=1.0):
+        self.attributes["cameraShape.filmFit"] = film_fit
+        self.attributes["cameraShape.overscan"] = overscan
+        return lib.get_frame_size("cameraShape")
+
+    def test_film_fit(self):
+        # The resolution is wider than the film gate.
+        self.assertEqual(self.get_frame_size(0), [1.5, 0.75])
+        self.assertEqual(self.get_frame_size(1), [1.5, 0.75])
+        self.assertEqual(self.get_frame_size(2), [2.0, 1.0])
+        self.assertEqual(self.get_frame_size(3), [2.0, 1.0])
+
+    def test_overscan(self):
+        width, height = self.get_frame_size(1, overscan=1.2)
+        self.assertAlmostEqual(width, 1.8)
+        self.assertAlmostEqual(height, 0.9)
+
+
+class TestAnalysisOptions(unittest.TestCase):
+
+    def test_invalid_combinations(self):
+        for options in (
+                {"engine": "raster"},
+                {"image_format": "jpg"},
+                {"engine": "geometry", "regions": True},
+                {"engine": "geometry", "attribution": True},
+                {"engine": "geometry", "partition": True},
+                {"partition": True, "attribution": True},
+                {"threshold": 0, "regions": True},
+                {"threshold": 0, "attribution": True}):
+            with self.assertRaises(ValueError):
+                lib.AnalysisOptions(**options)
+
+    def test_chunks_with_max_hits(self):
+        self.assertEqual(lib.AnalysisOptions(max_hits=1).chunk_size, 10)
+        self.assertEqual(
+            lib.AnalysisOptions(max_hits=1, chunk_size=4).chunk_size, 4
+        )
+        self.assertIsNone(
+            lib.AnalysisOptions(max_hits=1, in_memory=True).chunk_size
+        )
+
+    def test_refine(self):
+        self.assertTrue(lib.AnalysisOptions(refine_width=80).refine)
+        self.assertFalse(
+            lib.AnalysisOptions(refine_width=80, threshold=0).refine
+        )
+        self.assertFalse(
+            lib.AnalysisOptions(refine_width=80, engine="geometry").refine
+        )
+
+
+class TestIterLimited(unittest.TestCase):
+
+    def test_stops_after_max_hits(self):
+        stats = {}
+        results = [(1.0, 0.0), (2.0, 0.5), (3.0, 0.0), (4.0, 0.5), (5.0, 0.5)]
+        self.assertEqual(
+            list(lib.iter_limited(results, 2, stats)), results[:4]
+        )
+        self.assertEqual(stats, {"stopped_early": True})
+
+    def test_every_result_without_max_hits(self):
+        stats = {}
+        results = [(1.0, 0.5), (2.0, 0.5)]
+        self.assertEqual(list(lib.iter_limited(results, stats=stats)), results)
+        self.assertEqual(stats, {})
+
+
+class DictCache(dict):
+
+    def set(self, key, value):
+        self[key] = value
+
+
+class TestIterCached(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [1.0, 2.0, 3.0, 4.0]
+        self.keys = dict((frame, str(frame)) for frame in self.frames)
+        self.requests = []
+
+    def analyze(self, frames):
+        self.requests.append(frames)
+        for frame in frames:
+            yield frame, frame / 10
+
+    def test_cached_frames_in_order(self):
+        cache = DictCache({"1.0": [0.5, {"width": 40}], "3.0": 0.25})
+        metrics = {}
+        results = list(lib.iter_cached(
+            self.analyze, self.frames, cache, self.keys, metrics
+        ))
+        self.assertEqual(self.requests, [[2.0, 4.0]])
+        self.assertEqual(
+            results, [(1.0, 0.5), (2.0, 0.2), (3.0, 0.25), (4.0, 0.4)]
+        )
+        self.assertEqual(metrics, {1.0: {"width": 40}})
+        self.assertEqual(cache["4.0"], [0.4, None])
+
+    def test_every_frame_without_cache(self):
+        results = list(lib.iter_cached(self.analyze, self.frames))
+        self.assertEqual(self.requests, [self.frames])
+        self.assertEqual(len(results), 4)
+
+    def test_nothing_analyzed_when_cached(self):
+        cache = DictCache((key, 0.0) for key in self.keys.values())
+        results = list(
+            lib.iter_cached(self.analyze, self.frames, cache, self.keys)
+        )
+        self.assertEqual(self.requests, [])
+        self.assertEqual(results, [(frame, 0.0) for frame in self.frames])
+
+
+class TestIterRefined(unittest.TestCase):
+
+    def setUp(self):
+        self.frames = [1.0, 2.0, 3.0, 4.0]
+        self.captures = []
+
+    def capture(self, frames, width):
+        self.captures.append((list(frames), width))
+        for frame in frames:
+            yield frame, 0.4 if frame == 2.0 else 0.0
+
+    def test_hits_are_refined(self):
+        metrics = {}
+        results = list(lib.iter_refined(
+            self.capture, self.frames, 40, 80, batch_size=1, metrics=metrics
+        ))
+        self.assertEqual(
+            self.captures, [(self.frames, 40), ([2.0], 80)]
+        )
+        self.assertEqual(
+            results, [(1.0, 0.0), (2.0, 0.8), (3.0, 0.0), (4.0, 0.0)]
+        )
+        self.assertEqual(
+            metrics[2.0], {"width": 80, "refined_coverage": 0.4}
+        )
+        self.assertEqual(metrics[1.0], {"width": 40})
+
+    def test_refined_coverage_is_capped(self):
+        results = dict(lib.iter_refined(self.capture, self.frames, 10, 80))
+        self.assertEqual(results[2.0], 1.0)
+
+
+class TestCaptureFramesPipelined(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = fake_maya.Scene(density=0.1)
+        self.capture = lib.capture
+        lib.capture = self.scene.capture
+
+    def tearDown(self):
+        lib.capture = self.capture
+
+    def test_scores_every_frame(self):
+        results = lib.capture_frames_pipelined(
+            start_frame=1, end_frame=5, poll_interval=0.001
+        )
+        self.assertEqual(
+            [frame for frame, coverage in results],
+            [1.0, 2.0, 3.0, 4.0, 5.0]
+        )
+        self.assertTrue(all(coverage > 0 for frame, coverage in results))
+
+    def test_negative_frames(self):
+        results = lib.capture_frames_pipelined(start_frame=-3, end_frame=-1)
+        self.assertEqual(
+            [frame for frame, coverage in results], [-3.0, -2.0, -1.0]
+        )
+
+    def test_shared_pool_stays_open(self):
+        with lib.scoring_pool(workers=1) as pool:
+            for frames in ([2.0, 4.0], [7.0]):
+                results = lib.capture_frames_pipelined(
+                    start_frame=frames[0],
+                    end_frame=frames[-1],
+                    frames=frames,
+                    pool=pool
+                )
+                self.assertEqual(
+                    [frame for frame, coverage in results], frames
+                )
+
+
+class Mesh(object):
+
+    def __init__(self, name, root):
+        self.name = name
+        self._root = root
+
+    def root(self):
+        return self._root
+
+    def __str__(self):
+        return self.name
+
+
+class TestGetMeshGroups(unittest.TestCase):
+
+    def setUp(self):
+        self.meshes = [
+            Mesh("body", "character"),
+            Mesh("shirt", "character"),
+            Mesh("chair", "set"),
+            Mesh("table", "set"),
+            Mesh("cup", "props")
+        ]
+
+    def test_mesh_per_group(self):
+        self.assertEqual(
+            lib.get_mesh_groups(self.meshes),
+            [[str(mesh), [mesh]] for mesh in self.meshes]
+        )
+
+    def test_grouped_by_root(self):
+        groups = lib.get_mesh_groups(self.meshes, max_groups=3)
+        self.assertEqual(
+            [[name, [str(mesh) for mesh in members]]
+             for name, members in groups],
+            [
+                ["character", ["body", "shirt"]],
+                ["set", ["chair", "table"]],
+                ["props", ["cup"]]
+            ]
+        )
+
+    def test_roots_are_not_merged(self):
+        with self.assertRaises(ValueError):
+            lib.get_mesh_groups(self.meshes, max_groups=2)
+
+
+class TestSessionMode(unittest.TestCase):
+
+    def test_session_matches_attribution(self):
+        with self.assertRaises(ValueError):
+            next(lib.iter_coverage(
+                start_frame=1,
+                end_frame=2,
+                session=lib.Session(attribution=True)
+            ))
+        with self.assertRaises(ValueError):
+            next(lib.iter_coverage(
+                start_frame=1, end_frame=2, session=lib.Session(), pairs={}
+            ))
+        with self.assertRaises(ValueError):
+            next(lib.iter_cameras_coverage(
+                ["persp", "top"],
+                start_frame=1,
+                end_frame=2,
+                session=lib.Session(attribution=True)
+            ))
+
+
+class RecordingSession(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def activate(self):
+        self.calls.append("activate")
+
+    def deactivate(self):
+        self.calls.append("deactivate")
+
+
+class TestLiveCapture(unittest.TestCase):
+
+    def setUp(self):
+        self.scene = fake_maya.Scene(density=0.1)
+        self.functions = [lib.capture_panel, lib.read_color_buffer]
+        lib.capture_panel = self.scene.capture_panel
+        lib.read_color_buffer = self.scene.read_color_buffer
+
+    def tearDown(self):
+        lib.capture_panel, lib.read_color_buffer = self.functions
+
+    def test_session_is_active_while_open(self):
+        session = RecordingSession()
+        with lib.LiveCapture(session=session) as live:
+            for _ in range(3):
+                self.assertGreater(live.score(), 0)
+                self.assertTrue(live.score(threshold=0))
+        self.assertEqual(session.calls, ["activate", "deactivate"])
+        self.assertFalse(live.is_open)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import copy
+import json
+import shutil
+import tempfile
+import unittest
+
+from intersections_tool.results import (
+    CoverageData, StageTimings, json_default
+)
+
+
+class TestCoverageData(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_directory)
+
+    def test_behaves_like_rows(self):
+        data = CoverageData([[2.0, 0.5], [1.0, 0.0]])
+        data.append([3.0, 0.25])
+        data.sort()
+        self.assertEqual(data, [[1.0, 0.0], [2.0, 0.5], [3.0, 0.25]])
+        self.assertEqual(data[-1], [3.0, 0.25])
+        self.assertEqual([frame for frame, coverage in data], [1.0, 2.0, 3.0])
+
+        # Rows are copies, so changing them does not change the data.
+        data[0][1] = 1.0
+        self.assertEqual(data[0], [1.0, 0.0])
+
+    def test_concatenates_like_a_list(self):
+        data = CoverageData([[2.0, 0.5]], metrics={2.0: {"faces": 1}})
+        added = data + [[3.0, 0.0]]
+        self.assertIsInstance(added, CoverageData)
+        self.assertEqual(added, [[2.0, 0.5], [3.0, 0.0]])
+        self.assertEqual(added.metrics, {2.0: {"faces": 1}})
+        self.assertEqual([[1.0, 0.0]] + data, [[1.0, 0.0], [2.0, 0.5]])
+        self.assertEqual(len(data), 1)
+
+        data += [[4.0, 0.0]]
+        self.assertEqual(len(data), 2)
+
+    def test_copy_has_its_own_columns(self):
+        data = CoverageData([[1.0, 0.5]], metrics={1.0: {"faces": 1}})
+        copied = copy.copy(data)
+        copied[0] = [1.0, 0.0]
+        copied.metrics[2.0] = {}
+        self.assertEqual(data, [[1.0, 0.5]])
+        self.assertEqual(list(data.metrics), [1.0])
+
+    def test_json(self):
+        data = CoverageData([[1.0, 0.5]])
+        self.assertEqual(data.tolist(), [[1.0, 0.5]])
+        self.assertEqual(
+            json.loads(json.dumps({"data": data}, default=json_default)),
+            {"data": [[1.0, 0.5]]}
+        )
+
+    def test_save_and_load(self):
+        path = os.path.join(self.temp_directory, "coverage.itcd")
+        data = CoverageData(
+            [[1.0, 0.0], [2.0, 0.5]],
+            metrics={2.0: {"faces": 3, "width": 40.0, "regions": []}},
+            stats={"culled_meshes": 1}
+        )
+        data.save(path)
+
+        for memory_map in (True, False):
+            loaded = CoverageData.load(path, memory_map=memory_map)
+            self.assertEqual(loaded, data)
+            self.assertEqual(loaded.stats, {"culled_meshes": 1})
+            self.assertEqual(
+                loaded.metrics, {2.0: {"faces": 3, "width": 40.0}}
+            )
+
+            # Changing memory mapped data copies it first.
+            loaded.append([3.0, 1.0])
+            self.assertEqual(len(loaded), 3)
+
+    def test_load_rejects_other_files(self):
+        path = os.path.join(self.temp_directory, "other.txt")
+        with open(path, "w") as f:
+            f.write("not coverage data")
+        with self.assertRaises(ValueError):
+            CoverageData.load(path)
+
+    def test_diff(self):
+        data = CoverageData([[1.0, 0.0], [2.0, 0.5]])
+        other = CoverageData([[1.0, 0.01], [3.0, 0.0]])
+        self.assertEqual(
+            data.diff(other, tolerance=0.1),
+            [[2.0, 0.5, None], [3.0, None, 0.0]]
+        )
+
+
+class TestStageTimings(unittest.TestCase):
+
+    def test_measure(self):
+        timings = StageTimings()
+        with timings.measure("decode") as counts:
+            counts["frames"] += 2
+        with timings.measure("capture"):
+            pass
+        with timings.measure("decode") as counts:
+            counts["frames"] += 1
+
+        self.assertEqual(timings.order, ["decode", "capture"])
+        self.assertEqual(timings.stages["decode"]["frames"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()